@@ -0,0 +1,271 @@
+import heapq
+import logging
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import FoodProduct, Product, category_key
+
+
+class Totals:
+    """
+    Running count, quantity and value for a group of products.
+    """
+
+    __slots__ = ("count", "quantity", "value")
+
+    def __init__(self):
+        self.count = 0
+        self.quantity = 0
+        self.value = 0.0
+
+    def add(self, quantity: int, value: float) -> None:
+        self.count += 1
+        self.quantity += quantity
+        self.value += value
+
+    def subtract(self, quantity: int, value: float) -> None:
+        self.count -= 1
+        self.quantity -= quantity
+        self.value -= value
+        if self.count == 0:
+            # Reset exactly so float drift cannot survive an emptied group
+            self.quantity, self.value = 0, 0.0
+
+    def as_dict(self) -> dict:
+        return {"count": self.count, "quantity": self.quantity, "value": self.value}
+
+
+class CategoryStats(Totals):
+    """
+    `Totals` plus the lowest and highest unit price of a group of products.
+    """
+
+    __slots__ = ("min_price", "max_price")
+
+    def __init__(self):
+        super().__init__()
+        self.min_price = math.inf
+        self.max_price = -math.inf
+
+    def add_priced(self, quantity: int, value: float, price: float) -> None:
+        self.add(quantity, value)
+        if price < self.min_price:
+            self.min_price = price
+        if price > self.max_price:
+            self.max_price = price
+
+    def as_dict(self) -> dict:
+        stats = super().as_dict()
+        stats["min_price"] = self.min_price
+        stats["max_price"] = self.max_price
+        return stats
+
+
+class InventoryAggregates:
+    """
+    Running inventory aggregates, kept in sync by `ProductList`.
+
+    Tracks totals over every product, totals and per-category breakdowns over
+    non-expired products, and the highest-value non-expired product. Adding
+    or removing a product is O(1) and so are reads; the highest-value product
+    is rescanned only after it leaves the valid set. Food leaves the valid
+    totals when `expire` is called for it, see `Inventory.sweep_expired`.
+    """
+
+    # expiry_date too, since assigning it can bring expired food back
+    fields = frozenset({"quantity", "price", "category", "expiry_date"})
+
+    def __init__(self):
+        self.all = Totals()
+        self.valid = Totals()
+        self.categories: Dict[str, Totals] = {}
+        self._live: Dict[int, Product] = {}
+        self._expired: Set[int] = set()
+        self._top: Optional[Product] = None
+        self._top_value = -math.inf
+        self._top_stale = False
+
+    def add(self, product: Product) -> None:
+        value = product.get_total_value()
+        self._live[id(product)] = product
+        self.all.add(product.quantity, value)
+        self._add_valid(product, value)
+        if value > self._top_value:
+            self._top, self._top_value = product, value
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        """
+        Adds products like `add`, keeping the running sums in locals.
+        """
+        live, categories = self._live, self.categories
+        # Category totals by the category as written, normalized once each
+        by_category: Dict[Optional[str], Totals] = {}
+        count = quantity = 0
+        total = self.all.value
+        valid_total = self.valid.value
+        for product in products:
+            value = product.get_total_value()
+            live[id(product)] = product
+            count += 1
+            quantity += product.quantity
+            total += value
+            valid_total += value
+            totals = by_category.get(product.category)
+            if totals is None:
+                key = category_key(product)
+                totals = categories.get(key)
+                if totals is None:
+                    totals = categories[key] = Totals()
+                by_category[product.category] = totals
+            totals.count += 1
+            totals.quantity += product.quantity
+            totals.value += value
+            if value > self._top_value:
+                self._top, self._top_value = product, value
+        for totals, value in ((self.all, total), (self.valid, valid_total)):
+            totals.count += count
+            totals.quantity += quantity
+            totals.value = value
+
+    def discard(self, product: Product) -> None:
+        if self._live.pop(id(product), None) is None:
+            return
+        self.all.subtract(product.quantity, product.get_total_value())
+        if id(product) in self._expired:
+            self._expired.discard(id(product))
+        else:
+            self._subtract_valid(product)
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def expire(self, product: Product) -> None:
+        """
+        Moves a contained product out of the valid totals.
+        """
+        if id(product) in self._live and id(product) not in self._expired:
+            self._expired.add(id(product))
+            self._subtract_valid(product)
+
+    def highest_sale(self) -> Optional[Product]:
+        """
+        Returns the first non-expired product with the highest total value.
+        """
+        if self._top_stale:
+            self._top, self._top_value = None, -math.inf
+            for product in self._live.values():
+                value = product.get_total_value()
+                if value > self._top_value and id(product) not in self._expired:
+                    self._top, self._top_value = product, value
+            self._top_stale = False
+        return self._top
+
+    def category_breakdown(self) -> Dict[str, dict]:
+        """
+        Returns count, quantity and value per category of non-expired products.
+        """
+        return {name: totals.as_dict() for name, totals in self.categories.items()}
+
+    def _add_valid(self, product: Product, value: float) -> None:
+        self.valid.add(product.quantity, value)
+        key = category_key(product)
+        totals = self.categories.get(key)
+        if totals is None:
+            totals = self.categories[key] = Totals()
+        totals.add(product.quantity, value)
+
+    def _subtract_valid(self, product: Product) -> None:
+        quantity, value = product.quantity, product.get_total_value()
+        self.valid.subtract(quantity, value)
+        key = category_key(product)
+        totals = self.categories[key]
+        totals.subtract(quantity, value)
+        if totals.count == 0:
+            del self.categories[key]
+        if product is self._top:
+            self._top_stale = True
+
+
+def build_summary(
+    total_products: int,
+    total_quantity: int,
+    hs_name: str,
+    hs_amt: float,
+    total_value: float,
+) -> dict:
+    """
+    Shapes aggregated totals into the `Inventory.get_summary` dictionary,
+    logging a warning when there is nothing valid or nothing in stock.
+    """
+    if total_products == 0:
+        logging.warning(
+            "No valid (non-expired) products. Summary values will all be zero."
+        )
+        return {
+            "total_products": 0,
+            "total_quantity": 0,
+            "hs_name": "N/A",
+            "hs_amt": 0.0,
+            "total_value": 0.0,
+        }
+
+    if total_quantity == 0:
+        logging.warning("Total quantity is zero — all products may be out of stock.")
+
+    return {
+        "total_products": total_products,
+        "total_quantity": total_quantity,
+        "hs_name": hs_name,
+        "hs_amt": hs_amt,
+        "total_value": total_value,
+    }
+
+
+def analyze_products(
+    products: Iterable[Product], top_n: int = 5, now: Optional[datetime] = None
+) -> dict:
+    """
+    Aggregates products in a single pass, skipping expired food.
+
+    Keeps one `CategoryStats` per category and a heap of at most `top_n`
+    products, so memory does not grow with the number of products and
+    each one is visited once whatever the number of metrics.
+
+    Args:
+    - products (Iterable[Product]): Products to analyze; may be a generator.
+    - top_n (int): Number of highest-value products to return.
+    - now (datetime, optional): Expiry cutoff; defaults to the current time.
+
+    Returns:
+    - dict: "categories" maps each category ("" for products without one)
+      to its count, quantity, value, min_price and max_price, highest value
+      first. "top_products" lists the `top_n` highest-value products,
+      highest first, earlier products winning ties.
+    """
+    if top_n < 0:
+        raise ValueError("top_n must not be negative")
+    now = datetime.now() if now is None else now
+    categories: Dict[str, CategoryStats] = {}
+    # Min-heap of (value, -position, product); the root is the first to drop
+    top: List[Tuple[float, int, Product]] = []
+    for position, product in enumerate(products):
+        if isinstance(product, FoodProduct) and product.expiry_date < now:
+            continue
+        value = product.get_total_value()
+        key = category_key(product)
+        stats = categories.get(key)
+        if stats is None:
+            stats = categories[key] = CategoryStats()
+        stats.add_priced(product.quantity, value, product.price)
+        if len(top) < top_n:
+            heapq.heappush(top, (value, -position, product))
+        elif top_n and (value, -position) > top[0][:2]:
+            heapq.heapreplace(top, (value, -position, product))
+
+    ranked = sorted(categories.items(), key=lambda item: -item[1].value)
+    top.sort(key=lambda entry: entry[:2], reverse=True)
+    return {
+        "categories": {name: stats.as_dict() for name, stats in ranked},
+        "top_products": [product for _, _, product in top],
+    }
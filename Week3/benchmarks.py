@@ -0,0 +1,398 @@
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .core import Inventory
+from .datagen import generate_rows, write_dataset
+from .formats import COLUMNS
+from .ingest import build_trusted_product
+from .records import to_record
+
+
+def _dict_rows(count: int) -> Iterator[Dict[str, str]]:
+    """
+    Yields `datagen` rows as dicts keyed by column, as `csv.DictReader` reads.
+    """
+    for row in generate_rows(count):
+        yield dict(zip(COLUMNS, row))
+
+
+def bench_trusted_load(rows: int = 100_000) -> Dict[str, float]:
+    """
+    Times `load_from_csv` with and without `trusted=True` on the same file,
+    keeping the fastest of `ROUNDS` loads of each.
+
+    Returns:
+    - Seconds for the validated load, the trusted load, and the speedup ratio.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "products.csv")
+        write_dataset(path, rows)
+
+        results = {"validated": float("inf"), "trusted": float("inf")}
+        for _ in range(ROUNDS):
+            for label, trusted in (("validated", False), ("trusted", True)):
+                inventory = Inventory()
+                start = time.perf_counter()
+                inventory.load_from_csv(path, trusted=trusted)
+                seconds = time.perf_counter() - start
+                results[label] = min(results[label], seconds)
+                assert len(inventory.products) == rows
+
+    results["speedup"] = results["validated"] / results["trusted"]
+    return results
+
+
+def bytes_per_product(rows: int = 10_000) -> Dict[str, float]:
+    """
+    Measures the memory each product object adds as a Pydantic model and as
+    a compact `ProductRecord`, using tracemalloc.
+
+    Both forms are built over the same field values, so only the per-object
+    overhead (instance, dict, fields-set and the list slot) is counted.
+
+    Returns:
+    - Bytes per product for "model" and "record".
+    """
+    models = [build_trusted_product(row) for row in _dict_rows(rows)]
+    records = [to_record(model) for model in models]
+    builders: Dict[str, Callable[[], list]] = {
+        "model": lambda: [record.to_model() for record in records],
+        "record": lambda: [to_record(model) for model in models],
+    }
+    results = {}
+    for label, build in builders.items():
+        gc.collect()
+        tracemalloc.start()
+        try:
+            copies = build()
+            results[label] = tracemalloc.get_traced_memory()[0] / rows
+        finally:
+            tracemalloc.stop()
+        del copies
+    return results
+
+
+# ----------------------------
+# Benchmark suite
+# ----------------------------
+
+SUITE_SIZES = (10_000, 100_000, 1_000_000)
+# Rows timed one by one for create_product_from_row latency
+ROW_SAMPLE = 10_000
+# Minimum time spent repeating a call in each latency round
+MIN_TIME = 0.1
+# Timing rounds per measurement; the fastest is kept, as timeit does, since
+# slower rounds measure interference from the rest of the machine
+ROUNDS = 3
+# Rows loaded per benchmark before load rounds are cut down to one
+LOAD_BUDGET = 300_000
+# Relative slowdown allowed before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.25
+# Metrics where larger values are better; all others are costs
+HIGHER_IS_BETTER = {"rows_per_second", "speedup"}
+# Limits on (benchmark, metric) values, checked without a baseline: the
+# lowest allowed value for `HIGHER_IS_BETTER` metrics, the highest for the
+# others. They are ratios of two timings taken together, so they hold on
+# any machine:
+# - "overhead" is a load's time over the time to build the same products
+#   without an inventory, i.e. what indexing and totals add. It grows with
+#   the dataset; before loads appended in batches a validated load already
+#   took up to 2.4 times its build time at 20,000-100,000 rows.
+# - "speedup" is the trusted load's throughput over the validated one's,
+#   about 1.4 then and 1.45-2.0 since.
+SUITE_LIMITS = {
+    ("load_from_csv", "overhead"): 2.5,
+    ("load_from_csv_trusted", "speedup"): 1.3,
+}
+# Smallest dataset the limits apply to; fixed costs dominate smaller ones
+LIMIT_MIN_ROWS = 10_000
+
+
+def _latency(call: Callable[[], Any], min_time: float = MIN_TIME) -> float:
+    """
+    Returns the seconds per call of the fastest of `ROUNDS` rounds, each
+    repeating `call` for at least `min_time` seconds (and at least once).
+    """
+    best = float("inf")
+    for _ in range(ROUNDS):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            call()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def _peak_mib(call: Callable[[], Any]) -> float:
+    """
+    Returns the peak Python memory allocated while `call` runs, in MiB.
+    Measured separately from timings, since tracemalloc slows allocation.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def _bench_load(path: str, rows: int, trusted: bool) -> Dict[str, float]:
+    def load() -> None:
+        Inventory().load_from_csv(path, trusted=trusted)
+
+    def build() -> None:
+        for _ in Inventory().iter_from_csv(path, trusted=trusted):
+            pass
+
+    seconds = build_seconds = float("inf")
+    for _ in range(max(1, min(ROUNDS, LOAD_BUDGET // rows))):
+        start = time.perf_counter()
+        load()
+        seconds = min(seconds, time.perf_counter() - start)
+        start = time.perf_counter()
+        build()
+        build_seconds = min(build_seconds, time.perf_counter() - start)
+    return {
+        "rows_per_second": rows / seconds,
+        "overhead": seconds / build_seconds,
+        "peak_mib": _peak_mib(load),
+    }
+
+
+def bench_suite(rows: int, min_time: float = MIN_TIME) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmarks the Inventory hot paths on `rows` synthetic rows mixing every
+    product category.
+
+    Returns:
+    - Metrics per benchmark: loads report rows_per_second, overhead (see
+      `SUITE_LIMITS`) and peak_mib, and the trusted load its speedup over
+      the validated one; single calls report latency_us
+      (microseconds per call) and, where they allocate, peak_mib.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "products.csv")
+        write_dataset(path, rows)
+        results["load_from_csv"] = _bench_load(path, rows, trusted=False)
+        results["load_from_csv_trusted"] = _bench_load(path, rows, trusted=True)
+        results["load_from_csv_trusted"]["speedup"] = (
+            results["load_from_csv_trusted"]["rows_per_second"]
+            / results["load_from_csv"]["rows_per_second"]
+        )
+
+        inventory = Inventory()
+        sample = list(_dict_rows(min(rows, ROW_SAMPLE)))
+
+        def create_rows() -> None:
+            for row in sample:
+                inventory.create_product_from_row(row)
+
+        seconds = _latency(create_rows, min_time) / len(sample)
+        results["create_product_from_row"] = {
+            "latency_us": seconds * 1e6,
+            "rows_per_second": 1 / seconds,
+        }
+
+        inventory.load_from_csv(path)
+        for name in ("get_summary", "get_total_inventory"):
+            call = getattr(inventory, name)
+            results[name] = {"latency_us": _latency(call, min_time) * 1e6}
+
+        report = os.path.join(tmp, "low_stock_report.txt")
+
+        def write_report() -> None:
+            inventory.generate_low_stock_report(10, report)
+
+        results["generate_low_stock_report"] = {
+            "latency_us": _latency(write_report, min_time) * 1e6,
+            "peak_mib": _peak_mib(write_report),
+        }
+    return results
+
+
+def run_suite(
+    sizes: Sequence[int] = SUITE_SIZES, min_time: float = MIN_TIME
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Runs `bench_suite` for each dataset size, keyed by the row count.
+    """
+    return {str(rows): bench_suite(rows, min_time) for rows in sizes}
+
+
+def save_baseline(path: str, results: Dict[str, Any]) -> None:
+    """
+    Writes suite results to a JSON baseline file, noting the interpreter and
+    machine they were measured on, since timings only compare on the same one.
+    """
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """
+    Reads the suite results stored by `save_baseline`.
+    """
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def find_regressions(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """
+    Compares suite results with a baseline.
+
+    A metric regresses when it is worse than the baseline by more than
+    `tolerance` (a fraction). Sizes, benchmarks and metrics missing from
+    either side are ignored.
+
+    Returns:
+    - One message per regressed metric; empty when there is none.
+    """
+    regressions = []
+    for size, benchmarks in results.items():
+        for name, metrics in benchmarks.items():
+            expected = baseline.get(size, {}).get(name, {})
+            for metric, value in metrics.items():
+                reference = expected.get(metric)
+                if not reference:
+                    continue
+                if metric in HIGHER_IS_BETTER:
+                    change = reference / value - 1 if value else float("inf")
+                else:
+                    change = value / reference - 1
+                if change > tolerance:
+                    regressions.append(
+                        f"{name}[{size}] {metric}: {value:,.2f} vs baseline "
+                        f"{reference:,.2f} ({change:+.0%} worse)"
+                    )
+    return regressions
+
+
+def find_limit_violations(
+    results: Dict[str, Any], limits: Dict[Tuple[str, str], float] = SUITE_LIMITS
+) -> List[str]:
+    """
+    Checks suite results against fixed limits, such as `SUITE_LIMITS`, for
+    every size of at least `LIMIT_MIN_ROWS` rows.
+
+    Returns:
+    - One message per metric beyond its limit; empty when there is none.
+    """
+    violations = []
+    for size, benchmarks in results.items():
+        if int(size) < LIMIT_MIN_ROWS:
+            continue
+        for (name, metric), limit in limits.items():
+            value = benchmarks.get(name, {}).get(metric)
+            if value is None:
+                continue
+            if metric in HIGHER_IS_BETTER and value < limit:
+                violations.append(
+                    f"{name}[{size}] {metric}: {value:,.2f} is below {limit:,.2f}"
+                )
+            elif metric not in HIGHER_IS_BETTER and value > limit:
+                violations.append(
+                    f"{name}[{size}] {metric}: {value:,.2f} exceeds {limit:,.2f}"
+                )
+    return violations
+
+
+def print_suite(results: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+    """
+    Prints suite results as one line per benchmark and dataset size.
+    """
+    print(f"{'benchmark':<28}{'rows':>10}{'rows/s':>14}{'latency µs':>14}{'MiB':>10}")
+    for size, benchmarks in results.items():
+        for name, metrics in benchmarks.items():
+            columns = [
+                f"{metrics[key]:,.1f}" if key in metrics else "-"
+                for key in ("rows_per_second", "latency_us", "peak_mib")
+            ]
+            print(
+                f"{name:<28}{int(size):>10,}{columns[0]:>14}"
+                f"{columns[1]:>14}{columns[2]:>10}"
+            )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Runs the trusted-load benchmark and prints rows per second, then the
+    memory per product of models and compact records.
+
+    With --suite, runs the hot-path suite instead for each --sizes value,
+    optionally saving the results as a baseline or checking them against
+    one; regressions beyond --tolerance, or metrics over `SUITE_LIMITS`,
+    make the exit status 1.
+    """
+    parser = argparse.ArgumentParser(description="Week3 Inventory benchmarks")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--suite", action="store_true", help="run the suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SUITE_SIZES))
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="compare with PATH")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    try:
+        if args.suite:
+            return _run_suite_command(args)
+        _print_trusted_load(args.rows)
+        return 0
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def _run_suite_command(args: argparse.Namespace) -> int:
+    results = run_suite(args.sizes)
+    print_suite(results)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+    violations = find_limit_violations(results)
+    for message in violations:
+        print(f"LIMIT {message}")
+    if not args.baseline:
+        return 1 if violations else 0
+    regressions = find_regressions(
+        results, load_baseline(args.baseline), args.tolerance
+    )
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions or violations else 0
+
+
+def _print_trusted_load(rows: int) -> None:
+    results = bench_trusted_load(rows)
+    for label in ("validated", "trusted"):
+        seconds = results[label]
+        print(f"{label:<10} {seconds:8.3f}s  {rows / seconds:12,.0f} rows/s")
+    print(f"speedup    {results['speedup']:8.2f}x")
+    for label, size in bytes_per_product(min(rows, 100_000)).items():
+        print(f"{label:<10} {size:8.0f} bytes/product")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import math
+from array import array
+from datetime import datetime
+from operator import mul
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import Product
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+NO_EXPIRY = math.inf
+
+
+class ColumnStore:
+    """
+    Array-backed columnar copy of the numeric product fields.
+
+    Columns hold product_id, quantity, price, a category code and the expiry
+    timestamp (`NO_EXPIRY` for products that never expire). Aggregates run over
+    these flat arrays instead of Pydantic objects; when NumPy is installed the
+    arrays are wrapped zero-copy and the work is vectorized.
+
+    Rows are removed by swapping in the last row, so row order is not the
+    inventory order. The product models themselves stay in `Inventory.products`.
+    """
+
+    fields = frozenset({"product_id", "quantity", "price", "category", "expiry_date"})
+
+    def __init__(self):
+        self.product_ids = array("q")
+        self.quantities = array("q")
+        self.prices = array("d")
+        self.category_codes = array("h")
+        self.expiries = array("d")
+        self.categories: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        self._rows: List[Product] = []
+        self._row_of: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def category_code(self, category: Optional[str]) -> int:
+        """
+        Returns the integer code for a category, registering it if new.
+        Categories are compared case-insensitively; missing ones map to "".
+        """
+        key = (category or "").lower().strip()
+        code = self._category_codes.get(key)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(key)
+            self._category_codes[key] = code
+        return code
+
+    def add(self, product: Product) -> None:
+        """
+        Appends a row for the given product.
+        """
+        expiry = getattr(product, "get_expiry_timestamp", None)
+        self._row_of[id(product)] = len(self._rows)
+        self._rows.append(product)
+        self.product_ids.append(product.product_id)
+        self.quantities.append(product.quantity)
+        self.prices.append(product.price)
+        self.category_codes.append(self.category_code(product.category))
+        self.expiries.append(expiry() if expiry is not None else NO_EXPIRY)
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        """
+        Appends a row for each of the given products.
+        """
+        products = list(products)
+        first = len(self._rows)
+        self._row_of.update((id(p), row) for row, p in enumerate(products, first))
+        self._rows.extend(products)
+        self.product_ids.extend([p.product_id for p in products])
+        self.quantities.extend([p.quantity for p in products])
+        self.prices.extend([p.price for p in products])
+        self.category_codes.extend([self.category_code(p.category) for p in products])
+        self.expiries.extend(
+            [
+                (
+                    p.get_expiry_timestamp()
+                    if hasattr(p, "get_expiry_timestamp")
+                    else NO_EXPIRY
+                )
+                for p in products
+            ]
+        )
+
+    def discard(self, product: Product) -> None:
+        """
+        Removes the row for the given product, if present.
+        """
+        row = self._row_of.pop(id(product), None)
+        if row is None:
+            return
+        last = len(self._rows) - 1
+        if row != last:
+            moved = self._rows[last]
+            self._rows[row] = moved
+            self._row_of[id(moved)] = row
+            for column in self._columns():
+                column[row] = column[last]
+        self._rows.pop()
+        for column in self._columns():
+            column.pop()
+
+    def clear(self) -> None:
+        """
+        Removes every row while keeping the category table.
+        """
+        self._rows.clear()
+        self._row_of.clear()
+        for column in self._columns():
+            del column[:]
+
+    def _columns(self) -> Tuple[array, ...]:
+        return (
+            self.product_ids,
+            self.quantities,
+            self.prices,
+            self.category_codes,
+            self.expiries,
+        )
+
+    def total_value(self) -> float:
+        """
+        Returns the sum of quantity * price over every row.
+        """
+        if not self._rows:
+            return 0.0
+        if np is not None:
+            quantities = np.frombuffer(self.quantities, dtype=np.int64)
+            prices = np.frombuffer(self.prices, dtype=np.float64)
+            return float(np.dot(quantities, prices))
+        return float(sum(map(mul, self.quantities, self.prices)))
+
+    def summarize(self, now: datetime) -> Tuple[int, int, float, Optional[Product]]:
+        """
+        Aggregates the rows that are not expired at `now`.
+
+        Returns:
+        - (count, total quantity, total value, highest-value product or None)
+        """
+        if not self._rows:
+            return 0, 0, 0.0, None
+        cutoff = now.timestamp()
+
+        if np is not None:
+            quantities = np.frombuffer(self.quantities, dtype=np.int64)
+            prices = np.frombuffer(self.prices, dtype=np.float64)
+            valid = np.frombuffer(self.expiries, dtype=np.float64) >= cutoff
+            count = int(np.count_nonzero(valid))
+            if count == 0:
+                return 0, 0, 0.0, None
+            values = np.where(valid, quantities * prices, -np.inf)
+            best = int(np.argmax(values))
+            return (
+                count,
+                int(quantities[valid].sum()),
+                float(values[valid].sum()),
+                self._rows[best],
+            )
+
+        count = total_quantity = 0
+        total_value = 0.0
+        best, best_value = -1, -math.inf
+        for row, (quantity, price, expiry) in enumerate(
+            zip(self.quantities, self.prices, self.expiries)
+        ):
+            if expiry < cutoff:
+                continue
+            value = quantity * price
+            count += 1
+            total_quantity += quantity
+            total_value += value
+            if value > best_value:
+                best, best_value = row, value
+        return (
+            count,
+            total_quantity,
+            total_value,
+            self._rows[best] if best >= 0 else None,
+        )
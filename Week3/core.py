@@ -1,86 +1,963 @@
 import csv
+import heapq
+import itertools
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List
+from functools import wraps
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
 
 from pydantic import ValidationError
 
-from .models import PRODUCT_CLASS_MAP, FoodProduct, Product
+from .aggregates import InventoryAggregates, analyze_products, build_summary
+from .columnar import ColumnStore
+from .errors import DEFAULT_MAX_LOGGED, IngestErrorCollector
+from .formats import (
+    COLUMNS,
+    FileRow,
+    iter_jsonl_rows,
+    iter_table_rows,
+    read_arrow,
+    read_parquet,
+    write_arrow,
+    write_jsonl,
+    write_parquet,
+)
+from .indexes import ExpiryIndex, PriceIndex, ProductIndex, QuantityIndex
+from .ingest import (
+    build_product,
+    build_trusted_product,
+    csv_byte_ranges,
+    iter_trusted_rows,
+    parse_csv_chunk,
+    row_error_message,
+)
+from .locks import RWLock, reads, writes
+from .models import FoodProduct, Product, category_key
+from .records import ProductRecord, to_record
+from .snapshot import (
+    SnapshotError,
+    read_snapshot,
+    read_stamp,
+    source_stamp,
+    write_snapshot,
+)
+from .storage import ProductList
+
+# How `Inventory.load_many` treats a product_id that is already loaded:
+# reject the row, replace the product, or add the quantities together
+DUPLICATE_POLICIES = ("error", "last", "sum")
+
+# Fields `Inventory.query` can order by
+QUERY_ORDER_FIELDS = ("product_id", "product_name", "price", "quantity")
+
+# (row number, raw row, product or None, error or None) for one CSV row
+RowResult = Tuple[int, Any, Optional[Product], Optional[Exception]]
+
+# Products a file load appends to the product list at once
+LOAD_BATCH_SIZE = 1000
+
+
+def _reads_swept(method: Callable) -> Callable:
+    """
+    Like `reads`, first sweeping expired food under the write lock when some
+    is due. Callers already holding the read lock skip the sweep, since a
+    read lock cannot be upgraded.
+    """
+    read = reads(method)
+
+    @wraps(method)
+    def swept(self: "Inventory", *args: Any, **kwargs: Any) -> Any:
+        if self._expiry.due(datetime.now()) and not self.lock.read_only():
+            self.sweep_expired()
+        return read(self, *args, **kwargs)
+
+    return swept
+
+
+class _LoadBatch:
+    """
+    Appends the products of a file load to an inventory `LOAD_BATCH_SIZE` at
+    a time, so its indexes and aggregates take each batch in one call.
+
+    The inventory's write lock is held for each batch only, so readers and
+    other writers get in between batches instead of waiting for the whole
+    file.
+
+    Used as a context manager; the last, partial batch is appended on exit,
+    also when the load fails part way.
+    """
+
+    def __init__(self, inventory: "Inventory", errors: IngestErrorCollector):
+        self.inventory = inventory
+        self.errors = errors
+        # product_id -> queued product, in row order
+        self.pending: Dict[int, Product] = {}
+        # product_id -> row number of the queued product
+        self.rows: Dict[int, int] = {}
+
+    def __enter__(self) -> "_LoadBatch":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def add(self, idx: int, product: Product) -> None:
+        """
+        Queues a product read from row `idx` unless its id is already
+        present or queued.
+        """
+        pending = self.pending
+        product_id = product.product_id
+        if product_id in pending or product_id in self.inventory._index:
+            self.errors.reject_duplicate(idx, product)
+            return
+        pending[product_id] = to_record(product) if self.inventory.compact else product
+        self.rows[product_id] = idx
+        if len(pending) >= LOAD_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Appends the queued products under the write lock, rejecting those
+        whose id another thread added since they were queued.
+        """
+        pending = self.pending
+        if not pending:
+            return
+        inventory = self.inventory
+        with inventory.lock.writing():
+            index = inventory._index
+            for product_id in [pid for pid in pending if pid in index]:
+                self.errors.reject_duplicate(
+                    self.rows[product_id], pending.pop(product_id)
+                )
+            inventory._products.extend(pending.values())
+        self.errors.loaded += len(pending)
+        self.pending, self.rows = {}, {}
 
 
 class Inventory:
-    def __init__(self):
+    def __init__(
+        self, columnar: bool = False, compact: bool = False, indexed: bool = False
+    ):
         """
         Initializes the Inventory with an empty list of products.
+
+        Args:
+        - columnar (bool): Also keep an array-backed `ColumnStore` of the numeric
+          fields in `columns`; `get_total_inventory` and `get_summary` then run
+          over those flat columns instead of the running aggregates.
+          `products` remains the list-of-models view.
+        - compact (bool): Store products loaded from CSV files and snapshots as
+          read-only `ProductRecord`s, which take a fraction of a model's
+          memory. Use `materialize` before changing one.
+        - indexed (bool): Also keep a per-category `PriceIndex`, which `query`
+          uses for category and price filters and price ordering instead of
+          scanning every product.
+
+        Inventories can be shared between threads. Methods that change the
+        inventory hold `lock` for writing and the others hold it for reading,
+        so many readers run together and wait only while a write is applied.
+        `get`, `contains` and `get_total_inventory` are single lookups and
+        take no lock. Iterate `copy_products()` rather than `products` while
+        other threads write, change products through `upsert` rather than
+        by assigning their attributes, and hold `lock.writing()` around
+        check-then-change sequences that must not interleave. File loads
+        take the write lock for each batch of `LOAD_BATCH_SIZE` products,
+        so readers are not held off for a whole file and may see it
+        partly loaded.
         """
-        self.products: List[Product] = []
+        self.lock = RWLock()
+        self.compact = compact
+        self._products = ProductList()
+        self._index = ProductIndex()
+        self._aggregates = InventoryAggregates()
+        self._quantities = QuantityIndex()
+        self._expiry = ExpiryIndex()
+        self._products.add_listener(self._index)
+        self._products.add_listener(self._aggregates)
+        self._products.add_listener(self._quantities)
+        self._products.add_listener(self._expiry)
+        self.columns: Optional[ColumnStore] = None
+        if columnar:
+            self.columns = ColumnStore()
+            self._products.add_listener(self.columns)
+        self._prices: Optional[PriceIndex] = None
+        if indexed:
+            self._prices = PriceIndex()
+            self._products.add_listener(self._prices)
 
-    def create_product_from_row(self, row: dict) -> Product:
+    @property
+    def products(self) -> List[Product]:
         """
-        Creates a Product instance based on the given row of data.
+        The products in the inventory, in insertion order.
         """
-        try:
+        return self._products
 
-            category_raw = row.get("category", "")
-            category = category_raw.lower().strip() if category_raw else ""
+    @products.setter
+    @writes
+    def products(self, products: Iterable[Product]) -> None:
+        self._products.clear()
+        self._products.extend(products)
 
-            product_class = PRODUCT_CLASS_MAP.get(category, Product)
+    @reads
+    def copy_products(self) -> List[Product]:
+        """
+        Returns a list of the products, in insertion order, taken under the
+        read lock so it can be used while other threads change the inventory.
+        """
+        return list(self._products)
 
-            base_fields = [
-                "product_id",
-                "product_name",
-                "category",
-                "quantity",
-                "price",
-            ]
+    def get(self, product_id: int) -> Optional[Product]:
+        """
+        Returns the product with the given id in O(1), or None if absent.
+        """
+        return self._index.get(product_id)
 
-            base_data = {
-                "product_id": int(row["product_id"]),
-                "product_name": row["product_name"],
-                "category": category_raw if category_raw else None,
-                "quantity": int(row["quantity"]),
-                "price": float(row["price"]),
-            }
-
-            extra_data = {
-                k: v for k, v in row.items() if k not in base_fields and v != ""
-            }
-            return product_class(**base_data, **extra_data)
-        except KeyError as e:
-            logging.error(f"Missing required field {e} in row: {row}")
-
-        except ValidationError as e:
-            logging.error(f"Validation error in row: {row} - {e}")
-
-        except (ValueError, TypeError) as e:
-            logging.error(f"Type error in row: {row} - Error: {e}")
-        except Exception as e:
-            logging.error(f"Unexpected error processing row: {row} - {e}")
+    def contains(self, product_id: int) -> bool:
+        """
+        Returns True if a product with the given id is in the inventory.
+        """
+        return product_id in self._index
+
+    @writes
+    def upsert(self, product: Product) -> Optional[Product]:
+        """
+        Adds the product, or replaces the product with the same id in place.
+
+        Returns:
+        - Optional[Product]: The replaced product, or None if it was inserted.
+        """
+        existing = self._index.get(product.product_id)
+        if existing is None:
+            self._products.append(product)
+        else:
+            self._products.replace(existing, product)
+        return existing
+
+    @writes
+    def remove(self, product_id: int) -> Optional[Product]:
+        """
+        Removes the product with the given id.
+
+        Returns:
+        - Optional[Product]: The removed product, or None if it was absent.
+        """
+        existing = self._index.get(product_id)
+        if existing is not None:
+            del self._products[self._products.position(existing)]
+        return existing
+
+    @writes
+    def remove_many(self, product_ids: Iterable[int]) -> List[Product]:
+        """
+        Removes the products with the given ids in one pass over the list.
 
+        Returns:
+        - List[Product]: The removed products; absent ids are ignored.
+        """
+        removed = {}
+        for product_id in product_ids:
+            existing = self._index.get(product_id)
+            if existing is not None:
+                removed[product_id] = existing
+        self._products.remove_many(removed.values())
+        return list(removed.values())
+
+    @writes
+    def materialize(self, product_id: int) -> Optional[Product]:
+        """
+        Returns the product with the given id as a full Pydantic model.
+
+        A compact `ProductRecord` is converted and replaces the record in
+        place, so the returned model can be changed and the change is
+        tracked like for any other product.
+        """
+        product = self._index.get(product_id)
+        if isinstance(product, ProductRecord):
+            model = product.to_model()
+            self._products.replace(product, model)
+            return model
+        return product
+
+    def create_product_from_row(self, row: dict, trusted: bool = False) -> Product:
+        """
+        Creates a Product instance based on the given row of data.
+
+        With `trusted=True` the row is converted by a precompiled per-category
+        constructor and instantiated with `model_construct`, skipping Pydantic
+        validation. Use it only for data that was validated upstream.
+        """
+        try:
+            if trusted:
+                return build_trusted_product(row)
+            return build_product(row)
+        except Exception as e:
+            logging.error(row_error_message(row, e))
         return None
 
-    def load_from_csv(self, csv_file: str) -> None:
+    def iter_from_csv(self, csv_file: str, trusted: bool = False) -> Iterator[Product]:
         """
-        Loads the inventory from the given CSV file.
-        Logs errors for invalid rows.
+        Streams validated products from the given CSV file one row at a time.
+
+        Rows are read lazily and never collected into a list, so memory use
+        stays bounded regardless of the file size. Invalid rows are logged
+        and skipped exactly as in `load_from_csv`.
+
+        Args:
+        - csv_file (str): Path to the CSV file to read.
+        - trusted (bool): Skip validation, see `create_product_from_row`.
+
+        Yields:
+        - Product: Each successfully validated product, in file order.
+        """
+        with IngestErrorCollector() as errors:
+            for _, product in self._iter_csv_rows(csv_file, trusted, errors):
+                yield product
+
+    def _iter_csv_rows(
+        self, csv_file: str, trusted: bool, errors: IngestErrorCollector
+    ) -> Iterator[Tuple[int, Product]]:
+        """
+        Yields (row number, product) for each valid CSV row, passing the
+        rest to `errors`.
         """
         try:
             with open(csv_file, newline="") as f:
-                reader = csv.DictReader(f)
-                for idx, row in enumerate(reader, start=2):
-                    product = self.create_product_from_row(row)
+                rows = self._trusted_rows(f) if trusted else self._validated_rows(f)
+                for idx, row, product, error in rows:
                     if product is not None:
-                        self.products.append(product)
+                        yield idx, product
                     else:
-                        logging.warning(f"Row {idx} skipped due to invalid data.")
+                        errors.reject(idx, row, error)
         except FileNotFoundError:
             logging.error(f"CSV file '{csv_file}' not found.")
         except (ValidationError, ValueError, TypeError) as e:
             idx_info = f"Row {idx}" if "idx" in locals() else "During reading CSV"
             logging.error(f"{idx_info}: {e}")
 
+    def _validated_rows(self, f: TextIO) -> Iterator[RowResult]:
+        """
+        Yields (row number, row, product, error) for each CSV row, with
+        validation; exactly one of product and error is None.
+        """
+        for idx, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                yield idx, row, build_product(row), None
+            except Exception as e:
+                yield idx, row, None, e
+
+    def _trusted_rows(self, f: TextIO) -> Iterator[RowResult]:
+        """
+        Yields (row number, row, product, error) for each CSV row using
+        builders precompiled for the file's header, without validation.
+        """
+        reader = csv.reader(f)
+        fieldnames = next(reader, None)
+        if fieldnames is None:
+            return
+        rows = iter_trusted_rows(reader, fieldnames)
+        for idx, (row, product, error) in enumerate(rows, start=2):
+            yield idx, dict(zip(fieldnames, row)) if error else row, product, error
+
+    def load_from_csv(
+        self,
+        csv_file: str,
+        workers: int = 1,
+        trusted: bool = False,
+        reject_file: Optional[str] = None,
+        max_logged: Optional[int] = DEFAULT_MAX_LOGGED,
+    ) -> dict:
+        """
+        Loads the inventory from the given CSV file.
+        Logs errors for invalid rows.
+
+        Args:
+        - csv_file (str): Path to the CSV file to load.
+        - workers (int): Number of processes used to validate rows. With more
+          than one, the file is split into line-aligned byte ranges that are
+          validated in a process pool and merged back in file order; logged
+          errors and "Row N skipped" numbers match the sequential load.
+        - trusted (bool): Build products without re-validating them, for exports
+          that were already validated upstream. See `create_product_from_row`.
+        - reject_file (str, optional): CSV file receiving every rejected row
+          with its row number, error type and fields.
+        - max_logged (int, optional): Errors of each type logged in full;
+          further errors are counted and summarized in one line per type.
+          Defaults to `errors.DEFAULT_MAX_LOGGED`; None logs every error
+          with its "Row N skipped" line.
+
+        Rows whose product_id is already in the inventory are rejected as
+        duplicates; the first occurrence is kept.
+
+        Returns:
+        - dict: Loaded and rejected row counts and rejected rows by error
+          type and field, see `IngestErrorCollector.summary`.
+        """
+        with IngestErrorCollector(reject_file, max_logged) as errors:
+            with _LoadBatch(self, errors) as batch:
+                if workers > 1:
+                    self._load_from_csv_parallel(csv_file, workers, trusted, batch)
+                else:
+                    for idx, product in self._iter_csv_rows(csv_file, trusted, errors):
+                        batch.add(idx, product)
+        return errors.summary()
+
+    def load_many(
+        self,
+        csv_files: Sequence[str],
+        workers: int = 1,
+        on_duplicate: str = "error",
+        trusted: bool = False,
+        reject_file: Optional[str] = None,
+        max_logged: Optional[int] = DEFAULT_MAX_LOGGED,
+    ) -> dict:
+        """
+        Loads several CSV files, such as per-warehouse shards, into the
+        inventory as one merge.
+
+        Args:
+        - csv_files (Sequence[str]): Paths of the CSV files, in merge order.
+        - workers (int): Number of processes used to validate rows. With more
+          than one, every file is split into byte ranges and the ranges of
+          all files are validated in one process pool, so reading and
+          validating later files overlaps with merging earlier ones. Rows
+          are merged in file order either way.
+        - on_duplicate (str): What to do with a row whose product_id is
+          already loaded, from an earlier file, row or load: "error" rejects
+          it as a duplicate like `load_from_csv`, "last" replaces the product
+          with the later row, and "sum" adds its quantity to the product.
+        - trusted (bool): Skip validation, see `create_product_from_row`.
+        - reject_file (str, optional): CSV file receiving the rejected rows
+          of every file, with a source_file column.
+        - max_logged (int, optional): Errors of each type logged in full
+          across all files, as in `load_from_csv`; further errors are
+          counted and summarized.
+
+        Raises:
+        - ValueError: For an unknown `on_duplicate` policy.
+
+        Returns:
+        - dict: The `load_from_csv` counts for all files together, plus
+          rejected rows by file ("by_file") and rows merged into a product
+          loaded before them ("merged").
+        """
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise ValueError(f"on_duplicate must be one of {DUPLICATE_POLICIES}")
+        merged = 0
+        with IngestErrorCollector(reject_file, max_logged, with_source=True) as errors:
+            if workers > 1:
+                rows = self._iter_parallel_rows(csv_files, workers, trusted, errors)
+            else:
+                rows = self._iter_shard_rows(csv_files, trusted, errors)
+            try:
+                with _LoadBatch(self, errors) as batch:
+                    for idx, product in rows:
+                        merged += self._merge_loaded(idx, product, on_duplicate, batch)
+            except (ValidationError, ValueError, TypeError) as e:
+                logging.error(f"During reading CSV: {e}")
+        summary = errors.summary()
+        summary["merged"] = merged
+        return summary
+
+    def _iter_shard_rows(
+        self, csv_files: Sequence[str], trusted: bool, errors: IngestErrorCollector
+    ) -> Iterator[Tuple[int, Product]]:
+        """
+        Yields (row number, product) for each valid row of each file in turn.
+        """
+        for csv_file in csv_files:
+            errors.source = csv_file
+            yield from self._iter_csv_rows(csv_file, trusted, errors)
+
+    def _merge_loaded(
+        self,
+        idx: int,
+        product: Product,
+        on_duplicate: str,
+        batch: _LoadBatch,
+    ) -> bool:
+        """
+        Adds a product read from row `idx`, applying the `load_many`
+        duplicate policy. Returns True if it was merged into a product
+        that was already loaded.
+        """
+        if on_duplicate == "error":
+            batch.add(idx, product)
+            return False
+        if product.product_id in batch.pending:
+            batch.flush()
+        with self.lock.writing():
+            existing = self._index.get(product.product_id)
+            if existing is None:
+                batch.add(idx, product)
+                return False
+            if on_duplicate == "sum":
+                if isinstance(existing, ProductRecord):
+                    base = existing.to_model()
+                else:
+                    base = existing
+                quantity = existing.quantity + product.quantity
+                product = base.model_copy(update={"quantity": quantity})
+            self._products.replace(
+                existing, to_record(product) if self.compact else product
+            )
+        batch.errors.loaded += 1
+        return True
+
+    def load_from_jsonl(
+        self,
+        jsonl_file: str,
+        trusted: bool = False,
+        reject_file: Optional[str] = None,
+        max_logged: Optional[int] = DEFAULT_MAX_LOGGED,
+    ) -> dict:
+        """
+        Loads the inventory from a JSON Lines file with one product per line.
+
+        Objects use the CSV column names as keys; values may be strings, as
+        in the CSV, or JSON numbers. Rows are validated exactly like CSV
+        rows (null values count as empty cells), and invalid lines and
+        duplicate product_ids are handled as in `load_from_csv`, whose
+        other arguments and summary this shares.
+        """
+        with IngestErrorCollector(reject_file, max_logged) as errors:
+            errors.set_fieldnames(COLUMNS)
+            try:
+                with open(jsonl_file) as f:
+                    self._load_file_rows(iter_jsonl_rows(f), trusted, errors)
+            except FileNotFoundError:
+                logging.error(f"File '{jsonl_file}' not found.")
+            except (OSError, ValueError) as e:
+                logging.error(f"Error reading '{jsonl_file}': {e}")
+        return errors.summary()
+
+    def load_from_parquet(
+        self,
+        parquet_file: str,
+        trusted: bool = False,
+        reject_file: Optional[str] = None,
+        max_logged: Optional[int] = DEFAULT_MAX_LOGGED,
+    ) -> dict:
+        """
+        Loads the inventory from a Parquet file, validating each row like
+        `load_from_csv` does; see `load_from_jsonl`. Needs pyarrow.
+
+        For totals and filters that do not need product objects, read the
+        file with `formats.scan_parquet` instead.
+        """
+        return self._load_table(
+            parquet_file, read_parquet, trusted, reject_file, max_logged
+        )
+
+    def load_from_arrow(
+        self,
+        arrow_file: str,
+        trusted: bool = False,
+        reject_file: Optional[str] = None,
+        max_logged: Optional[int] = DEFAULT_MAX_LOGGED,
+    ) -> dict:
+        """
+        Loads the inventory from an Arrow IPC file or stream, validating each
+        row like `load_from_csv` does; see `load_from_jsonl`. Needs pyarrow.
+
+        For totals and filters that do not need product objects, read the
+        file with `formats.scan_arrow` instead.
+        """
+        return self._load_table(
+            arrow_file, read_arrow, trusted, reject_file, max_logged
+        )
+
+    @reads
+    def save_jsonl(self, jsonl_file: str) -> None:
+        """
+        Saves the products as JSON Lines. Logs errors if the file cannot be
+        written.
+        """
+        self._save_file(jsonl_file, write_jsonl)
+
+    @reads
+    def save_parquet(self, parquet_file: str) -> None:
+        """
+        Saves the products as a Parquet file with one typed column per field.
+        Logs errors if the file cannot be written. Needs pyarrow.
+        """
+        self._save_file(parquet_file, write_parquet)
+
+    @reads
+    def save_arrow(self, arrow_file: str) -> None:
+        """
+        Saves the products as an Arrow IPC file with one typed column per
+        field. Logs errors if the file cannot be written. Needs pyarrow.
+        """
+        self._save_file(arrow_file, write_arrow)
+
+    def _load_table(
+        self,
+        path: str,
+        read: Callable[[str], Any],
+        trusted: bool,
+        reject_file: Optional[str],
+        max_logged: Optional[int],
+    ) -> dict:
+        """
+        Reads an Arrow table with `read` and loads its rows one batch at a time.
+        """
+        with IngestErrorCollector(reject_file, max_logged) as errors:
+            try:
+                table = read(path)
+            except FileNotFoundError:
+                logging.error(f"File '{path}' not found.")
+            except (OSError, ValueError) as e:
+                logging.error(f"Error reading '{path}': {e}")
+            else:
+                errors.set_fieldnames(table.column_names)
+                self._load_file_rows(iter_table_rows(table), trusted, errors)
+        return errors.summary()
+
+    def _load_file_rows(
+        self, rows: Iterable[FileRow], trusted: bool, errors: IngestErrorCollector
+    ) -> None:
+        """
+        Builds and adds the products of (row number, row, read error) triples.
+        """
+        build = build_trusted_product if trusted else build_product
+        with _LoadBatch(self, errors) as batch:
+            for idx, row, error in rows:
+                if error is None:
+                    try:
+                        product = build(row)
+                    except Exception as e:
+                        error = e
+                    else:
+                        batch.add(idx, product)
+                        continue
+                errors.reject(idx, row, error)
+
+    def _save_file(self, path: str, write: Callable[[str, list], None]) -> None:
+        try:
+            write(path, self._products)
+        except (OSError, ValueError) as e:
+            logging.error(f"Error writing '{path}': {e}")
+
+    @reads
+    def save_snapshot(
+        self, snapshot_file: str, source_csv: Optional[str] = None
+    ) -> None:
+        """
+        Saves the products to a compact, versioned binary snapshot.
+
+        Args:
+        - snapshot_file (str): Path of the snapshot; an existing file is
+          replaced atomically.
+        - source_csv (str, optional): CSV the products were loaded from. Its
+          modification time and size are recorded so `load_with_snapshot`
+          can tell when the snapshot is stale.
+
+        Logs errors if the file cannot be written.
+        """
+        try:
+            stamp = source_stamp(source_csv) if source_csv else (0, 0)
+            write_snapshot(snapshot_file, self._products, stamp)
+        except (OSError, ValueError) as e:
+            logging.error(f"Error writing snapshot '{snapshot_file}': {e}")
+
+    def load_snapshot(self, snapshot_file: str) -> bool:
+        """
+        Adds the products stored in a snapshot written by `save_snapshot`.
+
+        The file is memory-mapped and its columns are read without copying;
+        products are restored without re-validation since they were validated
+        before being saved. Only load snapshots this application wrote. As in
+        `load_from_csv`, products whose id is already in the inventory, or
+        earlier in the snapshot, are skipped and logged.
+
+        Returns:
+        - bool: True if loaded, False if the file is missing, corrupt or from
+          another format version (the error is logged).
+        """
+        try:
+            products = read_snapshot(snapshot_file, records=self.compact)
+        except FileNotFoundError:
+            logging.error(f"Snapshot file '{snapshot_file}' not found.")
+            return False
+        except (OSError, SnapshotError) as e:
+            logging.error(f"Error reading snapshot '{snapshot_file}': {e}")
+            return False
+        with IngestErrorCollector() as errors:
+            with self.lock.writing():
+                index, seen, fresh = self._index, set(), []
+                for idx, product in enumerate(products, start=1):
+                    product_id = product.product_id
+                    if product_id in index or product_id in seen:
+                        errors.reject_duplicate(idx, product)
+                        continue
+                    seen.add(product_id)
+                    fresh.append(product)
+                self._products.extend(fresh)
+        return True
+
+    @writes
+    def load_with_snapshot(
+        self,
+        csv_file: str,
+        snapshot_file: Optional[str] = None,
+        trusted: bool = False,
+    ) -> None:
+        """
+        Loads the CSV file through a binary snapshot cache.
+
+        The snapshot is used when it was written from the CSV's current
+        version (same modification time and size). Otherwise the CSV is
+        loaded with `load_from_csv` and the snapshot is rewritten, so it
+        refreshes automatically whenever the CSV changes. Unlike the other
+        loads it holds the write lock throughout, so the rewritten snapshot
+        holds exactly the rows it loaded.
+
+        Args:
+        - csv_file (str): Path to the source CSV file.
+        - snapshot_file (str, optional): Snapshot path; defaults to
+          `csv_file` with a ".snap" suffix.
+        - trusted (bool): Passed to `load_from_csv` when the CSV is parsed.
+        """
+        snapshot_file = snapshot_file or f"{csv_file}.snap"
+        try:
+            stamp = source_stamp(csv_file)
+            fresh = read_stamp(snapshot_file) == stamp
+        except (OSError, SnapshotError):
+            fresh = False
+        if fresh and self.load_snapshot(snapshot_file):
+            return
+
+        try:
+            stamp = source_stamp(csv_file)
+        except FileNotFoundError:
+            logging.error(f"CSV file '{csv_file}' not found.")
+            return
+        start = len(self._products)
+        self.load_from_csv(csv_file, trusted=trusted)
+        try:
+            write_snapshot(snapshot_file, self._products[start:], stamp)
+        except (OSError, ValueError) as e:
+            logging.error(f"Error writing snapshot '{snapshot_file}': {e}")
+
+    def _load_from_csv_parallel(
+        self, csv_file: str, workers: int, trusted: bool, batch: _LoadBatch
+    ) -> None:
+        """
+        Validates byte-range chunks of the CSV file in a process pool.
+        """
+        try:
+            for idx, product in self._iter_parallel_rows(
+                [csv_file], workers, trusted, batch.errors
+            ):
+                batch.add(idx, product)
+        except (ValidationError, ValueError, TypeError) as e:
+            logging.error(f"During reading CSV: {e}")
+
+    def _iter_parallel_rows(
+        self,
+        csv_files: Sequence[str],
+        workers: int,
+        trusted: bool,
+        errors: IngestErrorCollector,
+    ) -> Iterator[Tuple[int, Product]]:
+        """
+        Validates byte-range chunks of the CSV files in one process pool and
+        yields (row number, product) for valid rows in file and row order,
+        passing the rest to `errors`.
+
+        Every chunk is submitted up front, so workers read and validate
+        later chunks while earlier results are being merged. From a chunk
+        that ends inside a quoted field, such as one holding a line break,
+        the rest of that file is read here in one piece, so every file loads
+        exactly as `load_from_csv` would load it sequentially.
+        """
+        shards = []
+        for csv_file in csv_files:
+            try:
+                fieldnames, ranges = csv_byte_ranges(csv_file, workers)
+            except FileNotFoundError:
+                logging.error(f"CSV file '{csv_file}' not found.")
+                continue
+            if ranges:
+                shards.append((csv_file, fieldnames, ranges))
+        chunks = sum(len(ranges) for _, _, ranges in shards)
+        if not chunks:
+            return
+
+        with ProcessPoolExecutor(max_workers=min(workers, chunks)) as pool:
+            submitted = [
+                (
+                    csv_file,
+                    fieldnames,
+                    ranges,
+                    [
+                        pool.submit(
+                            parse_csv_chunk, csv_file, fieldnames, start, end, trusted
+                        )
+                        for start, end in ranges
+                    ],
+                )
+                for csv_file, fieldnames, ranges in shards
+            ]
+            for csv_file, fieldnames, ranges, futures in submitted:
+                errors.source = csv_file
+                errors.set_fieldnames(fieldnames)
+                first_row = 2
+                for chunk, future in enumerate(futures):
+                    result = future.result()
+                    rest = result is None
+                    if rest:
+                        # The chunk ends inside a quoted field, so later
+                        # chunks start mid-row: read the rest in one piece
+                        logging.warning(
+                            f"'{csv_file}' has a quoted field spanning a chunk "
+                            f"boundary; reading it sequentially from row {first_row}."
+                        )
+                        for pending in futures:
+                            pending.cancel()
+                        result = parse_csv_chunk(
+                            csv_file,
+                            fieldnames,
+                            ranges[chunk][0],
+                            ranges[-1][1],
+                            trusted,
+                            strict=False,
+                        )
+                    products, rejected, rows = result
+                    failures = {offset: (row, e) for offset, row, e in rejected}
+                    valid = iter(products)
+                    for offset in range(rows):
+                        if offset in failures:
+                            errors.reject(first_row + offset, *failures[offset])
+                        else:
+                            yield first_row + offset, next(valid)
+                    first_row += rows
+                    if rest:
+                        break
+
+    @reads
+    def query(
+        self,
+        category: Optional[str] = None,
+        price_between: Optional[Tuple[Optional[float], Optional[float]]] = None,
+        qty_lt: Optional[int] = None,
+        order_by: Optional[str] = "product_id",
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Product]:
+        """
+        Returns the products matching every given filter, sorted and paged.
+
+        With `indexed=True` the price index supplies the candidates of
+        category and price queries; price-ordered pages are then read in
+        order and reading stops once the page is full. Other queries scan
+        the products, keeping only the `offset + limit` best in a heap when
+        a limit is given. Expired food is included.
+
+        Args:
+        - category (str, optional): Category to match, case-insensitively;
+          "" matches products without a category.
+        - price_between (tuple, optional): Inclusive (low, high) price range;
+          either bound may be None.
+        - qty_lt (int, optional): Only products with a smaller quantity.
+        - order_by (str, optional): "product_id", "product_name", "price" or
+          "quantity", prefixed with "-" for descending order. Ties are
+          ordered by product_id in the same direction. None keeps insertion
+          order, scanning the products without an index.
+        - limit (int, optional): Maximum number of products returned.
+        - offset (int): Number of matching products skipped first.
+
+        Raises:
+        - ValueError: For an unknown order_by field or a negative limit or
+          offset.
+        """
+        descending = order_by is not None and order_by.startswith("-")
+        field = order_by[1:] if descending else order_by
+        if field is not None and field not in QUERY_ORDER_FIELDS:
+            raise ValueError(
+                f"Cannot order by '{order_by}'; use one of {QUERY_ORDER_FIELDS}"
+            )
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("limit and offset must not be negative")
+        low, high = price_between or (None, None)
+        key = category.lower().strip() if category is not None else None
+
+        checks: List[Callable[[Product], bool]] = []
+        use_index = (
+            self._prices is not None
+            and field is not None
+            and (key is not None or price_between is not None or field == "price")
+        )
+        if use_index:
+            candidates: Iterable[Product] = self._prices.between(
+                low, high, key, reverse=descending and field == "price"
+            )
+        else:
+            candidates = self._products
+            if key is not None:
+                checks.append(lambda p: category_key(p) == key)
+            if low is not None:
+                checks.append(lambda p: p.price >= low)
+            if high is not None:
+                checks.append(lambda p: p.price <= high)
+        if qty_lt is not None:
+            checks.append(lambda p: p.quantity < qty_lt)
+        matches = (p for p in candidates if all(check(p) for check in checks))
+
+        stop = None if limit is None else offset + limit
+        if field is None or (use_index and field == "price"):
+            return list(itertools.islice(matches, offset, stop))
+        sort_key = attrgetter(field, "product_id")
+        if stop is None:
+            ordered = sorted(matches, key=sort_key, reverse=descending)
+        elif descending:
+            ordered = heapq.nlargest(stop, matches, key=sort_key)
+        else:
+            ordered = heapq.nsmallest(stop, matches, key=sort_key)
+        return ordered[offset:]
+
+    @_reads_swept
+    def low_stock(
+        self,
+        threshold: int = 10,
+        category_thresholds: Optional[Dict[str, int]] = None,
+    ) -> List[Product]:
+        """
+        Returns products with quantities below the threshold, lowest first.
+
+        Answered from a quantity-ordered index, so the cost grows with the
+        number of matches rather than the size of the inventory.
+
+        Args:
+        - threshold (int): Quantity below which products are considered low stock.
+        - category_thresholds (dict, optional): Per-category thresholds, e.g.
+          {"food": 20}, overriding `threshold` for those categories.
+
+        Ignores expired food products.
+        """
+        return list(self._quantities.below(threshold, category_thresholds))
+
     def generate_low_stock_report(
-        self, threshold: int = 10, output_file: str = "low_stock_report.txt"
+        self,
+        threshold: int = 10,
+        output_file: str = "low_stock_report.txt",
+        products: Optional[Iterable[Product]] = None,
+        category_thresholds: Optional[Dict[str, int]] = None,
     ) -> None:
         """
         Generates a low stock report for the inventory.
@@ -88,26 +965,42 @@ class Inventory:
         Args:
         - threshold (int): Defines the quantity below which products are considered low stock.
         - output_file (str): The name of the file to which the report will be written.
+        - products (Iterable[Product], optional): Products to report on instead of
+          the loaded inventory, e.g. `iter_from_csv(...)`. Lines are written as
+          the products are consumed, so a generator is never materialized.
+        - category_thresholds (dict, optional): Per-category thresholds
+          overriding `threshold`, as in `low_stock`.
 
         Writes to the given file a list of products with quantities below the given threshold.
+        The loaded inventory is reported lowest quantity first, using `low_stock`.
         Ignores expired food products.
         Logs errors if the output file directory is not found.
         """
         try:
-            now = datetime.now()
-            low_stock_items: List[Product] = [
-                p
-                for p in self.products
-                if p.quantity < threshold
-                and not (isinstance(p, FoodProduct) and p.expiry_date < now)
-            ]
+            if products is None:
+                low_stock_items: Iterable[Product] = self.low_stock(
+                    threshold, category_thresholds
+                )
+            else:
+                now = datetime.now()
+                limits = {
+                    name.lower().strip(): limit
+                    for name, limit in (category_thresholds or {}).items()
+                }
+                low_stock_items = (
+                    p
+                    for p in products
+                    if p.quantity < limits.get(category_key(p), threshold)
+                    and not (isinstance(p, FoodProduct) and p.expiry_date < now)
+                )
             with open(output_file, "w", encoding="utf-8") as f:
-                if not low_stock_items:
+                written = 0
+                for product in low_stock_items:
+                    f.write(f"{product.product_name}: {product.quantity}\n")
+                    written += 1
+                if not written:
                     logging.info("No products found below the stock threshold.")
                     f.write("✅ All products have sufficient stock levels.\n")
-                else:
-                    for product in low_stock_items:
-                        f.write(f"{product.product_name}: {product.quantity}\n")
         except FileNotFoundError:
             logging.error(f"Output directory for file '{output_file}' not found.")
         except Exception as e:
@@ -116,10 +1009,18 @@ class Inventory:
     def get_total_inventory(self) -> float:
         """
         Calculates the total value of the inventory.
+
+        Read from running aggregates, so the cost does not depend on the
+        number of products. With `columnar=True` it is summed over the
+        columns instead, under the read lock since the arrays are read in
+        place and cannot be resized while a NumPy view of them is alive.
         """
-        return sum(p.get_total_value() for p in self.products)
+        if self.columns is not None:
+            with self.lock.reading():
+                return self.columns.total_value()
+        return self._aggregates.all.value
 
-    def get_summary(self) -> dict:
+    def get_summary(self, products: Optional[Iterable[Product]] = None) -> dict:
         """
         Returns a summary of inventory including:
         - Total products
@@ -128,49 +1029,161 @@ class Inventory:
         - Total value
 
         Expired FoodProducts are excluded from the summary.
-        """
-        now = datetime.now()
 
-        valid_products = [
-            p
-            for p in self.products
-            if not (isinstance(p, FoodProduct) and p.expiry_date < now)
-        ]
+        The values come from aggregates maintained as products are added,
+        replaced or removed; only food items that expired since the previous
+        sweep are processed here. With `columnar=True` they are computed over
+        the columns instead, vectorized when NumPy is installed.
 
-        total_products = len(valid_products)
+        Args:
+        - products (Iterable[Product], optional): Products to summarize instead
+          of the loaded inventory. They are aggregated in a single pass without
+          being stored, so `iter_from_csv(...)` can be summarized in bounded memory.
+          They are read without taking the lock or sweeping the inventory.
+        """
+        if products is not None:
+            return self._summarize_stream(products)
+        return self._summarize()
 
-        if total_products == 0:
-            logging.warning(
-                "No valid (non-expired) products. Summary values will all be zero."
-            )
-            return {
-                "total_products": 0,
-                "total_quantity": 0,
-                "hs_name": "N/A",
-                "hs_amt": 0.0,
-                "total_value": 0.0,
-            }
-
-        total_quantity = sum(p.quantity for p in valid_products)
-        total_value = sum(p.get_total_value() for p in valid_products)
-
-        if total_quantity == 0:
-            logging.warning(
-                "Total quantity is zero — all products may be out of stock."
-            )
+    @_reads_swept
+    def _summarize(self) -> dict:
+        if self.columns is not None:
+            return self._summarize_columns()
+
+        aggregates = self._aggregates
 
         try:
-            highest_sale = max(valid_products, key=lambda p: p.get_total_value())
-            hs_name = highest_sale.product_name
-            hs_amt = highest_sale.get_total_value()
+            highest_sale = aggregates.highest_sale()
+            if highest_sale is None:
+                hs_name, hs_amt = "N/A", 0.0
+            else:
+                hs_name = highest_sale.product_name
+                hs_amt = highest_sale.get_total_value()
         except Exception as e:
             logging.error(f"Error calculating highest sale: {e}")
             hs_name, hs_amt = "N/A", 0.0
 
-        return {
-            "total_products": total_products,
-            "total_quantity": total_quantity,
-            "hs_name": hs_name,
-            "hs_amt": hs_amt,
-            "total_value": total_value,
-        }
+        valid = aggregates.valid
+        return build_summary(valid.count, valid.quantity, hs_name, hs_amt, valid.value)
+
+    @_reads_swept
+    def get_category_breakdown(self) -> Dict[str, dict]:
+        """
+        Returns count, quantity and total value per category, excluding
+        expired FoodProducts. Categories are compared case-insensitively and
+        products without one are grouped under "".
+        """
+        return self._aggregates.category_breakdown()
+
+    def get_analytics(
+        self, top_n: int = 5, products: Optional[Iterable[Product]] = None
+    ) -> dict:
+        """
+        Returns per-category count, quantity, value and min/max price, ranked
+        by value, and the `top_n` highest-value products, computed in one
+        pass over the products. See `aggregates.analyze_products`.
+
+        Expired FoodProducts are excluded.
+
+        Args:
+        - top_n (int): Number of highest-value products to return.
+        - products (Iterable[Product], optional): Products to analyze instead
+          of the loaded inventory, e.g. `iter_from_csv(...)`. They are read
+          without taking the lock.
+        """
+        if products is not None:
+            return analyze_products(products, top_n)
+        return self._analyze(top_n)
+
+    @reads
+    def _analyze(self, top_n: int) -> dict:
+        return analyze_products(self._products, top_n)
+
+    @writes
+    def sweep_expired(self, now: Optional[datetime] = None) -> List[FoodProduct]:
+        """
+        Moves food products whose expiry has passed into the expired partition,
+        taking them out of the summary totals and the low-stock index.
+
+        Expiry-aware queries sweep first, so each call only pays for the items
+        that expired since the previous sweep. Services may also call it on a
+        timer, using `next_expiry` to know when the next item is due.
+
+        Args:
+        - now (datetime, optional): Sweep up to this time instead of the current one.
+
+        Returns:
+        - List[FoodProduct]: The newly expired products.
+        """
+        expired = self._expiry.sweep(datetime.now() if now is None else now)
+        for product in expired:
+            self._aggregates.expire(product)
+            self._quantities.discard(product)
+        return expired
+
+    def next_expiry(self) -> Optional[datetime]:
+        """
+        Returns the expiry date of the next food product due to expire, or None.
+
+        The lookup holds the read lock. Stale entries left at the head of the
+        expiry heap by removed or re-dated products are first popped under
+        the write lock, unless the caller already holds the read lock.
+        """
+        if self._expiry.stale() and not self.lock.read_only():
+            self._prune_expiry()
+        return self._next_expiry()
+
+    @reads
+    def _next_expiry(self) -> Optional[datetime]:
+        return self._expiry.next_expiry()
+
+    @writes
+    def _prune_expiry(self) -> None:
+        self._expiry.prune()
+
+    @_reads_swept
+    def get_expired_products(self) -> List[FoodProduct]:
+        """
+        Returns the food products in the expired partition after a sweep.
+        """
+        return self._expiry.expired()
+
+    def _summarize_columns(self) -> dict:
+        """
+        Builds the `get_summary` result from the column store.
+        """
+        count, total_quantity, total_value, highest = self.columns.summarize(
+            datetime.now()
+        )
+        if highest is None:
+            hs_name, hs_amt = "N/A", 0.0
+        else:
+            hs_name, hs_amt = highest.product_name, highest.get_total_value()
+        return build_summary(count, total_quantity, hs_name, hs_amt, total_value)
+
+    def _summarize_stream(self, products: Iterable[Product]) -> dict:
+        """
+        Builds the `get_summary` result in a single pass over the given products,
+        keeping only running totals and the current highest sale in memory.
+        """
+        now = datetime.now()
+        total_products = 0
+        total_quantity = 0
+        total_value = 0.0
+        hs_name, hs_amt = "N/A", 0.0
+        highest = None
+
+        for p in products:
+            if isinstance(p, FoodProduct) and p.expiry_date < now:
+                continue
+            value = p.get_total_value()
+            total_products += 1
+            total_quantity += p.quantity
+            total_value += value
+            if highest is None or value > highest:
+                highest = value
+                hs_name, hs_amt = p.product_name, value
+
+        return build_summary(
+            total_products, total_quantity, hs_name, hs_amt, total_value
+        )
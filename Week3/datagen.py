@@ -0,0 +1,182 @@
+import argparse
+import csv
+import json
+import random
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .formats import COLUMNS
+
+# Category weights; "" is a general product without category-specific fields
+DEFAULT_MIX: Dict[str, float] = {"food": 3, "electronic": 3, "book": 2, "": 2}
+DEFAULT_START = date(2020, 1, 1)
+DEFAULT_END = date(2025, 12, 31)
+# Ways a row is made invalid, each rejected by `Inventory.load_from_csv`
+INVALID_KINDS = ("quantity", "price", "expiry")
+FORMATS = ("csv", "jsonl")
+
+NAMES: Dict[str, Sequence[str]] = {
+    "food": ("Milk", "Bread", "Cheese", "Apples", "Rice", "Coffee", "Yogurt"),
+    "electronic": ("Laptop", "Monitor", "Router", "Headphones", "Keyboard"),
+    "book": ("Python 101", "Data Science Primer", "Clean Code", "Algorithms"),
+    "": ("Pen", "Pencil", "Notebook", "Marker", "Stapler", "Ruler"),
+}
+AUTHORS = ("John Doe", "Jane Doe", "Ada Lovelace", "Alan Turing", "Grace Hopper")
+WARRANTY_MONTHS = ("0", "6", "12", "24", "36")
+# Shelf life, in days, of generated food
+SHELF_LIFE = (7, 730)
+# Earliest publication year of generated books; the latest is `end`'s year
+FIRST_PUBLICATION_YEAR = 1950
+
+
+def generate_rows(
+    count: int,
+    seed: int = 0,
+    category_mix: Optional[Dict[str, float]] = None,
+    start: date = DEFAULT_START,
+    end: date = DEFAULT_END,
+    invalid_rate: float = 0.0,
+    first_id: int = 1,
+) -> Iterator[List[str]]:
+    """
+    Yields synthetic product rows as lists of strings in `formats.COLUMNS`
+    order, the column layout read by `Inventory.load_from_csv` and Week9
+    `seed-db`.
+
+    Args:
+    - count (int): Number of rows.
+    - seed (int): Seed of the random generator; the same arguments always
+      produce the same rows.
+    - category_mix (dict, optional): Relative weight per category, with ""
+      for general products. Defaults to `DEFAULT_MIX`.
+    - start, end (date): Range of manufacturing and purchase dates. Book
+      publication years run from FIRST_PUBLICATION_YEAR to `end`'s year, so
+      the rows never depend on the current date.
+    - invalid_rate (float): Fraction of rows made invalid with a bad
+      quantity, a negative price, or an expiry date before the
+      manufacturing date (such rows are food).
+    - first_id (int): product_id of the first row; ids are consecutive.
+
+    Raises:
+    - ValueError: For an empty or unknown category mix, a date range that
+      ends before it starts, or an invalid rate outside [0, 1].
+    """
+    mix = DEFAULT_MIX if category_mix is None else category_mix
+    unknown = set(mix) - set(NAMES)
+    if unknown or not any(weight > 0 for weight in mix.values()):
+        raise ValueError(f"Category mix needs weights for {sorted(NAMES)}")
+    if end < start:
+        raise ValueError("Date range ends before it starts")
+    if not 0 <= invalid_rate <= 1:
+        raise ValueError("invalid_rate must be between 0 and 1")
+
+    rng = random.Random(seed)
+    categories, weights = list(mix), list(mix.values())
+    first_day, last_day = start.toordinal(), end.toordinal()
+    last_year = max(end.year, FIRST_PUBLICATION_YEAR)
+    for product_id in range(first_id, first_id + count):
+        category = rng.choices(categories, weights)[0]
+        invalid = INVALID_KINDS[rng.randrange(3)] if rng.random() < invalid_rate else ""
+        if invalid == "expiry":
+            category = "food"
+        row = dict.fromkeys(COLUMNS, "")
+        row.update(
+            product_id=str(product_id),
+            product_name=f"{rng.choice(NAMES[category])} {product_id}",
+            category=category,
+            quantity="n/a" if invalid == "quantity" else str(rng.randint(0, 200)),
+            price=f"{rng.uniform(0.5, 2000):.2f}",
+        )
+        if invalid == "price":
+            row["price"] = f"-{row['price']}"
+        if category == "food":
+            made = rng.randint(first_day, last_day)
+            shelf_life = rng.randint(*SHELF_LIFE)
+            expires = made - shelf_life if invalid == "expiry" else made + shelf_life
+            row["mfg_date"] = date.fromordinal(made).isoformat()
+            row["expiry_date"] = date.fromordinal(expires).isoformat()
+        elif category == "electronic":
+            made = rng.randint(first_day, last_day)
+            row["purchase_date"] = date.fromordinal(made).isoformat()
+            row["warranty_period"] = rng.choice(WARRANTY_MONTHS)
+        elif category == "book":
+            row["author"] = rng.choice(AUTHORS)
+            row["publication_year"] = str(
+                rng.randint(FIRST_PUBLICATION_YEAR, last_year)
+            )
+        yield list(row.values())
+
+
+def write_dataset(path: str, count: int, fmt: Optional[str] = None, **options) -> None:
+    """
+    Streams `count` generated rows to a CSV or JSON Lines file.
+
+    Rows are written as they are generated, so memory use does not grow
+    with `count`. JSON Lines objects use the CSV column names as keys and
+    keep every value as the string the CSV would hold.
+
+    Args:
+    - path (str): Output file.
+    - count (int): Number of rows.
+    - fmt (str, optional): "csv" or "jsonl"; inferred from the file
+      extension when omitted, defaulting to CSV.
+    - options: Passed to `generate_rows`.
+    """
+    fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}'; use one of {FORMATS}")
+    rows = generate_rows(count, **options)
+    with open(path, "w", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(rows)
+        else:
+            dumps = json.JSONEncoder(ensure_ascii=False).encode
+            f.writelines(f"{dumps(dict(zip(COLUMNS, row)))}\n" for row in rows)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Parses a category mix written as "food=3,electronic=3,book=2,general=2";
+    "general" stands for products without a category.
+    """
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip().lower()
+        mix["" if name == "general" else name] = float(weight)
+    return mix
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Command line entry point: python -m Week3.datagen OUTPUT --rows N ...
+    """
+    parser = argparse.ArgumentParser(description="Generate synthetic inventories")
+    parser.add_argument("output", help="CSV or .jsonl file to write")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--mix", type=parse_mix, help="e.g. food=3,electronic=3,book=2,general=2"
+    )
+    parser.add_argument("--start", type=date.fromisoformat, default=DEFAULT_START)
+    parser.add_argument("--end", type=date.fromisoformat, default=DEFAULT_END)
+    parser.add_argument("--invalid-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    write_dataset(
+        args.output,
+        args.rows,
+        args.format,
+        seed=args.seed,
+        category_mix=args.mix,
+        start=args.start,
+        end=args.end,
+        invalid_rate=args.invalid_rate,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import csv
+import logging
+from collections import Counter
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic import ValidationError
+
+from .ingest import row_error_message
+from .models import Product
+
+# Errors of each type logged in full before the rest are only counted and
+# summarized in one line, so a dirty feed cannot flood the log; pass
+# max_logged=None to log every one with its "Row N skipped" line
+DEFAULT_MAX_LOGGED: Optional[int] = 10
+# Buffer size for the reject file, so rows are written in large blocks
+REJECT_BUFFER = 1 << 16
+REJECT_COLUMNS = ("row_number", "error_type", "error_fields")
+# Extra reject column naming the file of each row, see `with_source`
+SOURCE_COLUMN = "source_file"
+
+MISSING_FIELD = "missing_field"
+VALIDATION = "validation"
+TYPE = "type"
+DUPLICATE = "duplicate"
+UNEXPECTED = "unexpected"
+
+
+def classify_error(error: Exception) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Returns the error type and the fields it concerns for a row that failed
+    `build_product`, without formatting a message.
+
+    Validation errors name every failing field; type errors raised while
+    converting values do not say which field was bad, so they name none.
+    """
+    if isinstance(error, KeyError):
+        return MISSING_FIELD, (str(error.args[0]) if error.args else "",)
+    if isinstance(error, ValidationError):
+        fields = tuple(
+            str(detail["loc"][0]) if detail["loc"] else ""
+            for detail in error.errors(include_url=False)
+        )
+        return VALIDATION, fields
+    if isinstance(error, (ValueError, TypeError)):
+        return TYPE, ()
+    return UNEXPECTED, ()
+
+
+class IngestErrorCollector:
+    """
+    Collects the rows rejected while loading a CSV file.
+
+    Errors are counted by type and by field. Only the first `max_logged`
+    (by default DEFAULT_MAX_LOGGED) errors of each type are formatted and
+    logged with their "Row N skipped" warning; the rest are summarized in
+    one line per type by `close`, so dirty feeds neither flood the log nor
+    spend their load time logging. `max_logged=None` logs every error.
+    With `reject_file`, every rejected row is written to a CSV with the
+    source columns plus its row number, error type and fields, through a
+    large write buffer.
+
+    With `with_source`, one collector reports on several files: `source`
+    names the file being read, log messages and a `source_file` reject
+    column say which file each row came from, and the summary counts
+    rejections by file. Reject columns are fixed by the first rejected
+    row's header and filled by name for the other files.
+
+    Use it as a context manager, or call `close` when loading is done.
+    """
+
+    def __init__(
+        self,
+        reject_file: Optional[str] = None,
+        max_logged: Optional[int] = DEFAULT_MAX_LOGGED,
+        with_source: bool = False,
+    ):
+        self.reject_file = reject_file
+        self.max_logged = max_logged
+        self.with_source = with_source
+        self.source: Optional[str] = None
+        self.loaded = 0
+        self.by_type: Counter = Counter()
+        self.by_field: Counter = Counter()
+        self.by_file: Counter = Counter()
+        self._fieldnames: Optional[List[str]] = None
+        self._columns: Optional[List[str]] = None
+        self._file: Optional[IO[str]] = None
+        self._writer: Any = None
+
+    def __enter__(self) -> "IngestErrorCollector":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def rejected(self) -> int:
+        return sum(self.by_type.values())
+
+    def set_fieldnames(self, fieldnames: Sequence[str]) -> None:
+        """
+        Sets the source CSV header used for the reject file's columns.
+        """
+        self._fieldnames = list(fieldnames)
+
+    def reject(
+        self, idx: int, row: Union[dict, Sequence[str]], error: Exception
+    ) -> None:
+        """
+        Records that CSV row `idx` could not be built into a product.
+
+        Args:
+        - idx (int): Row number in the file, counting the header as row 1.
+        - row (dict or list): The raw row, as read by `csv.DictReader` or
+          `csv.reader` (positional rows follow the header).
+        - error (Exception): The error raised while building the row.
+        """
+        kind, fields = classify_error(error)
+        if self._count(kind, fields):
+            if not isinstance(row, dict):
+                row = dict(zip(self._fieldnames or (), row))
+            logging.error(row_error_message(row, error))
+            logging.warning(f"Row {self._location(idx)} skipped due to invalid data.")
+        self._write_reject(idx, row, kind, fields)
+
+    def reject_duplicate(self, idx: int, product: Product) -> None:
+        """
+        Records that row `idx` repeats a product_id already in the inventory.
+
+        The reject file gets the parsed product's values, since the raw row
+        is not kept once a product is built.
+        """
+        if self._count(DUPLICATE, ("product_id",)):
+            logging.error(
+                f"Duplicate product_id {product.product_id} in row "
+                f"{self._location(idx)}; keeping the first occurrence."
+            )
+            logging.warning(f"Row {self._location(idx)} skipped due to invalid data.")
+        self._write_reject(idx, product.model_dump(), DUPLICATE, ("product_id",))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns the counts of loaded and rejected rows.
+
+        Returns:
+        - dict: loaded, rejected, by_type and by_field counts, and the
+          reject file path (None when rejects were not written). With
+          `with_source`, also by_file counts.
+        """
+        summary = {
+            "loaded": self.loaded,
+            "rejected": self.rejected,
+            "by_type": dict(self.by_type),
+            "by_field": dict(self.by_field),
+            "reject_file": self.reject_file,
+        }
+        if self.with_source:
+            summary["by_file"] = dict(self.by_file)
+        return summary
+
+    def close(self) -> None:
+        """
+        Flushes the reject file and logs how many errors were not logged.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+        if self.max_logged is None:
+            return
+        for kind, count in self.by_type.items():
+            if count > self.max_logged:
+                logging.error(
+                    f"{count - self.max_logged} more '{kind}' row errors "
+                    f"were not logged ({count} in total)."
+                )
+
+    def _count(self, kind: str, fields: Tuple[str, ...]) -> bool:
+        """
+        Counts an error and returns whether it should be logged.
+        """
+        self.by_type[kind] += 1
+        if self.with_source:
+            self.by_file[self.source] += 1
+        for field in fields:
+            if field:
+                self.by_field[field] += 1
+        return self.max_logged is None or self.by_type[kind] <= self.max_logged
+
+    def _write_reject(
+        self,
+        idx: int,
+        row: Union[dict, Sequence[str]],
+        kind: str,
+        fields: Tuple[str, ...],
+    ) -> None:
+        if self.reject_file is None:
+            return
+        if self._writer is None:
+            if self._fieldnames is None and isinstance(row, dict):
+                self._fieldnames = [name for name in row if name is not None]
+            self._file = open(
+                self.reject_file, "w", newline="", buffering=REJECT_BUFFER
+            )
+            self._writer = csv.writer(self._file)
+            self._columns = list(self._fieldnames or ())
+            extra = (SOURCE_COLUMN,) if self.with_source else ()
+            self._writer.writerow([*self._columns, *REJECT_COLUMNS, *extra])
+        if not isinstance(row, dict) and self._fieldnames != self._columns:
+            row = dict(zip(self._fieldnames or (), row))
+        if isinstance(row, dict):
+            values = [row.get(name, "") for name in self._columns or ()]
+        else:
+            values = list(row)
+        values += [idx, kind, ";".join(fields)]
+        if self.with_source:
+            values.append(self.source)
+        self._writer.writerow(values)
+
+    def _location(self, idx: int) -> str:
+        """
+        Returns how a row is named in log messages.
+        """
+        return f"{idx} of '{self.source}'" if self.with_source else str(idx)
@@ -0,0 +1,411 @@
+import json
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .aggregates import build_summary
+from .ingest import build_product
+from .models import PRODUCT_CLASS_MAP, Product
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+# (row number, row with missing values dropped, or None, and the read error)
+FileRow = Tuple[int, Optional[dict], Optional[Exception]]
+
+ARROW_FILE_MAGIC = b"ARROW1"
+
+
+def _columns() -> Dict[str, Any]:
+    """
+    Returns every product field with its annotation, base fields first, in
+    the order of the CSV layout.
+    """
+    columns = {name: field.annotation for name, field in Product.model_fields.items()}
+    for product_class in PRODUCT_CLASS_MAP.values():
+        for name, field in product_class.model_fields.items():
+            columns.setdefault(name, field.annotation)
+    return columns
+
+
+COLUMNS = _columns()
+
+
+def require_pyarrow() -> None:
+    """
+    Raises ImportError when pyarrow, needed for Parquet and Arrow, is missing.
+    """
+    if pa is None:
+        raise ImportError(
+            "Parquet and Arrow support needs pyarrow: pip install pyarrow"
+        )
+
+
+# ----------------------------
+# JSON Lines
+# ----------------------------
+
+
+def iter_jsonl_rows(f: IO[str]) -> Iterator[FileRow]:
+    """
+    Yields (line number, row, error) for each non-blank line of a JSON Lines
+    file. Null values are dropped, like the empty cells of a CSV row, so the
+    row validates exactly as its CSV form would.
+    """
+    decode = json.JSONDecoder().decode
+    for idx, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = decode(line)
+            if not isinstance(row, dict):
+                raise TypeError(f"expected a JSON object, got {type(row).__name__}")
+        except (ValueError, TypeError) as e:
+            yield idx, {}, e
+            continue
+        yield idx, {k: v for k, v in row.items() if v is not None}, None
+
+
+def write_jsonl(path: str, products: Iterable[Product]) -> None:
+    """
+    Writes one JSON object per product, omitting unset optional values and
+    writing datetimes in ISO 8601.
+    """
+    encode = json.JSONEncoder(default=datetime.isoformat, ensure_ascii=False).encode
+    with open(path, "w") as f:
+        for product in products:
+            values = {k: v for k, v in product.__dict__.items() if v is not None}
+            f.write(f"{encode(values)}\n")
+
+
+# ----------------------------
+# Parquet and Arrow IPC
+# ----------------------------
+
+
+def read_parquet(path: str) -> "pa.Table":
+    """
+    Reads a Parquet file into an Arrow table through a memory map.
+    """
+    require_pyarrow()
+    return pq.read_table(path, memory_map=True)
+
+
+def read_arrow(path: str) -> "pa.Table":
+    """
+    Reads an Arrow IPC file (Feather v2) or stream without copying: the
+    table's buffers point into a memory map of the file.
+    """
+    require_pyarrow()
+    source = pa.memory_map(path)
+    if source.read(len(ARROW_FILE_MAGIC)) == ARROW_FILE_MAGIC:
+        source.seek(0)
+        return ipc.open_file(source).read_all()
+    source.seek(0)
+    return ipc.open_stream(source).read_all()
+
+
+def iter_table_rows(table: "pa.Table") -> Iterator[FileRow]:
+    """
+    Yields (row number, row, None) for each row of an Arrow table, one
+    record batch at a time, with null values dropped like in JSON Lines.
+    """
+    idx = 0
+    for batch in table.to_batches():
+        for row in batch.to_pylist():
+            idx += 1
+            yield idx, {k: v for k, v in row.items() if v is not None}, None
+
+
+def products_to_table(products: Iterable[Product]) -> "pa.Table":
+    """
+    Builds an Arrow table with one typed column per product field.
+
+    Datetime columns are naive, or UTC when every value is timezone-aware.
+
+    Raises:
+    - ValueError: If a datetime column mixes naive and aware values.
+    """
+    require_pyarrow()
+    values: Dict[str, list] = {name: [] for name in COLUMNS}
+    for product in products:
+        fields = product.__dict__
+        for name, column in values.items():
+            column.append(fields.get(name))
+    arrays = {name: _to_array(name, values[name]) for name in COLUMNS}
+    return pa.table(arrays)
+
+
+def write_parquet(path: str, products: Iterable[Product]) -> None:
+    """
+    Writes products to a Parquet file, see `products_to_table`.
+    """
+    pq.write_table(products_to_table(products), path)
+
+
+def write_arrow(path: str, products: Iterable[Product]) -> None:
+    """
+    Writes products to an Arrow IPC file, see `products_to_table`.
+    """
+    table = products_to_table(products)
+    with ipc.new_file(path, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _arrow_type(annotation: Any) -> "pa.DataType":
+    if annotation is int:
+        return pa.int64()
+    if annotation is float:
+        return pa.float64()
+    if annotation is datetime:
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def _to_array(name: str, values: list) -> "pa.Array":
+    arrow_type = _arrow_type(COLUMNS[name])
+    if pa.types.is_timestamp(arrow_type):
+        aware = {value.tzinfo is not None for value in values if value is not None}
+        if aware == {True, False}:
+            raise ValueError(f"Column '{name}' mixes naive and aware datetimes")
+        if aware == {True}:
+            arrow_type = pa.timestamp("us", tz="UTC")
+    return pa.array(values, arrow_type)
+
+
+# ----------------------------
+# Columnar queries
+# ----------------------------
+
+
+class ProductTable:
+    """
+    Columnar view of the valid products in an Arrow table.
+
+    Rows are checked with vectorized Arrow compute using the same rules as
+    `build_product` and the product models (field bounds, required fields
+    per category, expiry after manufacture), and only the first row of a
+    repeated product_id is kept, as `Inventory.load_from_csv` does. Totals,
+    summaries and low-stock filters then run over whole columns without
+    creating a product object per row; when every row is valid the table is
+    used as is, so columns still point into the file's memory map.
+
+    Columns must hold typed values or strings Arrow can cast, like the files
+    `Inventory.save_parquet` and `save_arrow` write; use the `load_from_*`
+    methods for files needing per-row conversion.
+    """
+
+    def __init__(self, table: "pa.Table"):
+        require_pyarrow()
+        table = _normalize(table)
+        keep = _first_valid_rows(table)
+        self.rejected = table.num_rows - pc.sum(keep).as_py() if len(keep) else 0
+        self.table = table if self.rejected == 0 else table.filter(keep)
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def column(self, name: str) -> "pa.ChunkedArray":
+        """
+        Returns a column of the valid rows, e.g. "quantity" or "price".
+        """
+        return self.table[name]
+
+    def product_ids(self) -> List[int]:
+        return self.table["product_id"].to_pylist()
+
+    def total_value(self) -> float:
+        """
+        Returns the sum of quantity * price over every valid row, expired
+        food included, like `Inventory.get_total_inventory`.
+        """
+        return _sum(_values(self.table))
+
+    def summary(self, now: Optional[datetime] = None) -> dict:
+        """
+        Returns the `Inventory.get_summary` dictionary for the valid rows,
+        leaving out food that expired before `now` (default: the current
+        time).
+        """
+        current = self.table.filter(_not_expired(self.table, now))
+        if current.num_rows == 0:
+            return build_summary(0, 0, "N/A", 0.0, 0.0)
+        values = _values(current)
+        best = pc.index(values, pc.max(values)).as_py()
+        return build_summary(
+            current.num_rows,
+            _sum(current["quantity"]),
+            current["product_name"][best].as_py(),
+            values[best].as_py(),
+            _sum(values),
+        )
+
+    def low_stock(
+        self,
+        threshold: int = 10,
+        category_thresholds: Optional[Dict[str, int]] = None,
+        now: Optional[datetime] = None,
+    ) -> "ProductTable":
+        """
+        Returns the non-expired rows below their category's threshold,
+        ordered by quantity, like `Inventory.low_stock`.
+        """
+        table = self.table
+        limit = pa.scalar(threshold, pa.int64())
+        if category_thresholds:
+            keys = _category_keys(table)
+            limit = pc.cast(
+                pc.fill_null(
+                    pc.take(
+                        pa.array(list(category_thresholds.values()), pa.int64()),
+                        pc.index_in(keys, pa.array(list(category_thresholds))),
+                    ),
+                    threshold,
+                ),
+                pa.int64(),
+            )
+        low = pc.and_(pc.less(table["quantity"], limit), _not_expired(table, now))
+        rows = table.filter(low)
+        return ProductTable(rows.sort_by([("quantity", "ascending")]))
+
+    def to_products(self) -> List[Product]:
+        """
+        Builds product models for the valid rows.
+        """
+        return [build_product(row) for _, row, _ in iter_table_rows(self.table)]
+
+
+def scan_parquet(path: str) -> ProductTable:
+    """
+    Reads a Parquet file as a `ProductTable`.
+    """
+    return ProductTable(read_parquet(path))
+
+
+def scan_arrow(path: str) -> ProductTable:
+    """
+    Reads an Arrow IPC file or stream as a memory-mapped `ProductTable`.
+    """
+    return ProductTable(read_arrow(path))
+
+
+def _normalize(table: "pa.Table") -> "pa.Table":
+    """
+    Casts known columns to their field types and adds missing ones as nulls.
+    """
+    columns, names = [], []
+    for name, annotation in COLUMNS.items():
+        arrow_type = _arrow_type(annotation)
+        if name not in table.column_names:
+            column = pa.nulls(table.num_rows, arrow_type)
+        else:
+            column = table[name]
+            keep_timestamp = pa.types.is_timestamp(arrow_type) and (
+                pa.types.is_timestamp(column.type)
+            )
+            if column.type != arrow_type and not keep_timestamp:
+                column = pc.cast(column, arrow_type)
+        columns.append(column)
+        names.append(name)
+    return pa.table(columns, names=names)
+
+
+def _category_keys(table: "pa.Table") -> "pa.ChunkedArray":
+    return pc.fill_null(pc.utf8_lower(pc.utf8_trim_whitespace(table["category"])), "")
+
+
+def _all(*conditions: Any) -> Any:
+    result = conditions[0]
+    for condition in conditions[1:]:
+        result = pc.and_(result, condition)
+    return pc.fill_null(result, False)
+
+
+# Field constraints checked by the columnar path, with the Arrow comparison
+# each one stands for
+BOUNDS = {
+    "gt": "greater",
+    "ge": "greater_equal",
+    "lt": "less",
+    "le": "less_equal",
+    "min_length": "greater_equal",
+    "max_length": "less_equal",
+}
+
+
+def _model_rule(table: "pa.Table", product_class: type) -> Any:
+    """
+    Returns the mask of rows holding every required field of a model
+    class within its Field bounds.
+    """
+    conditions = []
+    for name, field in product_class.model_fields.items():
+        if not field.is_required():
+            continue
+        column = table[name]
+        conditions.append(pc.is_valid(column))
+        for constraint in field.metadata:
+            for bound, function in BOUNDS.items():
+                limit = getattr(constraint, bound, None)
+                if limit is None:
+                    continue
+                compare = getattr(pc, function)
+                if bound.endswith("length"):
+                    conditions.append(compare(pc.utf8_length(column), limit))
+                else:
+                    conditions.append(compare(column, limit))
+    return _all(*conditions)
+
+
+# Model validators, written as column expressions
+VALIDATOR_RULES = {
+    # FoodProduct.check_expiry_after_mfg
+    "food": lambda table: pc.greater(table["expiry_date"], table["mfg_date"]),
+}
+
+
+def _first_valid_rows(table: "pa.Table") -> Any:
+    """
+    Returns the mask of rows that pass validation and hold the first valid
+    occurrence of their product_id.
+    """
+    keys = _category_keys(table)
+    valid = _model_rule(table, Product)
+    for category, product_class in PRODUCT_CLASS_MAP.items():
+        rule = _model_rule(table, product_class)
+        if category in VALIDATOR_RULES:
+            rule = _all(rule, VALIDATOR_RULES[category](table))
+        valid = pc.and_(valid, pc.or_(pc.not_equal(keys, category), rule))
+
+    ids = pc.filter(table["product_id"], valid)
+    if pc.count_distinct(ids).as_py() == len(ids):
+        return valid
+    positions = pa.array(range(len(table)))
+    rows = pa.table({"id": table["product_id"], "row": positions}).filter(valid)
+    first = rows.group_by("id", use_threads=False).aggregate([("row", "min")])
+    return pc.is_in(positions, value_set=first["row_min"])
+
+
+def _values(table: "pa.Table") -> Any:
+    return pc.multiply(pc.cast(table["quantity"], pa.float64()), table["price"])
+
+
+def _sum(column: Any) -> Any:
+    total = pc.sum(column).as_py()
+    return total if total is not None else 0
+
+
+def _not_expired(table: "pa.Table", now: Optional[datetime]) -> Any:
+    expiry = table["expiry_date"]
+    now = now or datetime.now()
+    if expiry.type.tz is not None:
+        now = now.astimezone(timezone.utc)
+    elif now.tzinfo is not None:
+        now = now.replace(tzinfo=None)
+    is_food = pc.equal(_category_keys(table), "food")
+    expired = pc.and_(is_food, pc.less(expiry, pa.scalar(now, expiry.type)))
+    return pc.invert(pc.fill_null(expired, False))
@@ -0,0 +1,421 @@
+import bisect
+import heapq
+import itertools
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .models import FoodProduct, Product, category_key
+
+BY_ID = attrgetter("product_id")
+BY_PRICE = attrgetter("price", "product_id")
+
+
+class ProductIndex:
+    """
+    Hash index from product_id to product, kept in sync by `ProductList`.
+
+    The first product added with a given id is the indexed one. Products that
+    share an id with it (possible only through direct list mutation) are
+    remembered so the next one is promoted if the indexed product is removed.
+    """
+
+    fields = frozenset({"product_id"})
+
+    def __init__(self):
+        self._by_id: Dict[int, Product] = {}
+        self._shadowed: Dict[int, List[Product]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._by_id
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._by_id)
+
+    def get(self, product_id: int) -> Optional[Product]:
+        """
+        Returns the product with the given id, or None.
+        """
+        return self._by_id.get(product_id)
+
+    def add(self, product: Product) -> None:
+        indexed = self._by_id.setdefault(product.product_id, product)
+        if indexed is not product:
+            self._shadowed.setdefault(product.product_id, []).append(product)
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        by_id = self._by_id
+        for product in products:
+            if by_id.setdefault(product.product_id, product) is not product:
+                self._shadowed.setdefault(product.product_id, []).append(product)
+
+    def discard(self, product: Product) -> None:
+        product_id = product.product_id
+        shadowed = self._shadowed.get(product_id)
+        if self._by_id.get(product_id) is product:
+            if shadowed:
+                self._by_id[product_id] = shadowed.pop(0)
+            else:
+                del self._by_id[product_id]
+        elif shadowed:
+            for i, other in enumerate(shadowed):
+                if other is product:
+                    del shadowed[i]
+                    break
+        if shadowed == []:
+            del self._shadowed[product_id]
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._shadowed.clear()
+
+
+def _few(batch: List[Any], existing: List[Any]) -> bool:
+    """
+    Whether inserting a batch item by item, at about log(n) each, beats
+    rebuilding the n existing items and the batch in one pass.
+    """
+    return len(batch) * len(existing).bit_length() < len(existing)
+
+
+class _SortedBuckets:
+    """
+    Products of one category grouped by the value of one field, with the
+    distinct values kept sorted.
+    """
+
+    __slots__ = ("field", "values", "buckets")
+
+    def __init__(self, field: str):
+        self.field = field
+        self.values: List[Any] = []
+        self.buckets: Dict[Any, Dict[int, Product]] = {}
+
+    def add(self, product: Product) -> None:
+        value = getattr(product, self.field)
+        bucket = self.buckets.get(value)
+        if bucket is None:
+            bucket = self.buckets[value] = {}
+            bisect.insort(self.values, value)
+        bucket[id(product)] = product
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        """
+        Adds products, inserting the values that are new one at a time when
+        they are few next to the existing ones and sorting once otherwise.
+        """
+        buckets, get_value = self.buckets, attrgetter(self.field)
+        new_values = []
+        for product in products:
+            value = get_value(product)
+            bucket = buckets.get(value)
+            if bucket is None:
+                bucket = buckets[value] = {}
+                new_values.append(value)
+            bucket[id(product)] = product
+        if _few(new_values, self.values):
+            for value in new_values:
+                bisect.insort(self.values, value)
+        elif new_values:
+            self.values += new_values
+            self.values.sort()
+
+    def discard(self, product: Product) -> None:
+        value = getattr(product, self.field)
+        bucket = self.buckets.get(value)
+        if bucket is None or bucket.pop(id(product), None) is None:
+            return
+        if not bucket:
+            del self.buckets[value]
+            del self.values[bisect.bisect_left(self.values, value)]
+
+    def below(self, threshold: Any) -> Iterator[Product]:
+        end = bisect.bisect_left(self.values, threshold)
+        for value in self.values[:end]:
+            yield from list(self.buckets[value].values())
+
+    def between(
+        self, low: Optional[Any], high: Optional[Any], reverse: bool = False
+    ) -> Iterator[Product]:
+        """
+        Yields products with low <= value <= high (open where a bound is
+        None), ordered by value and then product_id.
+        """
+        start = 0 if low is None else bisect.bisect_left(self.values, low)
+        end = (
+            len(self.values) if high is None else bisect.bisect_right(self.values, high)
+        )
+        values = self.values[start:end]
+        if reverse:
+            values.reverse()
+        for value in values:
+            bucket = self.buckets.get(value)
+            if bucket:
+                yield from sorted(bucket.values(), key=BY_ID, reverse=reverse)
+
+
+class _CategoryBuckets:
+    """
+    Base for indexes keeping each category's products sorted by one field,
+    kept in sync by `ProductList`.
+    """
+
+    field = ""
+
+    def __init__(self):
+        self._categories: Dict[str, _SortedBuckets] = {}
+
+    def add(self, product: Product) -> None:
+        key = category_key(product)
+        buckets = self._categories.get(key)
+        if buckets is None:
+            buckets = self._categories[key] = _SortedBuckets(self.field)
+        buckets.add(product)
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        # Grouped by the category as written, then normalized once per group
+        by_category: Dict[Optional[str], List[Product]] = {}
+        for product in products:
+            group = by_category.get(product.category)
+            if group is None:
+                group = by_category[product.category] = []
+            group.append(product)
+        for group in by_category.values():
+            key = category_key(group[0])
+            buckets = self._categories.get(key)
+            if buckets is None:
+                buckets = self._categories[key] = _SortedBuckets(self.field)
+            buckets.add_many(group)
+
+    def discard(self, product: Product) -> None:
+        key = category_key(product)
+        buckets = self._categories.get(key)
+        if buckets is not None:
+            buckets.discard(product)
+            if not buckets.buckets:
+                del self._categories[key]
+
+    def clear(self) -> None:
+        self._categories.clear()
+
+
+class QuantityIndex(_CategoryBuckets):
+    """
+    Quantity-ordered index for low-stock queries, kept in sync by `ProductList`.
+
+    Products are bucketed by quantity within each category, so finding the k
+    products below a threshold costs O(log n + k) instead of a full scan and
+    every category can use its own threshold.
+    """
+
+    field = "quantity"
+    # expiry_date too, since sweeping removes expired products from the index
+    fields = frozenset({"quantity", "category", "expiry_date"})
+
+    def below(
+        self,
+        threshold: int,
+        category_thresholds: Optional[Dict[str, int]] = None,
+    ) -> Iterator[Product]:
+        """
+        Yields products whose quantity is below the threshold of their
+        category, lowest quantity first.
+
+        Args:
+        - threshold (int): Threshold for categories not in `category_thresholds`.
+        - category_thresholds (dict, optional): Thresholds by category name,
+          compared case-insensitively.
+        """
+        limits = {
+            name.lower().strip(): limit
+            for name, limit in (category_thresholds or {}).items()
+        }
+        runs = [
+            buckets.below(limits.get(name, threshold))
+            for name, buckets in self._categories.items()
+        ]
+        return heapq.merge(*runs, key=attrgetter("quantity"))
+
+
+class PriceIndex(_CategoryBuckets):
+    """
+    Price-ordered index per category for `Inventory.query`, kept in sync by
+    `ProductList`.
+
+    Serves category filters, price ranges and price ordering: a category's
+    products in a price range come out in price order in O(log n + k), and
+    a query stops reading them once its page is full.
+    """
+
+    field = "price"
+    fields = frozenset({"price", "category"})
+
+    def between(
+        self,
+        low: Optional[float] = None,
+        high: Optional[float] = None,
+        category: Optional[str] = None,
+        reverse: bool = False,
+    ) -> Iterator[Product]:
+        """
+        Yields products priced between `low` and `high` inclusive, ordered
+        by price and then product_id (both descending with `reverse`).
+
+        Args:
+        - low, high (float, optional): Price bounds; None leaves a side open.
+        - category (str, optional): Only this category, compared
+          case-insensitively; "" selects products without a category.
+        - reverse (bool): Highest price first.
+        """
+        if category is not None:
+            buckets = self._categories.get(category.lower().strip())
+            return iter(()) if buckets is None else buckets.between(low, high, reverse)
+        runs = [
+            buckets.between(low, high, reverse) for buckets in self._categories.values()
+        ]
+        return heapq.merge(*runs, key=BY_PRICE, reverse=reverse)
+
+
+class ExpiryIndex:
+    """
+    Expiry-ordered index of food products, kept in sync by `ProductList`.
+
+    Food items wait in a heap ordered by expiry date until `sweep` moves
+    those whose expiry has passed into the expired partition. A sweep costs
+    O(log n) per newly expired item and O(1) when nothing has expired, so
+    callers can sweep before every expiry-aware query.
+    """
+
+    # Every field read by the listeners that drop expired products: an
+    # assignment re-adds the product to them, and the entry it gets here
+    # lets the next sweep drop it again
+    fields = frozenset({"quantity", "price", "category", "expiry_date"})
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, FoodProduct]] = []
+        self._seq = itertools.count()
+        self._live: Dict[int, FoodProduct] = {}
+        self._expired: Dict[int, FoodProduct] = {}
+
+    def add(self, product: Product) -> None:
+        if isinstance(product, FoodProduct):
+            self._live[id(product)] = product
+            entry = (product.expiry_date, next(self._seq), product)
+            heapq.heappush(self._heap, entry)
+            if len(self._heap) > 2 * len(self._live) + 64:
+                self._compact()
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        """
+        Adds products, pushing them one at a time when they are few next to
+        the heap and restoring the heap order once otherwise.
+        """
+        live, heap, seq = self._live, self._heap, self._seq
+        entries = []
+        for product in products:
+            if isinstance(product, FoodProduct):
+                live[id(product)] = product
+                entries.append((product.expiry_date, next(seq), product))
+        if _few(entries, heap):
+            for entry in entries:
+                heapq.heappush(heap, entry)
+        elif entries:
+            heap += entries
+            heapq.heapify(heap)
+        if len(heap) > 2 * len(live) + 64:
+            self._compact()
+
+    def discard(self, product: Product) -> None:
+        if self._live.pop(id(product), None) is not None:
+            self._expired.pop(id(product), None)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._live.clear()
+        self._expired.clear()
+
+    def is_expired(self, product: Product) -> bool:
+        """
+        Returns True if the product was moved to the expired partition.
+        """
+        return id(product) in self._expired
+
+    def expired(self) -> List[FoodProduct]:
+        """
+        Returns the products in the expired partition.
+        """
+        return list(self._expired.values())
+
+    def next_expiry(self) -> Optional[datetime]:
+        """
+        Returns when the next sweep will find something to expire, or None.
+        It does not change the index; stale entries at the head of the heap
+        are skipped by scanning until `prune` pops them.
+        """
+        heap = self._heap
+        if not heap or self._is_current(heap[0]):
+            return heap[0][0] if heap else None
+        return min(
+            (entry[0] for entry in heap if self._is_current(entry)), default=None
+        )
+
+    def stale(self) -> bool:
+        """
+        Returns True if the head of the heap is stale, so `prune` has work.
+        """
+        heap = self._heap
+        return bool(heap) and not self._is_current(heap[0])
+
+    def prune(self) -> None:
+        """
+        Pops stale entries off the head of the heap.
+        """
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def due(self, now: datetime) -> bool:
+        """
+        Returns True if `sweep(now)` may find something to expire. It does not
+        change the index, so it is safe alongside concurrent reads.
+        """
+        heap = self._heap
+        try:
+            return heap[0][0] < now
+        except IndexError:
+            return False
+
+    def sweep(self, now: datetime) -> List[FoodProduct]:
+        """
+        Moves food products that expired before `now` to the expired partition.
+
+        Returns:
+        - List[FoodProduct]: The newly expired products, soonest expiry first.
+        """
+        newly_expired = []
+        while self._heap and self._heap[0][0] < now:
+            entry = heapq.heappop(self._heap)
+            product = entry[2]
+            if self._is_current(entry) and id(product) not in self._expired:
+                self._expired[id(product)] = product
+                newly_expired.append(product)
+        return newly_expired
+
+    def _is_current(self, entry: Tuple[datetime, int, FoodProduct]) -> bool:
+        # Entries of removed products, or written before the expiry date was
+        # changed, are skipped lazily instead of being searched for
+        expiry, _, product = entry
+        return self._live.get(id(product)) is product and product.expiry_date == expiry
+
+    def _compact(self) -> None:
+        """
+        Keeps one current entry per live product once stale ones pile up.
+        """
+        current = {}
+        for entry in self._heap:
+            if self._is_current(entry):
+                current.setdefault(id(entry[2]), entry)
+        self._heap = list(current.values())
+        heapq.heapify(self._heap)
@@ -0,0 +1,350 @@
+import csv
+import io
+import os
+from datetime import datetime
+from types import UnionType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import ValidationError
+
+from .models import PRODUCT_CLASS_MAP, Product, parse_datetime
+
+BASE_FIELDS = (
+    "product_id",
+    "product_name",
+    "category",
+    "quantity",
+    "price",
+)
+
+
+def build_product(row: dict) -> Product:
+    """
+    Builds the Product subclass matching the row's category.
+
+    Raises the underlying KeyError/ValueError/ValidationError on bad data;
+    `Inventory.create_product_from_row` wraps this with error logging.
+    """
+    category_raw = row.get("category", "")
+    category = category_raw.lower().strip() if category_raw else ""
+
+    product_class = PRODUCT_CLASS_MAP.get(category, Product)
+
+    base_data = {
+        "product_id": int(row["product_id"]),
+        "product_name": row["product_name"],
+        "category": category_raw if category_raw else None,
+        "quantity": int(row["quantity"]),
+        "price": float(row["price"]),
+    }
+
+    extra_data = {k: v for k, v in row.items() if k not in BASE_FIELDS and v != ""}
+    return product_class(**base_data, **extra_data)
+
+
+def row_error_message(row: dict, error: Exception) -> str:
+    """
+    Returns the log message for a row that failed `build_product`.
+    """
+    if isinstance(error, KeyError):
+        return f"Missing required field {error} in row: {row}"
+    if isinstance(error, ValidationError):
+        return f"Validation error in row: {row} - {error}"
+    if isinstance(error, (ValueError, TypeError)):
+        return f"Type error in row: {row} - Error: {error}"
+    return f"Unexpected error processing row: {row} - {error}"
+
+
+# ----------------------------
+# Parallel CSV ingestion
+# ----------------------------
+
+ChunkResult = Tuple[
+    List[Product], List[Tuple[int, Union[dict, List[str]], Exception]], int
+]
+
+
+def csv_byte_ranges(
+    csv_file: str, chunks: int
+) -> Tuple[Optional[List[str]], List[Tuple[int, int]]]:
+    """
+    Splits the data section of a CSV file into byte ranges aligned to lines.
+
+    Args:
+    - csv_file (str): Path to the CSV file.
+    - chunks (int): Desired number of ranges; fewer are returned for small files.
+
+    Returns:
+    - (header fieldnames or None for an empty file, list of (start, end) offsets)
+
+    Ranges are cut at newlines, so one may end inside a quoted field that
+    holds a line break; `parse_csv_chunk` detects such ranges.
+    """
+    size = os.path.getsize(csv_file)
+    with open(csv_file, "rb") as f:
+        header = f.readline()
+        if not header:
+            return None, []
+        fieldnames = next(csv.reader([header.decode()]))
+        data_start = f.tell()
+
+        boundaries = [data_start]
+        step = max((size - data_start) // max(chunks, 1), 1)
+        for target in range(data_start + step, size, step):
+            if target <= boundaries[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()
+            position = f.tell()
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+        boundaries.append(size)
+
+    ranges = [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start
+    ]
+    return fieldnames, ranges
+
+
+def parse_csv_chunk(
+    csv_file: str,
+    fieldnames: Sequence[str],
+    start: int,
+    end: int,
+    trusted: bool = False,
+    strict: bool = True,
+) -> Optional[ChunkResult]:
+    """
+    Validates the rows stored between two byte offsets of a CSV file.
+
+    Runs inside worker processes, so nothing is logged here; errors are
+    returned for the parent to record in file order.
+
+    With `strict`, the rows are read in the csv module's strict mode, which
+    fails when the chunk ends inside a quoted field, as it does when a
+    quoted line break straddles the chunk's end. Well-formed rows read the
+    same either way.
+
+    Returns:
+    - (valid products, [(row offset within chunk, raw row, error)], rows
+      read), or None if `strict` reading failed and the chunk must be read
+      together with the rest of the file
+    """
+    with open(csv_file, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    products: List[Product] = []
+    errors: List[Tuple[int, Union[dict, List[str]], Exception]] = []
+    text = io.TextIOWrapper(io.BytesIO(data), newline="")
+    if trusted:
+        results = iter_trusted_rows(csv.reader(text, strict=strict), fieldnames)
+    else:
+        reader = csv.DictReader(text, fieldnames, strict=strict)
+        results = (_build_or_error(row) for row in reader)
+    rows = 0
+    try:
+        for offset, (row, product, error) in enumerate(results):
+            rows += 1
+            if product is not None:
+                products.append(product)
+            else:
+                errors.append((offset, row, error))
+    except csv.Error:
+        return None
+    return products, errors, rows
+
+
+def _build_or_error(row: dict) -> Tuple[dict, Optional[Product], Optional[Exception]]:
+    try:
+        return row, build_product(row), None
+    except Exception as e:
+        return row, None, e
+
+
+# ----------------------------
+# Trusted-source construction
+# ----------------------------
+
+
+def _coercer_for(annotation: Any) -> Callable[[Any], Any]:
+    """
+    Returns a cheap converter from CSV text to the given field annotation.
+    Optional[X] fields use the converter for X.
+    """
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+    if get_origin(annotation) in (Union, UnionType) and len(args) == 1:
+        annotation = args[0]
+    if annotation is datetime:
+        return lambda v: v if isinstance(v, datetime) else parse_datetime(v)
+    if annotation in (int, float, str):
+        return annotation
+    return lambda v: v
+
+
+class TrustedBuilder:
+    """
+    Precompiled constructor for one product class that skips validation.
+
+    A constructor function is generated once from the model fields, with one
+    cached converter per field. It reads either dict rows or, when `columns`
+    is given, positional CSV rows laid out in that header order. Instances
+    are filled the same way `model_construct` does, so neither field
+    constraints nor model validators such as `check_expiry_after_mfg` run.
+    Only use it for data that was already validated upstream.
+    """
+
+    def __init__(
+        self, product_class: Type[Product], columns: Optional[Sequence[str]] = None
+    ):
+        self.product_class = product_class
+        self.columns = tuple(columns) if columns is not None else None
+        self.build: Callable[[Any], Product] = self._compile()
+
+    def __call__(self, row: Any) -> Product:
+        return self.build(row)
+
+    def _source(self, name: str, required: bool) -> Optional[str]:
+        """
+        Returns the expression reading field `name` from a row, or None when
+        a positional header has no such column.
+        """
+        if self.columns is None:
+            return f"row[{name!r}]" if required else f"row.get({name!r})"
+        if name not in self.columns:
+            return None
+        return f"row[{self.columns.index(name)}]"
+
+    def _compile(self) -> Callable[[Any], Product]:
+        product_class = self.product_class
+        namespace: Dict[str, Any] = {
+            "cls": product_class,
+            "setattr": object.__setattr__,
+        }
+        lines = ["def build(row):"]
+        entries, required, optional = [], [], []
+        for name, field in product_class.model_fields.items():
+            namespace[f"coerce_{name}"] = _coercer_for(field.annotation)
+            source = self._source(name, field.is_required())
+            if field.is_required():
+                if source is None:
+                    lines.append(f"    raise KeyError({name!r})")
+                    continue
+                required.append(name)
+                entries.append((name, f"coerce_{name}({source})"))
+                continue
+
+            if field.default_factory is not None:
+                namespace[f"default_{name}"] = field.default_factory
+                default = f"default_{name}()"
+            else:
+                namespace[f"default_{name}"] = field.default
+                default = f"default_{name}"
+            if source is None:
+                entries.append((name, default))
+                continue
+            optional.append(name)
+            lines.append(f"    value_{name} = {source}")
+            lines.append(f"    given_{name} = value_{name} not in (None, '')")
+            entries.append(
+                (name, f"coerce_{name}(value_{name}) if given_{name} else {default}")
+            )
+
+        lines.append("    data = {")
+        lines += [f"        {name!r}: {expr}," for name, expr in entries]
+        lines.append("    }")
+        # build_product passes every base field explicitly, so they count as set
+        always_set = required + [n for n in BASE_FIELDS if n not in required]
+        lines.append(f"    fields_set = set({tuple(always_set)!r})")
+        for name in optional:
+            if name in always_set:
+                continue
+            lines.append(f"    if given_{name}:")
+            lines.append(f"        fields_set.add({name!r})")
+        lines += [
+            "    obj = cls.__new__(cls)",
+            "    setattr(obj, '__dict__', data)",
+            "    setattr(obj, '__pydantic_fields_set__', fields_set)",
+            "    setattr(obj, '__pydantic_extra__', None)",
+            "    setattr(obj, '__pydantic_private__', None)",
+            # Empty rather than unset, so watching it raises no AttributeError
+            "    setattr(obj, '_watchers', ())",
+        ]
+        if product_class.__pydantic_post_init__:
+            lines.append("    obj.model_post_init(None)")
+        lines.append("    return obj")
+
+        exec("\n".join(lines), namespace)
+        return namespace["build"]
+
+
+_TRUSTED_BUILDERS: Dict[Tuple[Type[Product], Optional[tuple]], TrustedBuilder] = {}
+
+
+def trusted_builder(
+    product_class: Type[Product], columns: Optional[Sequence[str]] = None
+) -> TrustedBuilder:
+    """
+    Returns the cached `TrustedBuilder` for a product class and row layout.
+    """
+    key = (product_class, tuple(columns) if columns is not None else None)
+    builder = _TRUSTED_BUILDERS.get(key)
+    if builder is None:
+        builder = _TRUSTED_BUILDERS[key] = TrustedBuilder(product_class, columns)
+    return builder
+
+
+def build_trusted_product(row: dict) -> Product:
+    """
+    Builds the same Product subclass as `build_product` without validation.
+
+    Missing required columns still raise KeyError and unparsable numbers or
+    dates still raise ValueError, so corrupt rows are reported, not loaded.
+    """
+    category_raw = row.get("category", "")
+    category = category_raw.lower().strip() if category_raw else ""
+    return trusted_builder(PRODUCT_CLASS_MAP.get(category, Product))(row)
+
+
+def iter_trusted_rows(
+    values: Iterable[List[str]], fieldnames: Sequence[str]
+) -> Iterator[Tuple[List[str], Optional[Product], Optional[Exception]]]:
+    """
+    Builds products from positional CSV rows (as read by `csv.reader`) with
+    builders compiled for the given header, avoiding per-row dict creation.
+
+    Blank lines are skipped like `csv.DictReader` does. Yields one
+    (row, product, None) or (row, None, error) triple per data row.
+    """
+    width = len(fieldnames)
+    category_at = list(fieldnames).index("category") if "category" in fieldnames else -1
+    builders = {
+        product_class: trusted_builder(product_class, fieldnames).build
+        for product_class in {Product, *PRODUCT_CLASS_MAP.values()}
+    }
+    for row in values:
+        if not row:
+            continue
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        category_raw = row[category_at] if category_at >= 0 else ""
+        category = category_raw.lower().strip() if category_raw else ""
+        try:
+            product_class = PRODUCT_CLASS_MAP.get(category, Product)
+            yield row, builders[product_class](row), None
+        except Exception as e:
+            yield row, None, e
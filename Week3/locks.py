@@ -0,0 +1,141 @@
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+Method = TypeVar("Method", bound=Callable[..., Any])
+
+
+class RWLock:
+    """
+    Reader/writer lock: any number of readers, or one writer.
+
+    Waiting writers go before newly arriving readers, so a steady stream of
+    reads cannot starve writes. Locks are re-entrant per thread: a reader
+    may read again, and the writer may write or read again. A thread that
+    only reads cannot start writing (upgrading could deadlock two readers)
+    and gets RuntimeError instead.
+    """
+
+    def __init__(self):
+        # Entered directly: Condition's own __enter__ is slower Python code
+        self._mutex = threading.Lock()
+        self._cond = threading.Condition(self._mutex)
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writes = 0
+        self._waiting_writers = 0
+        # Per thread: read depth, and whether it counts in `_readers`
+        self._local = threading.local()
+
+    def acquire_read(self) -> None:
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth:
+            local.depth = depth + 1
+            return
+        if self._writer == threading.get_ident():
+            local.depth, local.counted = 1, False
+            return
+        with self._mutex:
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        local.depth, local.counted = 1, True
+
+    def release_read(self) -> None:
+        local = self._local
+        local.depth -= 1
+        if local.depth or not local.counted:
+            return
+        with self._mutex:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        with self._mutex:
+            if self._writer == me:
+                self._writes += 1
+                return
+            if getattr(self._local, "depth", 0):
+                raise RuntimeError("A read lock cannot be upgraded to a write lock")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer, self._writes = me, 1
+
+    def release_write(self) -> None:
+        with self._mutex:
+            self._writes -= 1
+            if not self._writes:
+                self._writer = None
+                self._cond.notify_all()
+
+    def read_only(self) -> bool:
+        """
+        Returns True if the calling thread holds the lock for reading only.
+        """
+        return bool(getattr(self._local, "depth", 0)) and (
+            self._writer != threading.get_ident()
+        )
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        """
+        Holds the lock for reading inside a `with` block.
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """
+        Holds the lock for writing inside a `with` block.
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def reads(method: Method) -> Method:
+    """
+    Runs a method while holding its instance's `lock` for reading.
+    """
+
+    @wraps(method)
+    def locked(self, *args: Any, **kwargs: Any) -> Any:
+        lock = self.lock
+        lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_read()
+
+    return locked  # type: ignore[return-value]
+
+
+def writes(method: Method) -> Method:
+    """
+    Runs a method while holding its instance's `lock` for writing.
+    """
+
+    @wraps(method)
+    def locked(self, *args: Any, **kwargs: Any) -> Any:
+        lock = self.lock
+        lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_write()
+
+    return locked  # type: ignore[return-value]
@@ -1,12 +1,68 @@
+import calendar
+import weakref
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Annotated, Any, ClassVar, FrozenSet, Optional, Tuple
 
-from dateutil.relativedelta import relativedelta
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, BeforeValidator, Field, TypeAdapter, model_validator
 
 # Registry
 PRODUCT_CLASS_MAP = {}
 
+# Distinct values kept by the date parsing and warranty caches. Feeds repeat
+# a few thousand dates, so hits stay high while memory stays bounded.
+DATE_CACHE_SIZE = 8192
+
+_DATETIME = TypeAdapter(datetime)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_datetime(value: str) -> datetime:
+    """
+    Parses date or datetime text exactly as datetime fields do, caching
+    repeated values. Invalid text raises ValueError (a ValidationError).
+    """
+    return _DATETIME.validate_python(value)
+
+
+def _parse_cached(value: Any) -> Any:
+    """
+    Parses strings through `parse_datetime`. Anything else, including text
+    it rejects, is left for the field's own validation and error message.
+    """
+    if isinstance(value, str):
+        try:
+            return parse_datetime(value)
+        except ValueError:
+            pass
+    return value
+
+
+# A datetime field whose text values go through the shared parse cache
+CachedDatetime = Annotated[datetime, BeforeValidator(_parse_cached)]
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def warranty_end_date(purchase_date: datetime, warranty_period: int) -> datetime:
+    """
+    Returns the date `warranty_period` months after `purchase_date`, like
+    adding `relativedelta(months=warranty_period)`: the day is clamped to the
+    end of shorter months. Repeated pairs are served from a cache.
+    """
+    months = purchase_date.month - 1 + warranty_period
+    year, month = purchase_date.year + months // 12, months % 12 + 1
+    day = min(purchase_date.day, calendar.monthrange(year, month)[1])
+    return purchase_date.replace(year=year, month=month, day=day)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def posix_timestamp(moment: datetime) -> float:
+    """
+    Returns `moment.timestamp()`, caching the local-time conversion naive
+    datetimes need.
+    """
+    return moment.timestamp()
+
 
 def register_product_type(category: str):
     """
@@ -27,6 +83,50 @@ def register_product_type(category: str):
     return decorator
 
 
+def category_key(product: "Product") -> str:
+    """
+    Returns the product's category normalized for case-insensitive grouping.
+    Products without a category are grouped under "".
+    """
+    return (product.category or "").lower().strip()
+
+
+def _watchers_of(product: "Product") -> Tuple[weakref.ref, ...]:
+    # object.__getattribute__ avoids pydantic's slow __getattr__ fallback
+    try:
+        refs = object.__getattribute__(product, "_watchers")
+    except AttributeError:
+        return ()
+    return refs if isinstance(refs, tuple) else (refs,)
+
+
+def watch_product(product: "Product", ref: weakref.ref) -> None:
+    """
+    Registers a weakly referenced watcher whose `before_change(product, name)`
+    and `after_change(product, name)` are called around every assignment of
+    an attribute `name`.
+
+    The common single-watcher case stores `ref` itself, so a watcher that
+    reuses one reference for all its products adds no per-product objects.
+    """
+    refs = _watchers_of(product)
+    object.__setattr__(product, "_watchers", refs + (ref,) if refs else ref)
+
+
+def unwatch_product(product: "Product", ref: weakref.ref) -> None:
+    """
+    Removes one registration made with `watch_product`.
+    """
+    refs = list(_watchers_of(product))
+    for i, other in enumerate(refs):
+        if other is ref:
+            del refs[i]
+            object.__setattr__(
+                product, "_watchers", refs[0] if len(refs) == 1 else tuple(refs)
+            )
+            return
+
+
 # Base Product
 class Product(BaseModel):
     product_id: int = Field(..., gt=0)
@@ -35,6 +135,33 @@ class Product(BaseModel):
     quantity: int = Field(..., ge=0)
     price: float = Field(..., gt=0)
 
+    # Not a field: watchers registered by `watch_product`
+    __slots__ = ("_watchers",)
+    # Fields whose assignment refreshes values stored by `model_post_init`
+    DERIVED_FROM: ClassVar[FrozenSet[str]] = frozenset()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        Sets the attribute, notifying watchers (such as an Inventory's
+        product list) so their indexes and totals follow the change.
+        """
+        refs = _watchers_of(self)
+        watchers = [w for w in (ref() for ref in refs) if w is not None] if refs else ()
+        if not watchers:
+            super().__setattr__(name, value)
+            if name in self.DERIVED_FROM:
+                self.model_post_init(None)
+            return
+        for watcher in watchers:
+            watcher.before_change(self, name)
+        try:
+            super().__setattr__(name, value)
+            if name in self.DERIVED_FROM:
+                self.model_post_init(None)
+        finally:
+            for watcher in watchers:
+                watcher.after_change(self, name)
+
     def get_total_value(self) -> float:
         """
         Returns the total value of the product based on its price and quantity.
@@ -46,8 +173,27 @@ class Product(BaseModel):
 @register_product_type("food")
 class FoodProduct(Product):
     category: str = "food"
-    mfg_date: datetime
-    expiry_date: datetime
+    mfg_date: CachedDatetime
+    expiry_date: CachedDatetime
+
+    __slots__ = ("_expiry_timestamp",)
+    DERIVED_FROM: ClassVar[FrozenSet[str]] = frozenset({"expiry_date"})
+
+    def model_post_init(self, __context: Any) -> None:
+        """
+        Stores the expiry date as a POSIX timestamp for expiry reports.
+        """
+        object.__setattr__(self, "_expiry_timestamp", posix_timestamp(self.expiry_date))
+
+    def get_expiry_timestamp(self) -> float:
+        """
+        Returns the expiry date as a POSIX timestamp, stored at construction.
+        """
+        try:
+            return object.__getattribute__(self, "_expiry_timestamp")
+        except AttributeError:
+            # Copies and records carry no stored value
+            return posix_timestamp(self.expiry_date)
 
     @model_validator(mode="after")
     def check_expiry_after_mfg(self) -> Product:
@@ -63,14 +209,34 @@ class FoodProduct(Product):
 @register_product_type("electronic")
 class ElectronicProduct(Product):
     category: str = "electronic"
-    purchase_date: datetime
+    purchase_date: CachedDatetime
     warranty_period: int = Field(..., ge=0)
 
+    __slots__ = ("_warranty_end",)
+    DERIVED_FROM: ClassVar[FrozenSet[str]] = frozenset(
+        {"purchase_date", "warranty_period"}
+    )
+
+    def model_post_init(self, __context: Any) -> None:
+        """
+        Stores the warranty end date, see `get_warranty_end_date`.
+        """
+        object.__setattr__(
+            self,
+            "_warranty_end",
+            warranty_end_date(self.purchase_date, self.warranty_period),
+        )
+
     def get_warranty_end_date(self) -> datetime:
         """
-        Calculates the warranty end date based on the purchase date.
+        Returns the warranty end date, computed from the purchase date and
+        warranty period at construction and whenever either changes.
         """
-        return self.purchase_date + relativedelta(months=self.warranty_period)
+        try:
+            return object.__getattribute__(self, "_warranty_end")
+        except AttributeError:
+            # Copies and records carry no stored value
+            return warranty_end_date(self.purchase_date, self.warranty_period)
 
 
 @register_product_type("book")
@@ -0,0 +1,195 @@
+import dataclasses
+import inspect
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Tuple, Type
+
+from pydantic import BaseModel
+
+from .models import Product
+
+
+class ProductRecord:
+    """
+    Compact, read-only stand-in for a product model.
+
+    Each model class gets a record class (see `record_class`) storing the
+    field values in `__slots__`, so a record needs no per-instance dict and
+    shares its fields-set with every record loaded the same way. Records
+    report their model as `__class__`, so `isinstance(record, FoodProduct)`
+    holds, keep its public methods such as `get_total_value`, and support
+    `model_dump()`, so read-only code (summaries, reports, indexes, the
+    Week5 API) accepts them unchanged. Assigning an attribute raises
+    AttributeError; use `to_model` or `Inventory.materialize` to get a
+    mutable model.
+    """
+
+    __slots__ = ("_fields_set", "_watchers")
+
+    model_class: Type[Product] = Product
+    fields: Tuple[str, ...] = ()
+    # Lets pydantic's __eq__ compare models with records
+    __pydantic_generic_metadata__: Dict[str, Any] = {"origin": Product}
+    __pydantic_extra__ = None
+    __pydantic_private__ = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(
+            f"{type(self).__name__} is read-only; convert it with to_model() "
+            "or Inventory.materialize() to change it"
+        )
+
+    def __delattr__(self, name: str) -> None:
+        self.__setattr__(name, None)
+
+    @property  # type: ignore[misc]
+    def __class__(self) -> Type[Product]:  # type: ignore[override]
+        return self.model_class
+
+    @property
+    def __dict__(self) -> Dict[str, Any]:  # type: ignore[override]
+        return self.model_dump()
+
+    @property
+    def model_fields_set(self) -> set:
+        return set(self._fields_set)
+
+    def model_dump(self) -> Dict[str, Any]:
+        """
+        Returns the field values like `BaseModel.model_dump()`.
+        """
+        return {name: getattr(self, name) for name in self.fields}
+
+    def to_model(self, validate: bool = False) -> Product:
+        """
+        Converts the record to its full Pydantic model.
+
+        Args:
+        - validate (bool): Run field and model validation; otherwise the model
+          is filled directly, like `model_construct`, since the values were
+          validated when the record was created.
+        """
+        data = self.model_dump()
+        if validate:
+            return self.model_class(**data)
+        model = self.model_class.__new__(self.model_class)
+        object.__setattr__(model, "__dict__", data)
+        object.__setattr__(model, "__pydantic_fields_set__", set(self._fields_set))
+        object.__setattr__(model, "__pydantic_extra__", None)
+        object.__setattr__(model, "__pydantic_private__", None)
+        if self.model_class.__pydantic_post_init__:
+            model.model_post_init(None)
+        return model
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (ProductRecord, BaseModel)):
+            return (
+                other.__class__ is self.model_class
+                and other.__dict__ == self.model_dump()
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{type(self).__name__}({values})"
+
+    def __reduce__(self) -> Tuple[Callable, tuple]:
+        values = tuple(getattr(self, name) for name in self.fields)
+        return make_record, (self.model_class, values, self._fields_set)
+
+
+_RECORD_CLASSES: Dict[Type[Product], Type[ProductRecord]] = {}
+_BUILDERS: Dict[Type[Product], Callable[[Iterable[Any], FrozenSet[str]], Any]] = {}
+_FIELDS_SETS: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+
+def _public_methods(model_class: Type[Product]) -> Dict[str, Callable]:
+    """
+    Returns the plain methods a model class and its bases define, such as
+    `get_total_value`, so records can share them. Validators are left out.
+    """
+    decorators = model_class.__pydantic_decorators__
+    validators = {
+        name
+        for group in dataclasses.fields(decorators)
+        for name in getattr(decorators, group.name)
+    }
+    methods: Dict[str, Callable] = {}
+    for klass in reversed(model_class.__mro__):
+        if not issubclass(klass, Product):
+            continue
+        for name, value in vars(klass).items():
+            if name.startswith(("_", "model_")) or name in validators:
+                continue
+            if inspect.isfunction(value):
+                methods[name] = value
+    return methods
+
+
+def record_class(model_class: Type[Product]) -> Type[ProductRecord]:
+    """
+    Returns the record class for a model class, creating it on first use.
+    """
+    cls = _RECORD_CLASSES.get(model_class)
+    if cls is None:
+        fields = tuple(model_class.model_fields)
+        namespace: Dict[str, Any] = dict(_public_methods(model_class))
+        namespace.update(
+            __slots__=fields,
+            __module__=__name__,
+            __qualname__=f"{model_class.__name__}Record",
+            model_class=model_class,
+            fields=fields,
+            __pydantic_generic_metadata__={"origin": model_class},
+        )
+        cls = type(f"{model_class.__name__}Record", (ProductRecord,), namespace)
+        _RECORD_CLASSES[model_class] = cls
+    return cls
+
+
+def record_builder(model_class: Type[Product]) -> Callable[[Iterable[Any], Any], Any]:
+    """
+    Returns a cached function `build(values, fields_set)` creating records
+    of `model_class` from field values in model field order. Slots are set
+    directly, past the read-only guard.
+    """
+    build = _BUILDERS.get(model_class)
+    if build is None:
+        cls = record_class(model_class)
+        setters = [getattr(cls, name).__set__ for name in cls.fields]
+        set_fields_set = ProductRecord._fields_set.__set__  # type: ignore[attr-defined]
+        new = object.__new__
+
+        def build(values: Iterable[Any], fields_set: Any) -> ProductRecord:
+            record = new(cls)
+            for setter, value in zip(setters, values):
+                setter(record, value)
+            set_fields_set(record, fields_set)
+            return record
+
+        _BUILDERS[model_class] = build
+    return build
+
+
+def make_record(
+    model_class: Type[Product], values: Iterable[Any], fields_set: Iterable[str]
+) -> ProductRecord:
+    """
+    Creates a record from field values given in model field order.
+    Values are trusted to be valid; they are not checked.
+    """
+    fields_set = frozenset(fields_set)
+    fields_set = _FIELDS_SETS.setdefault(fields_set, fields_set)
+    return record_builder(model_class)(values, fields_set)
+
+
+def to_record(product: Product) -> ProductRecord:
+    """
+    Returns a compact record holding the values of a product model.
+    Records are returned unchanged.
+    """
+    if isinstance(product, ProductRecord):
+        return product
+    fields_set = frozenset(product.__pydantic_fields_set__)
+    fields_set = _FIELDS_SETS.setdefault(fields_set, fields_set)
+    return record_builder(type(product))(product.__dict__.values(), fields_set)
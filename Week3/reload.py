@@ -0,0 +1,264 @@
+import csv
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .core import Inventory
+from .errors import DEFAULT_MAX_LOGGED, IngestErrorCollector
+from .ingest import build_product, build_trusted_product
+from .models import Product
+from .records import to_record
+from .snapshot import source_stamp
+from .wal import WriteAheadLog
+
+# Seconds between checks of the CSV file's modification time and size
+DEFAULT_INTERVAL = 5.0
+
+# (row number, product_id, content hash, raw row) for one CSV row
+HashedRow = Tuple[int, int, int, List[str]]
+
+
+class CsvReloader:
+    """
+    Keeps an Inventory in step with a CSV file by applying row deltas.
+
+    A content hash is remembered per product_id for the rows last applied.
+    `reload` validates and upserts only rows whose hash changed, and removes
+    products whose rows disappeared, so an unchanged row costs a CSV parse
+    and a hash instead of a model. `start` runs `check` on a background
+    thread, reloading whenever the file's modification time or size changes.
+
+    Products added through other means, such as the Week5 API, are left
+    alone unless a row with their product_id appears. An invalid row is
+    logged and skipped, keeping the product it would have replaced. Rows
+    repeating a product_id are rejected; the first occurrence is kept.
+    Writers should replace the file atomically (write, then rename); a
+    file that changes while it is read is skipped until the next check.
+
+    With a `wal`, each delta is logged to it like any other change, so
+    replaying the log on startup, after the CSV is loaded, brings back what
+    the reloader applied rather than older values it replaced.
+    """
+
+    def __init__(
+        self,
+        inventory: Inventory,
+        csv_file: str,
+        trusted: bool = False,
+        max_logged: Optional[int] = DEFAULT_MAX_LOGGED,
+        wal: Optional[WriteAheadLog] = None,
+    ):
+        """
+        Args:
+        - inventory (Inventory): The live inventory to update.
+        - csv_file (str): Path to the source CSV file.
+        - trusted (bool): Build changed rows without validation, see
+          `Inventory.create_product_from_row`.
+        - max_logged (int, optional): Row errors of each type logged per
+          reload, as in `Inventory.load_from_csv`; None logs every one.
+        - wal (WriteAheadLog, optional): Log recording the applied deltas.
+        """
+        self.inventory = inventory
+        self.csv_file = csv_file
+        self.trusted = trusted
+        self.max_logged = max_logged
+        self.wal = wal
+        self.stamp: Optional[Tuple[int, int]] = None
+        self._hashes: Dict[int, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def prime(self) -> None:
+        """
+        Records the file's current rows as already applied without changing
+        the inventory, e.g. after `Inventory.load_with_snapshot` loaded it.
+        """
+        try:
+            stamp = source_stamp(self.csv_file)
+            hashes: Dict[int, int] = {}
+            with open(self.csv_file, newline="") as f:
+                reader = csv.reader(f)
+                fieldnames = next(reader, None) or []
+                for _, product_id, digest, _ in _hashed_rows(reader, fieldnames):
+                    hashes.setdefault(product_id, digest)
+        except FileNotFoundError:
+            logging.error(f"CSV file '{self.csv_file}' not found.")
+            return
+        except ValueError as e:
+            logging.error(f"Error reading '{self.csv_file}': {e}")
+            return
+        self.stamp, self._hashes = stamp, hashes
+
+    def check(self) -> Optional[dict]:
+        """
+        Reloads the file if its modification time or size changed since the
+        last reload.
+
+        Returns:
+        - dict or None: The `reload` counts, or None when nothing was done.
+        """
+        try:
+            stamp = source_stamp(self.csv_file)
+        except FileNotFoundError:
+            if self.stamp is not None:
+                logging.error(f"CSV file '{self.csv_file}' not found.")
+                self.stamp = None
+            return None
+        if stamp == self.stamp:
+            return None
+        return self.reload()
+
+    def reload(self) -> Optional[dict]:
+        """
+        Applies the rows that changed since the last reload or `prime`.
+
+        The delta is worked out before the inventory is touched. If the file
+        changed while it was read, nothing is applied and None is returned,
+        so the next `check` reads it again.
+
+        Returns:
+        - dict or None: Counts of inserted, updated, deleted, unchanged and
+          rejected rows, or None if the file was missing or changing.
+        """
+        try:
+            stamp = source_stamp(self.csv_file)
+            with IngestErrorCollector(max_logged=self.max_logged) as errors:
+                with open(self.csv_file, newline="") as f:
+                    hashes, changed, unchanged = self._diff(f, errors)
+        except FileNotFoundError:
+            logging.error(f"CSV file '{self.csv_file}' not found.")
+            return None
+        except (OSError, ValueError) as e:
+            logging.error(f"Error reloading '{self.csv_file}': {e}")
+            return None
+        if source_stamp(self.csv_file) != stamp:
+            logging.warning(f"CSV file '{self.csv_file}' changed while reloading.")
+            return None
+
+        deleted = [pid for pid in self._hashes if pid not in hashes]
+        inserted = 0
+        ticket = None
+        # Readers see either none or all of the delta
+        with self.inventory.lock.writing():
+            if self.wal is not None:
+                self.wal.log_put(changed)
+                ticket = self.wal.log_delete(deleted)
+            for product in changed:
+                if self.inventory.compact:
+                    product = to_record(product)
+                if self.inventory.upsert(product) is None:
+                    inserted += 1
+            self.inventory.remove_many(deleted)
+        if ticket is not None:
+            self.wal.sync(ticket)
+        self.stamp, self._hashes = stamp, hashes
+
+        counts = {
+            "inserted": inserted,
+            "updated": len(changed) - inserted,
+            "deleted": len(deleted),
+            "unchanged": unchanged,
+            "rejected": errors.rejected,
+        }
+        if changed or deleted:
+            logging.info(
+                f"Reloaded '{self.csv_file}': {counts['inserted']} inserted, "
+                f"{counts['updated']} updated, {counts['deleted']} deleted."
+            )
+        return counts
+
+    def start(self, interval: float = DEFAULT_INTERVAL) -> None:
+        """
+        Starts a daemon thread calling `check` every `interval` seconds.
+        Does nothing if the thread is already running.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, args=(interval,), name="csv-reloader", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the background thread started by `start` and waits for it.
+        """
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout)
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception as e:
+                logging.error(f"Error reloading '{self.csv_file}': {e}")
+
+    def _diff(
+        self, f: Iterable[str], errors: IngestErrorCollector
+    ) -> Tuple[Dict[int, int], List[Product], int]:
+        """
+        Returns the new hash per product_id, the products built from new or
+        changed rows, and the number of unchanged rows.
+        """
+        build: Callable[[dict], Product] = (
+            build_trusted_product if self.trusted else build_product
+        )
+        reader = csv.reader(f)
+        fieldnames = next(reader, None) or []
+        errors.set_fieldnames(fieldnames)
+        old = self._hashes
+        hashes: Dict[int, int] = {}
+        changed: List[Product] = []
+        unchanged = 0
+        for idx, product_id, digest, row in _hashed_rows(reader, fieldnames, errors):
+            if product_id not in hashes and old.get(product_id) == digest:
+                hashes[product_id] = digest
+                unchanged += 1
+                continue
+            row_dict = dict(zip(fieldnames, row))
+            try:
+                product = build(row_dict)
+            except Exception as e:
+                errors.reject(idx, row_dict, e)
+                if product_id in old and product_id not in hashes:
+                    # Keep the current product until a valid row replaces it
+                    hashes[product_id] = old[product_id]
+                continue
+            if product_id in hashes:
+                errors.reject_duplicate(idx, product)
+                continue
+            hashes[product_id] = digest
+            changed.append(product)
+            errors.loaded += 1
+        return hashes, changed, unchanged
+
+
+def _hashed_rows(
+    reader: Iterator[List[str]],
+    fieldnames: List[str],
+    errors: Optional[IngestErrorCollector] = None,
+) -> Iterator[HashedRow]:
+    """
+    Yields (row number, product_id, hash, row) for each row of a CSV reader
+    past the header, skipping blank lines like `csv.DictReader` does. Rows
+    without a readable product_id go to `errors` when given.
+
+    Raises:
+    - ValueError: If the header has no product_id column.
+    """
+    if "product_id" not in fieldnames:
+        raise ValueError("CSV header has no product_id column")
+    id_at = fieldnames.index("product_id")
+    for idx, row in enumerate(reader, start=2):
+        if not row:
+            continue
+        try:
+            product_id = int(row[id_at])
+        except (IndexError, ValueError) as e:
+            if errors is not None:
+                errors.reject(idx, row, e)
+            continue
+        yield idx, product_id, hash(tuple(row)), row
@@ -0,0 +1,505 @@
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from .models import Product
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - exercised only on Windows
+    fcntl = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+Result = TypeVar("Result")
+
+# Header: eight int64 words at the start of the segment
+MAGIC = int.from_bytes(b"INVSHM1\x00", "little")
+LAYOUT = 1
+(
+    MAGIC_WORD,
+    LAYOUT_WORD,
+    CAPACITY_WORD,
+    SLOTS_WORD,
+    ROWS_WORD,
+    SEQUENCE_WORD,
+    LIVE_WORD,
+    USED_SLOTS_WORD,
+) = range(8)
+HEADER_WORDS = 8
+WORD = 8
+HEADER_SIZE = HEADER_WORDS * WORD
+
+MIN_CAPACITY = 1024
+NO_EXPIRY = math.inf
+# Index slots: 0 is empty, -1 a removed entry, otherwise row + 1
+EMPTY, REMOVED = 0, -1
+FIBONACCI = 11400714819323198485
+MASK64 = (1 << 64) - 1
+
+
+class SharedColumns:
+    """
+    Numeric product columns and a product_id index in one shared-memory
+    segment, so pre-forked server workers read one copy of the stock and
+    prices and see each other's changes to them.
+
+    The segment holds product_id, quantity, price and expiry timestamp
+    columns, like `ColumnStore`, plus an open-addressing hash index from
+    product_id to row. Product names, categories and other fields are not
+    shared. A removed product leaves a zeroed row, which is reclaimed when
+    the columns fill up; `capacity` rows are reserved when the segment is
+    created.
+
+    One process writes at a time: writers take a file lock (and a thread
+    lock within the process) and bump a sequence counter to an odd value
+    before changing anything and to an even one after. Readers take no
+    lock; they retry while the counter is odd or moved during their read,
+    so they never see a half-written change. `version` is the number of
+    completed writes, which lets a worker tell whether anything changed.
+
+    Used as a listener of an Inventory's product list, it publishes every
+    change made to that inventory, except that clearing the list leaves
+    the segment to the other workers (see `clear`). Create the segment
+    once with `create` or `open` and `attach` to it by name elsewhere. The
+    segment outlives its processes until `unlink` is called, for example
+    from the server's exit hook.
+    """
+
+    fields = frozenset({"product_id", "quantity", "price", "expiry_date"})
+
+    def __init__(self, shm: shared_memory.SharedMemory):
+        """
+        Wraps an already filled segment; use `create`, `attach` or `open`.
+        """
+        self._shm = shm
+        self.name = shm.name
+        buf = shm.buf
+        self._meta = buf[:HEADER_SIZE].cast("q")
+        capacity = self._meta[CAPACITY_WORD]
+        slots = self._meta[SLOTS_WORD]
+        offset = HEADER_SIZE
+        self._views = [self._meta]
+        self._ids, offset = self._column(offset, capacity, "q")
+        self._quantities, offset = self._column(offset, capacity, "q")
+        self._prices, offset = self._column(offset, capacity, "d")
+        self._expiries, offset = self._column(offset, capacity, "d")
+        self._slots_at = offset
+        self._slots, offset = self._column(offset, slots, "q")
+        self._shift = 64 - (slots.bit_length() - 1)
+        self._thread_lock = threading.Lock()
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{self.name}.lock")
+        self._lock_fd: Optional[int] = None
+        self._lock_pid = 0
+
+    @classmethod
+    def create(
+        cls,
+        products: Iterable[Product] = (),
+        name: Optional[str] = None,
+        capacity: Optional[int] = None,
+    ) -> "SharedColumns":
+        """
+        Creates a segment holding the given products.
+
+        Args:
+        - products (iterable): Products to store, such as an Inventory's.
+        - name (str, optional): Segment name; a random one when None.
+        - capacity (int, optional): Rows reserved; by default twice the
+          number of products, and at least MIN_CAPACITY.
+
+        Raises:
+        - FileExistsError: If a segment with this name already exists.
+        - ValueError: If there are more products than `capacity`.
+        """
+        products = list(products)
+        if capacity is None:
+            capacity = max(2 * len(products), MIN_CAPACITY)
+        if len(products) > capacity:
+            raise ValueError(f"{len(products)} products exceed capacity {capacity}")
+        slots = 1 << (2 * capacity - 1).bit_length()
+        size = (HEADER_WORDS + 4 * capacity + slots) * WORD
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _untrack(shm)
+        meta = shm.buf[:HEADER_SIZE].cast("q")
+        meta[LAYOUT_WORD] = LAYOUT
+        meta[CAPACITY_WORD] = capacity
+        meta[SLOTS_WORD] = slots
+        meta.release()
+        columns = cls(shm)
+        with columns.writing():
+            for product in products:
+                columns._put(product)
+        # Attaching processes wait for the magic number, written last
+        columns._meta[MAGIC_WORD] = MAGIC
+        return columns
+
+    @classmethod
+    def attach(cls, name: str, timeout: float = 10.0) -> "SharedColumns":
+        """
+        Attaches to an existing segment, waiting up to `timeout` seconds
+        for its creator to finish filling it.
+
+        Raises:
+        - FileNotFoundError: If no segment has this name.
+        - TimeoutError: If the segment is not filled in time.
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        _untrack(shm)
+        meta = shm.buf[:HEADER_SIZE].cast("q")
+        deadline = time.monotonic() + timeout
+        try:
+            while meta[MAGIC_WORD] != MAGIC:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Shared inventory '{name}' was not filled")
+                time.sleep(0.01)
+            if meta[LAYOUT_WORD] != LAYOUT:
+                raise ValueError(f"Shared inventory '{name}' has another layout")
+        except BaseException:
+            meta.release()
+            shm.close()
+            raise
+        meta.release()
+        return cls(shm)
+
+    @classmethod
+    def open(
+        cls,
+        name: str,
+        products: Iterable[Product] = (),
+        capacity: Optional[int] = None,
+    ) -> "SharedColumns":
+        """
+        Attaches to the named segment, or creates it from `products` if it
+        does not exist yet, so the first of several workers creates it.
+        """
+        try:
+            return cls.attach(name)
+        except FileNotFoundError:
+            pass
+        try:
+            return cls.create(products, name=name, capacity=capacity)
+        except FileExistsError:
+            return cls.attach(name)
+
+    # ----------------------------
+    # Reads
+    # ----------------------------
+
+    @property
+    def version(self) -> int:
+        """
+        The number of writes completed on the segment by any process.
+        """
+        return self._meta[SEQUENCE_WORD] // 2
+
+    def __len__(self) -> int:
+        return self._read(lambda: self._meta[LIVE_WORD])
+
+    def __contains__(self, product_id: int) -> bool:
+        return self.get(product_id) is not None
+
+    def get(self, product_id: int) -> Optional[Tuple[int, float]]:
+        """
+        Returns the (quantity, price) stored for a product, or None.
+        """
+
+        def read() -> Optional[Tuple[int, float]]:
+            row = self._find(product_id)[1]
+            if row is None:
+                return None
+            return self._quantities[row], self._prices[row]
+
+        return self._read(read)
+
+    def total_value(self) -> float:
+        """
+        Returns the sum of quantity * price over every product.
+        """
+        return self._read(lambda: self._summarize(None)[2])
+
+    def summarize(self, now: datetime) -> Tuple[int, int, float]:
+        """
+        Aggregates the products that are not expired at `now`.
+
+        Returns:
+        - (count, total quantity, total value)
+        """
+        return self._read(lambda: self._summarize(now.timestamp()))
+
+    # ----------------------------
+    # Writes
+    # ----------------------------
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """
+        Holds the writer lock inside a `with` block, marking the segment
+        as changing so readers retry until the block ends.
+        """
+        with self._thread_lock:
+            self._lock_file(True)
+            meta = self._meta
+            meta[SEQUENCE_WORD] += 1
+            try:
+                yield
+            finally:
+                meta[SEQUENCE_WORD] += 1
+                self._lock_file(False)
+
+    def put(self, product: Product) -> None:
+        """
+        Stores the product's numeric fields, adding it if it is new.
+
+        Raises:
+        - ValueError: If the product is new and every row is taken.
+        """
+        with self.writing():
+            self._put(product)
+
+    def remove(self, product_id: int) -> None:
+        """
+        Removes the product, if present.
+        """
+        with self.writing():
+            self._remove(product_id)
+
+    def add(self, product: Product) -> None:
+        try:
+            self.put(product)
+        except ValueError as e:
+            logging.error(f"Product {product.product_id} not shared: {e}")
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        with self.writing():
+            for product in products:
+                try:
+                    self._put(product)
+                except ValueError as e:
+                    logging.error(f"Product {product.product_id} not shared: {e}")
+
+    def discard(self, product: Product) -> None:
+        self.remove(product.product_id)
+
+    def clear(self) -> None:
+        """
+        Leaves the segment as it is: one worker emptying its product list,
+        for example to load it again, must not take the products away from
+        the other workers. Use `reset` to empty the segment itself.
+        """
+
+    def reset(self) -> None:
+        """
+        Removes every product from the segment, for all workers.
+        """
+        with self.writing():
+            meta = self._meta
+            meta[ROWS_WORD] = meta[LIVE_WORD] = meta[USED_SLOTS_WORD] = 0
+            self._clear_slots()
+
+    # ----------------------------
+    # Lifetime
+    # ----------------------------
+
+    def close(self) -> None:
+        """
+        Detaches this process from the segment.
+        """
+        for view in self._views:
+            view.release()
+        self._shm.close()
+        if self._lock_fd is not None and self._lock_pid == os.getpid():
+            os.close(self._lock_fd)
+        self._lock_fd = None
+
+    def unlink(self) -> None:
+        """
+        Destroys the segment once every process has closed it.
+        """
+        # Registered again only so that unlink can unregister it
+        resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+        try:
+            os.remove(self._lock_path)
+        except FileNotFoundError:
+            pass
+
+    # ----------------------------
+    # Internals
+    # ----------------------------
+
+    def _column(self, offset: int, rows: int, typecode: str) -> Tuple[memoryview, int]:
+        end = offset + rows * WORD
+        view = self._shm.buf[offset:end].cast(typecode)
+        self._views.append(view)
+        return view, end
+
+    def _lock_file(self, exclusive: bool) -> None:
+        """
+        Takes or releases the lock file shared by every writing process.
+        """
+        if fcntl is None:  # pragma: no cover - exercised only on Windows
+            return
+        # flock locks an open file, which children share across fork, so
+        # each process opens its own
+        if self._lock_fd is None or self._lock_pid != os.getpid():
+            self._lock_fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._lock_pid = os.getpid()
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_UN)
+
+    def _read(self, read: Callable[[], Result]) -> Result:
+        """
+        Runs `read` until no write overlapped it.
+        """
+        meta = self._meta
+        while True:
+            start = meta[SEQUENCE_WORD]
+            if start & 1:
+                time.sleep(0)
+                continue
+            try:
+                result = read()
+            except (IndexError, ValueError):
+                # A concurrent write can leave rows inconsistent mid-read
+                if meta[SEQUENCE_WORD] == start:
+                    raise
+                continue
+            if meta[SEQUENCE_WORD] == start:
+                return result
+
+    def _find(self, product_id: int) -> Tuple[int, Optional[int]]:
+        """
+        Returns the index slot of the product (or the first free slot for
+        it) and its row, or None when it is absent.
+        """
+        slots = self._slots
+        mask = len(slots) - 1
+        slot = ((product_id * FIBONACCI) & MASK64) >> self._shift
+        free = -1
+        for _ in range(len(slots)):
+            entry = slots[slot]
+            if entry == EMPTY:
+                return (free if free >= 0 else slot), None
+            if entry == REMOVED:
+                if free < 0:
+                    free = slot
+            elif self._ids[entry - 1] == product_id:
+                return slot, entry - 1
+            slot = (slot + 1) & mask
+        return free, None
+
+    def _put(self, product: Product) -> None:
+        meta = self._meta
+        slot, row = self._find(product.product_id)
+        if row is None:
+            if meta[ROWS_WORD] == meta[CAPACITY_WORD]:
+                self._compact()
+                if meta[ROWS_WORD] == meta[CAPACITY_WORD]:
+                    raise ValueError(f"Shared inventory '{self.name}' is full")
+                slot = self._find(product.product_id)[0]
+            row = meta[ROWS_WORD]
+            meta[ROWS_WORD] = row + 1
+            meta[LIVE_WORD] += 1
+            if self._slots[slot] == EMPTY:
+                meta[USED_SLOTS_WORD] += 1
+            self._ids[row] = product.product_id
+            self._slots[slot] = row + 1
+        self._quantities[row] = product.quantity
+        self._prices[row] = product.price
+        # Looked up on the class: a missing model attribute is slow to miss
+        if hasattr(product.__class__, "get_expiry_timestamp"):
+            self._expiries[row] = product.get_expiry_timestamp()
+        else:
+            self._expiries[row] = NO_EXPIRY
+        if meta[USED_SLOTS_WORD] * 4 > len(self._slots) * 3:
+            self._compact()
+
+    def _remove(self, product_id: int) -> None:
+        slot, row = self._find(product_id)
+        if row is None:
+            return
+        self._slots[slot] = REMOVED
+        self._ids[row] = 0
+        self._quantities[row] = 0
+        self._prices[row] = 0.0
+        self._expiries[row] = NO_EXPIRY
+        self._meta[LIVE_WORD] -= 1
+
+    def _compact(self) -> None:
+        """
+        Moves live rows over removed ones and rebuilds the index.
+        """
+        meta = self._meta
+        ids, quantities = self._ids, self._quantities
+        prices, expiries = self._prices, self._expiries
+        live = 0
+        for row in range(meta[ROWS_WORD]):
+            if ids[row] == 0:
+                continue
+            if row != live:
+                ids[live], quantities[live] = ids[row], quantities[row]
+                prices[live], expiries[live] = prices[row], expiries[row]
+            live += 1
+        meta[ROWS_WORD] = meta[LIVE_WORD] = meta[USED_SLOTS_WORD] = live
+        self._clear_slots()
+        for row in range(live):
+            self._slots[self._find(ids[row])[0]] = row + 1
+
+    def _summarize(self, cutoff: Optional[float]) -> Tuple[int, int, float]:
+        rows = self._meta[ROWS_WORD]
+        if np is not None:
+            buf = self._shm.buf
+            start = HEADER_SIZE
+            capacity = self._meta[CAPACITY_WORD]
+            ids = np.frombuffer(buf, np.int64, rows, start)
+            quantities = np.frombuffer(buf, np.int64, rows, start + capacity * WORD)
+            prices = np.frombuffer(buf, np.float64, rows, start + 2 * capacity * WORD)
+            valid = ids > 0
+            if cutoff is not None:
+                expiries = np.frombuffer(
+                    buf, np.float64, rows, start + 3 * capacity * WORD
+                )
+                valid &= expiries >= cutoff
+            return (
+                int(np.count_nonzero(valid)),
+                int(quantities[valid].sum()),
+                float(np.dot(quantities[valid], prices[valid])),
+            )
+
+        count = total_quantity = 0
+        total_value = 0.0
+        for row in range(rows):
+            if self._ids[row] == 0:
+                continue
+            if cutoff is not None and self._expiries[row] < cutoff:
+                continue
+            quantity = self._quantities[row]
+            count += 1
+            total_quantity += quantity
+            total_value += quantity * self._prices[row]
+        return count, total_quantity, total_value
+
+    def _clear_slots(self) -> None:
+        size = len(self._slots) * WORD
+        self._shm.buf[slice(self._slots_at, self._slots_at + size)] = bytes(size)
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    """
+    Stops Python's resource tracker from destroying the segment when this
+    process exits; its lifetime is managed with `SharedColumns.unlink`.
+    """
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:  # pragma: no cover - tracker internals vary
+        pass
@@ -0,0 +1,352 @@
+import mmap
+import os
+import struct
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from .models import PRODUCT_CLASS_MAP, Product
+from .records import record_builder
+
+# File layout (little-endian):
+#   header: magic, version, group count, product count, source CSV mtime_ns
+#   and size
+#   per product class: name, row count, column count, list positions,
+#   fields-set bitmasks, then one column per model field, each payload
+#   8-byte aligned
+MAGIC = b"INVSNAP\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHxxIqqq")
+GROUP = struct.Struct("<IH")
+NAME_LENGTH = struct.Struct("<H")
+BLOB_LENGTH = struct.Struct("<q")
+
+# Column kinds: 64-bit ints, doubles, datetimes (microseconds plus UTC offset
+# in seconds) and strings (one UTF-8 blob with character offsets)
+INT, FLOAT, DATETIME, STRING = b"q", b"d", b"t", b"s"
+EPOCH = datetime(1970, 1, 1)
+NAIVE = -(2**31)
+NULL = -1
+
+
+class SnapshotError(ValueError):
+    """
+    Raised when a snapshot file is not a readable snapshot of this version.
+    """
+
+
+def source_stamp(csv_file: str) -> Tuple[int, int]:
+    """
+    Returns the (mtime_ns, size) pair recorded for the source CSV.
+    """
+    stat = os.stat(csv_file)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_stamp(path: str) -> Tuple[int, int]:
+    """
+    Returns the source (mtime_ns, size) stored in a snapshot header.
+
+    Raises:
+    - SnapshotError: If the file is not a snapshot of the current version.
+    """
+    with open(path, "rb") as f:
+        return _parse_header(f.read(HEADER.size))[2]
+
+
+def write_snapshot(
+    path: str, products: Iterable[Product], stamp: Tuple[int, int] = (0, 0)
+) -> None:
+    """
+    Writes products to a snapshot file, replacing it atomically so readers
+    never see a partial file.
+
+    Raises:
+    - ValueError: If a product holds values its field type cannot store.
+    """
+    groups: Dict[Type[Product], Tuple[array, List[Product]]] = {}
+    count = 0
+    for count, product in enumerate(products, 1):
+        # __class__ is the model class for both models and ProductRecords
+        group = groups.get(product.__class__)
+        if group is None:
+            group = groups[product.__class__] = (array("q"), [])
+        group[0].append(count - 1)
+        group[1].append(product)
+
+    out = bytearray(HEADER.pack(MAGIC, VERSION, len(groups), count, *stamp))
+    for product_class, (positions, members) in groups.items():
+        _write_group(out, product_class, positions, members)
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(out)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def read_snapshot(path: str, records: bool = False) -> List[Product]:
+    """
+    Reads the products of a snapshot file, memory-mapping it where possible.
+
+    Values are restored without validation, like `model_construct`, since
+    they were validated before the snapshot was written. With `records`,
+    compact `ProductRecord`s are built instead of models.
+
+    Raises:
+    - SnapshotError: If the file is not a snapshot of the current version.
+    """
+    with open(path, "rb") as f:
+        try:
+            buffer: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and some filesystems cannot be mapped
+            buffer = f.read()
+    try:
+        with memoryview(buffer) as view:
+            return _read_products(view, records)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise SnapshotError(f"Corrupt snapshot '{path}': {e}") from e
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+
+def _class_name(product_class: Type[Product]) -> str:
+    for name, cls in PRODUCT_CLASS_MAP.items():
+        if cls is product_class:
+            return name
+    if product_class is Product:
+        return ""
+    raise ValueError(f"Unregistered product class {product_class.__name__}")
+
+
+def _column_kind(annotation: Any) -> bytes:
+    if annotation is int:
+        return INT
+    if annotation is float:
+        return FLOAT
+    if annotation is datetime:
+        return DATETIME
+    if annotation in (str, Optional[str]):
+        return STRING
+    raise ValueError(f"Unsupported snapshot field type {annotation!r}")
+
+
+def _pad(out: bytearray) -> None:
+    out += bytes(-len(out) % 8)
+
+
+def _write_name(out: bytearray, name: str) -> None:
+    encoded = name.encode("utf-8")
+    out += NAME_LENGTH.pack(len(encoded)) + encoded
+
+
+def _write_group(
+    out: bytearray,
+    product_class: Type[Product],
+    positions: array,
+    products: List[Product],
+) -> None:
+    fields = list(product_class.model_fields.items())
+    _write_name(out, _class_name(product_class))
+    out += GROUP.pack(len(products), len(fields))
+    _pad(out)
+    out += positions.tobytes()
+
+    bits = {name: 1 << i for i, (name, _) in enumerate(fields)}
+    masks = array("q", [0] * len(products))
+    for row, product in enumerate(products):
+        for name in product.model_fields_set:
+            masks[row] |= bits.get(name, 0)
+    _pad(out)
+    out += masks.tobytes()
+
+    for name, field in fields:
+        kind = _column_kind(field.annotation)
+        _write_name(out, name)
+        out += kind
+        _pad(out)
+        values = [getattr(product, name) for product in products]
+        if kind == INT:
+            out += array("q", values).tobytes()
+        elif kind == FLOAT:
+            out += array("d", values).tobytes()
+        elif kind == DATETIME:
+            _write_datetimes(out, values)
+        else:
+            _write_strings(out, values)
+
+
+def _write_datetimes(out: bytearray, values: List[datetime]) -> None:
+    micros, offsets = array("q"), array("i")
+    for value in values:
+        offset = value.utcoffset()
+        micros.append((value.replace(tzinfo=None) - EPOCH) // timedelta(microseconds=1))
+        offsets.append(NAIVE if offset is None else int(offset.total_seconds()))
+    out += micros.tobytes()
+    out += offsets.tobytes()
+    _pad(out)
+
+
+def _write_strings(out: bytearray, values: List[Optional[str]]) -> None:
+    offsets, position = array("q", [0]), 0
+    for value in values:
+        if value is None:
+            offsets.append(NULL)
+        else:
+            position += len(value)
+            offsets.append(position)
+    blob = "".join(v for v in values if v is not None).encode("utf-8")
+    out += offsets.tobytes()
+    out += BLOB_LENGTH.pack(len(blob))
+    out += blob
+    _pad(out)
+
+
+def _parse_header(data: Any) -> Tuple[int, int, Tuple[int, int]]:
+    if len(data) < HEADER.size:
+        raise SnapshotError("Snapshot file is truncated")
+    magic, version, groups, count, mtime_ns, size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("Not an inventory snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+    return groups, count, (mtime_ns, size)
+
+
+class _Reader:
+    """
+    Cursor over a snapshot buffer that reads arrays without copying bytes.
+    """
+
+    def __init__(self, view: memoryview):
+        self.view = view
+        self.pos = HEADER.size
+
+    def align(self) -> None:
+        self.pos += -self.pos % 8
+
+    def unpack(self, layout: struct.Struct) -> tuple:
+        values = layout.unpack_from(self.view, self.pos)
+        self.pos += layout.size
+        return values
+
+    def take(self, size: int) -> memoryview:
+        start, end = self.pos, self.pos + size
+        if end > len(self.view):
+            raise IndexError("data runs past the end of the file")
+        self.pos = end
+        return self.view[start:end]
+
+    def name(self) -> str:
+        (length,) = self.unpack(NAME_LENGTH)
+        return str(self.take(length), "utf-8")
+
+    def array(self, typecode: str, count: int) -> list:
+        with self.take(count * struct.calcsize(typecode)).cast(typecode) as column:
+            return column.tolist()
+
+
+def _read_products(view: memoryview, records: bool) -> List[Product]:
+    groups, count, _ = _parse_header(view)
+    reader = _Reader(view)
+    products: List[Any] = [None] * count
+    for _ in range(groups):
+        _read_group(reader, products, records)
+    if any(product is None for product in products):
+        raise SnapshotError("Snapshot groups do not cover every product")
+    return products
+
+
+def _read_group(reader: _Reader, products: List[Any], records: bool) -> None:
+    name = reader.name()
+    product_class = PRODUCT_CLASS_MAP.get(name, Product) if name else Product
+    rows, column_count = reader.unpack(GROUP)
+    reader.align()
+    positions = reader.array("q", rows)
+    masks = reader.array("q", rows)
+
+    fields = list(product_class.model_fields)
+    columns: Dict[str, list] = {}
+    for _ in range(column_count):
+        field, kind = reader.name(), bytes(reader.take(1))
+        reader.align()
+        if kind == INT:
+            columns[field] = reader.array("q", rows)
+        elif kind == FLOAT:
+            columns[field] = reader.array("d", rows)
+        elif kind == DATETIME:
+            columns[field] = _read_datetimes(reader, rows)
+        elif kind == STRING:
+            columns[field] = _read_strings(reader, rows)
+        else:
+            raise SnapshotError(f"Unknown column kind {kind!r} for '{field}'")
+    if list(columns) != fields:
+        raise SnapshotError(f"Snapshot fields do not match {product_class.__name__}")
+
+    fields_sets: Dict[int, frozenset] = {}
+    if records:
+        build = record_builder(product_class)
+        for position, mask, values in zip(positions, masks, zip(*columns.values())):
+            fields_set = fields_sets.get(mask)
+            if fields_set is None:
+                fields_set = fields_sets[mask] = _fields_set(fields, mask)
+            products[position] = build(values, fields_set)
+        return
+
+    post_init = product_class.__pydantic_post_init__
+    new, setattr_ = object.__new__, object.__setattr__
+    for position, mask, values in zip(positions, masks, zip(*columns.values())):
+        fields_set = fields_sets.get(mask)
+        if fields_set is None:
+            fields_set = fields_sets[mask] = _fields_set(fields, mask)
+        # Filled the way model_construct does, without validation
+        product = new(product_class)
+        setattr_(product, "__dict__", dict(zip(fields, values)))
+        setattr_(product, "__pydantic_fields_set__", set(fields_set))
+        setattr_(product, "__pydantic_extra__", None)
+        setattr_(product, "__pydantic_private__", None)
+        if post_init:
+            product.model_post_init(None)
+        products[position] = product
+
+
+def _fields_set(fields: List[str], mask: int) -> frozenset:
+    return frozenset(name for i, name in enumerate(fields) if mask >> i & 1)
+
+
+def _read_datetimes(reader: _Reader, rows: int) -> List[datetime]:
+    micros = reader.array("q", rows)
+    offsets = reader.array("i", rows)
+    reader.align()
+    zones: Dict[int, timezone] = {}
+    values = []
+    for micro, offset in zip(micros, offsets):
+        value = EPOCH + timedelta(microseconds=micro)
+        if offset != NAIVE:
+            zone = zones.get(offset)
+            if zone is None:
+                zone = zones[offset] = timezone(timedelta(seconds=offset))
+            value = value.replace(tzinfo=zone)
+        values.append(value)
+    return values
+
+
+def _read_strings(reader: _Reader, rows: int) -> List[Optional[str]]:
+    offsets = reader.array("q", rows + 1)
+    (length,) = reader.unpack(BLOB_LENGTH)
+    text = str(reader.take(length), "utf-8")
+    reader.align()
+    values: List[Optional[str]] = []
+    start = 0
+    for end in offsets[1:]:
+        if end == NULL:
+            values.append(None)
+        else:
+            values.append(text[start:end])
+            start = end
+    return values
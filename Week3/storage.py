@@ -0,0 +1,235 @@
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Protocol
+
+from .models import Product, unwatch_product, watch_product
+
+
+class ProductListener(Protocol):
+    """
+    Interface for structures kept in sync with an Inventory's product list.
+
+    A listener may also define:
+    - `fields`: a frozenset of the product fields it reads. Assigning any
+      other field of a product is not reported to it. Without it, every
+      assignment is reported.
+    - `add_many(products)`: takes products added together, such as the
+      rows of a CSV load, in one call instead of one `add` each.
+    """
+
+    def add(self, product: Product) -> None: ...
+
+    def discard(self, product: Product) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class ProductList(list):
+    """
+    A list of products that notifies registered listeners about every
+    product added to or removed from it. Assigning an attribute of a
+    contained product is reported as a removal followed by an addition.
+
+    It behaves exactly like a plain list, so existing code that appends to,
+    replaces or clears `inventory.products` keeps working while secondary
+    structures (columns, indexes, aggregates) stay consistent with it.
+    `extend` hands its products to each listener as one batch.
+    """
+
+    def __init__(self, iterable: Iterable[Product] = ()):
+        super().__init__()
+        self.listeners: List[ProductListener] = []
+        # id(product) -> index; None when a removal or reordering
+        # invalidated it. Every method that moves products must reset it.
+        self._positions: Optional[Dict[int, int]] = {}
+        # field name -> listeners reading it, for the `_readers_of` listeners
+        self._readers: Dict[str, List[ProductListener]] = {}
+        self._readers_of: List[ProductListener] = []
+        # Shared by every contained product, see `watch_product`
+        self._ref = weakref.ref(self)
+        self.extend(iterable)
+
+    def add_listener(self, listener: ProductListener) -> None:
+        """
+        Registers a listener and replays the current contents into it.
+        """
+        self.listeners.append(listener)
+        for product in self:
+            listener.add(product)
+
+    def position(self, product: Product) -> int:
+        """
+        Returns the index of this exact product object in O(1) amortized time.
+
+        Raises:
+        - ValueError: If the object is not in the list.
+        """
+        if self._positions is None:
+            self._positions = {}
+            for index, item in enumerate(self):
+                self._positions.setdefault(id(item), index)
+        try:
+            return self._positions[id(product)]
+        except KeyError:
+            raise ValueError("product is not in the list") from None
+
+    def _added(self, product: Product) -> None:
+        watch_product(product, self._ref)
+        for listener in self.listeners:
+            listener.add(product)
+
+    def _removed(self, product: Product) -> None:
+        unwatch_product(product, self._ref)
+        for listener in self.listeners:
+            listener.discard(product)
+
+    def before_change(self, product: Product, name: str) -> None:
+        """
+        Called before attribute `name` of a contained product is assigned.
+        """
+        for listener in self._reading(name):
+            listener.discard(product)
+
+    def after_change(self, product: Product, name: str) -> None:
+        """
+        Called after attribute `name` of a contained product was assigned.
+        """
+        for listener in self._reading(name):
+            listener.add(product)
+
+    def _reading(self, name: str) -> List[ProductListener]:
+        """
+        Returns the listeners that read field `name`, see `ProductListener`.
+        """
+        if self._readers_of != self.listeners:
+            # `listeners` is public and may have been changed in place
+            self._readers.clear()
+            self._readers_of = list(self.listeners)
+        readers = self._readers.get(name)
+        if readers is None:
+            readers = self._readers[name] = [
+                listener
+                for listener in self.listeners
+                if name in getattr(listener, "fields", (name,))
+            ]
+        return readers
+
+    def append(self, product: Product) -> None:
+        super().append(product)
+        if self._positions is not None:
+            self._positions.setdefault(id(product), len(self) - 1)
+        self._added(product)
+
+    def extend(self, products: Iterable[Product]) -> None:
+        batch = list(products)
+        if not batch:
+            return
+        start = len(self)
+        super().extend(batch)
+        positions = self._positions
+        if positions is not None:
+            for index, product in enumerate(batch, start):
+                positions.setdefault(id(product), index)
+        ref = self._ref
+        for product in batch:
+            watch_product(product, ref)
+        for listener in self.listeners:
+            add_many = getattr(listener, "add_many", None)
+            if add_many is not None:
+                add_many(batch)
+            else:
+                for product in batch:
+                    listener.add(product)
+
+    def insert(self, index: int, product: Product) -> None:
+        super().insert(index, product)
+        self._positions = None
+        self._added(product)
+
+    def remove(self, product: Product) -> None:
+        index = self.index(product)
+        removed = self[index]
+        super().__delitem__(index)
+        self._positions = None
+        self._removed(removed)
+
+    def remove_many(self, products: Iterable[Product]) -> None:
+        """
+        Removes the given product objects, which must be in the list, in a
+        single pass that keeps the order of the rest. Removing them one by
+        one would rebuild the position map after every removal.
+        """
+        doomed = {id(product): product for product in products}
+        if not doomed:
+            return
+        kept = [product for product in self if id(product) not in doomed]
+        super().__setitem__(slice(None), kept)
+        self._positions = None
+        for product in doomed.values():
+            self._removed(product)
+
+    def pop(self, index: int = -1) -> Product:
+        product = super().pop(index)
+        self._positions = None
+        self._removed(product)
+        return product
+
+    def clear(self) -> None:
+        for product in self:
+            unwatch_product(product, self._ref)
+        super().clear()
+        self._positions = {}
+        for listener in self.listeners:
+            listener.clear()
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if isinstance(key, slice):
+            value = list(value)
+        old = self[key]
+        super().__setitem__(key, value)
+        self._positions = None
+        if isinstance(key, slice):
+            for product in old:
+                self._removed(product)
+            for product in value:
+                self._added(product)
+        else:
+            self._removed(old)
+            self._added(value)
+
+    def replace(self, old: Product, new: Product) -> None:
+        """
+        Replaces a product object in place, keeping its position.
+        """
+        index = self.position(old)
+        super().__setitem__(index, new)
+        if self._positions is not None:
+            del self._positions[id(old)]
+            self._positions[id(new)] = index
+        self._removed(old)
+        self._added(new)
+
+    def __delitem__(self, key: Any) -> None:
+        old = self[key]
+        super().__delitem__(key)
+        self._positions = None
+        for product in old if isinstance(key, slice) else [old]:
+            self._removed(product)
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._positions = None
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._positions = None
+
+    def __iadd__(self, products: Iterable[Product]) -> "ProductList":
+        self.extend(products)
+        return self
+
+    def __imul__(self, n: int) -> "ProductList":
+        if n <= 0:
+            self.clear()
+        else:
+            self.extend(list(self) * (n - 1))
+        return self
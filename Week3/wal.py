@@ -0,0 +1,261 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import IO, Dict, Iterable, Optional
+
+from .core import Inventory
+from .ingest import build_product
+from .models import Product
+from .records import to_record
+
+# Records appended since the last compaction before the log compacts itself
+DEFAULT_COMPACT_EVERY = 10_000
+
+PUT = "put"
+DELETE = "del"
+
+
+class WriteAheadLog:
+    """
+    Append-only log of product changes made to an in-memory Inventory, so
+    they survive a restart without rewriting a whole file per change.
+
+    Each change is one JSON line: a "put" with the product's values, or a
+    "del" with a product_id. Callers write the records with `log_put` or
+    `log_delete` before applying the change, under the inventory's write
+    lock so the log order matches the inventory, then call `sync` after
+    releasing it. `sync` uses group commit: one thread fsyncs everything
+    written so far while the others wait, and a waiter whose records that
+    fsync covered returns without one of its own, so concurrent requests
+    share their fsyncs.
+
+    Only the last record per product_id matters, so after `compact_every`
+    appends the log is rewritten as a snapshot holding that one record per
+    product, written to a temporary file, fsynced and renamed over the log.
+    A crash during compaction leaves either the old log or the snapshot,
+    and both replay to the same products. `replay` applies the logged
+    changes to an inventory on startup, typically after loading its base
+    data, such as the source CSV. A torn last line, left by a crash while
+    appending, is dropped when the log is opened.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+        fsync: bool = True,
+    ):
+        """
+        Opens the log, creating it if needed, and reads its records.
+
+        Args:
+        - path (str): Path to the log file.
+        - compact_every (int): Appended records after which `sync`
+          compacts the log.
+        - fsync (bool): Force writes to disk in `sync` and `compact`; turn
+          off only where losing recent changes on a crash is acceptable.
+        """
+        self.path = path
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._mutex = threading.Lock()
+        # Held by the thread syncing or compacting; others wait on it
+        self._sync_lock = threading.Lock()
+        # Latest record line per product_id, the snapshot `compact` writes
+        self._lines: Dict[int, str] = {}
+        self._appended = 0
+        self._written = 0
+        self._synced = 0
+        self._encode = json.JSONEncoder(
+            default=datetime.isoformat, ensure_ascii=False
+        ).encode
+        unterminated = self._read()
+        self._file: IO[str] = open(path, "a", encoding="utf-8")
+        if unterminated:
+            self._file.write("\n")
+
+    def __enter__(self) -> "WriteAheadLog":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of products with a record in the log.
+        """
+        return len(self._lines)
+
+    def log_put(self, products: Iterable[Product]) -> int:
+        """
+        Writes a "put" record for each product, without waiting for disk.
+
+        Returns:
+        - int: The ticket to pass to `sync`.
+        """
+        lines = {}
+        for product in products:
+            values = {k: v for k, v in product.__dict__.items() if v is not None}
+            lines[product.product_id] = self._encode({"op": PUT, "product": values})
+        return self._append(lines)
+
+    def log_delete(self, product_ids: Iterable[int]) -> int:
+        """
+        Writes a "del" record for each product_id, without waiting for disk.
+
+        Returns:
+        - int: The ticket to pass to `sync`.
+        """
+        return self._append(
+            {
+                pid: self._encode({"op": DELETE, "product_id": pid})
+                for pid in product_ids
+            }
+        )
+
+    def sync(self, ticket: Optional[int] = None) -> None:
+        """
+        Waits until the records written up to `ticket` (default: all) are
+        on disk, then compacts the log if `compact_every` records were
+        appended since the last compaction.
+        """
+        if ticket is None:
+            ticket = self._written
+        if ticket > self._synced:
+            with self._sync_lock:
+                if ticket > self._synced:
+                    with self._mutex:
+                        self._file.flush()
+                        written, fd = self._written, self._file.fileno()
+                    if self.fsync:
+                        os.fsync(fd)
+                    self._synced = written
+        if self._appended >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Rewrites the log as one record per product_id, replacing it
+        atomically.
+        """
+        with self._sync_lock, self._mutex:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(f"{line}\n" for line in self._lines.values())
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self._file.close()
+            os.replace(tmp, self.path)
+            if self.fsync:
+                _fsync_directory(self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._appended = 0
+            self._synced = self._written
+        logging.info(f"Compacted '{self.path}' to {len(self._lines)} records.")
+
+    def replay(self, inventory: Inventory) -> dict:
+        """
+        Applies the logged changes to the inventory under its write lock.
+        Products are validated again; records that no longer validate are
+        logged and skipped.
+
+        Returns:
+        - dict: Counts of products put, deleted and rejected.
+        """
+        counts = {"put": 0, "deleted": 0, "rejected": 0}
+        with inventory.lock.writing():
+            for product_id, line in self._lines.items():
+                record = json.loads(line)
+                if record["op"] == DELETE:
+                    inventory.remove(product_id)
+                    counts["deleted"] += 1
+                    continue
+                try:
+                    product = build_product(record["product"])
+                except Exception as e:
+                    logging.error(
+                        f"Logged product {product_id} in '{self.path}' "
+                        f"skipped due to invalid data: {e}"
+                    )
+                    counts["rejected"] += 1
+                    continue
+                inventory.upsert(to_record(product) if inventory.compact else product)
+                counts["put"] += 1
+        logging.info(
+            f"Replayed '{self.path}': {counts['put']} put, "
+            f"{counts['deleted']} deleted, {counts['rejected']} rejected."
+        )
+        return counts
+
+    def close(self) -> None:
+        """
+        Syncs outstanding records and closes the log file.
+        """
+        self.sync()
+        with self._mutex:
+            self._file.close()
+
+    def _append(self, lines: Dict[int, str]) -> int:
+        if not lines:
+            return self._written
+        data = "".join(f"{line}\n" for line in lines.values())
+        with self._mutex:
+            self._file.write(data)
+            self._lines.update(lines)
+            self._appended += len(lines)
+            self._written += 1
+            return self._written
+
+    def _read(self) -> bool:
+        """
+        Reads the existing log into `_lines`, truncating a torn last line.
+        Returns True if a complete last record lacks its line break.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        with f:
+            data = f.read()
+        offset = 0
+        for raw in data.splitlines(keepends=True):
+            try:
+                line = raw.decode("utf-8").rstrip("\n")
+                record = json.loads(line)
+                if record["op"] == PUT:
+                    product_id = int(record["product"]["product_id"])
+                else:
+                    product_id = int(record["product_id"])
+            except (ValueError, KeyError, TypeError) as e:
+                if offset + len(raw) == len(data):
+                    logging.warning(
+                        f"Dropping the incomplete last record of '{self.path}'."
+                    )
+                    os.truncate(self.path, offset)
+                    return False
+                logging.error(f"Skipping unreadable record in '{self.path}': {e}")
+            else:
+                self._lines[product_id] = line
+                self._appended += 1
+            offset += len(raw)
+        return not data.endswith(b"\n") if data else False
+
+
+def _fsync_directory(path: str) -> None:
+    """
+    Forces a rename in the directory holding `path` to disk, where the
+    platform allows opening directories.
+    """
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -1,6 +1,7 @@
 # tests/conftest.py
 
 from datetime import datetime, timedelta
+from typing import Any, Callable
 
 import pytest
 
@@ -88,6 +89,62 @@ def book_product() -> BookProduct:
     )
 
 
+# ----------------------------
+# Product Factories
+# ----------------------------
+
+
+@pytest.fixture
+def make_product() -> Callable[..., Product]:
+    """
+    Provides a factory of generic Products for tests needing many of them.
+
+    Returns:
+        Callable: `make_product(product_id, **fields)` returns a Product
+        named "Item <id>", category "office", quantity 5, price 2.0,
+        with `fields` overriding any of them.
+    """
+
+    def make(product_id: int, **fields: Any) -> Product:
+        values = {
+            "product_name": f"Item {product_id}",
+            "category": "office",
+            "quantity": 5,
+            "price": 2.0,
+            **fields,
+        }
+        return Product(product_id=product_id, **values)
+
+    return make
+
+
+@pytest.fixture
+def make_food() -> Callable[..., FoodProduct]:
+    """
+    Provides a factory of FoodProducts expiring at a chosen time.
+
+    Returns:
+        Callable: `make_food(product_id, expires_in, **fields)` returns a
+        FoodProduct named "Yogurt", quantity 4, price 3.0, made 30 days
+        ago and expiring `expires_in` (a timedelta) from now, with
+        `fields` overriding any of them.
+    """
+
+    def make(product_id: int, expires_in: timedelta, **fields: Any) -> FoodProduct:
+        today = datetime.now()
+        values = {
+            "product_name": "Yogurt",
+            "quantity": 4,
+            "price": 3.0,
+            "mfg_date": today - timedelta(days=30),
+            "expiry_date": today + expires_in,
+            **fields,
+        }
+        return FoodProduct(product_id=product_id, **values)
+
+    return make
+
+
 # ----------------------------
 # Inventory Fixture
 # ----------------------------
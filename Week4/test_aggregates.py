@@ -0,0 +1,176 @@
+from datetime import timedelta
+from typing import Callable
+
+import pytest
+
+from Week3.aggregates import InventoryAggregates
+from Week3.core import Inventory
+from Week3.models import FoodProduct, Product
+
+# ----------------------------
+# Running Totals Tests
+# ----------------------------
+
+
+def test_totals_follow_list_changes(
+    inventory_with_products: Inventory, make_product: Callable[..., Product]
+) -> None:
+    """Appends, upserts and removals update totals without rescanning."""
+    inv = inventory_with_products
+    assert inv.get_total_inventory() == pytest.approx(7750.0)
+
+    inv.upsert(make_product(5, quantity=10, price=1.5))
+    inv.upsert(make_product(1, quantity=1, price=5.0))
+    inv.remove(3)
+
+    summary = inv.get_summary()
+    assert summary["total_products"] == 4
+    assert summary["total_quantity"] == 23
+    assert summary["total_value"] == pytest.approx(5720.0)
+    assert inv.get_total_inventory() == pytest.approx(5720.0)
+
+
+def test_highest_sale_recomputed_after_removal(
+    inventory_with_products: Inventory,
+) -> None:
+    """Removing the top product promotes the next highest one."""
+    inv = inventory_with_products
+    assert inv.get_summary()["hs_name"] == "Clean Code"
+    inv.remove(4)
+    assert inv.get_summary()["hs_name"] == "Phone"
+    inv.products.clear()
+    assert inv.get_summary()["hs_name"] == "N/A"
+
+
+def test_attribute_assignment_is_tracked(inventory_with_products: Inventory) -> None:
+    """Assigning a field of a contained product updates the aggregates."""
+    inv = inventory_with_products
+    inv.get(1).quantity = 2000
+    assert inv.get_total_inventory() == pytest.approx(17700.0)
+    assert inv.get_summary()["hs_name"] == "Pen"
+
+
+# ----------------------------
+# Expiry and Category Tests
+# ----------------------------
+
+
+def test_expired_food_leaves_valid_totals(
+    make_food: Callable[..., FoodProduct],
+) -> None:
+    """Expired food drops out of valid totals but still counts in all."""
+    aggregates = InventoryAggregates()
+    stale = make_food(1, timedelta(days=3))
+    aggregates.add(stale)
+    aggregates.add(make_food(2, timedelta(days=10)))
+
+    aggregates.expire(stale)
+    aggregates.expire(stale)
+    assert aggregates.valid.count == 1
+    assert aggregates.all.count == 2
+    assert aggregates.highest_sale().product_id == 2
+
+    aggregates.discard(stale)
+    assert aggregates.all.count == 1
+    assert aggregates.valid.count == 1
+
+
+def test_category_breakdown(
+    inventory_with_products: Inventory,
+    make_product: Callable[..., Product],
+    make_food: Callable[..., FoodProduct],
+) -> None:
+    """Categories are grouped case-insensitively and expired food is excluded."""
+    inv = inventory_with_products
+    inv.upsert(make_product(5, quantity=2, price=1.0))
+    inv.upsert(make_food(6, timedelta(days=-1)))
+
+    breakdown = inv.get_category_breakdown()
+    assert breakdown["office"] == {"count": 1, "quantity": 2, "value": 2.0}
+    assert breakdown["food"] == {"count": 1, "quantity": 5, "value": 100.0}
+    assert set(breakdown) == {"stationery", "food", "electronic", "book", "office"}
+
+    inv.remove(5)
+    assert "office" not in inv.get_category_breakdown()
+
+
+# ----------------------------
+# Batch and Notification Tests
+# ----------------------------
+
+
+def test_extend_matches_appending_one_by_one(
+    inventory_with_products: Inventory,
+    make_product: Callable[..., Product],
+    make_food: Callable[..., FoodProduct],
+) -> None:
+    """Indexes and totals built from one batch equal those built per product."""
+    batch = list(inventory_with_products.products)
+    batch += [
+        make_product(5, price=1.5),
+        make_food(6, timedelta(days=1)),
+        make_product(7),
+    ]
+    batch[-1].category = "office "
+
+    one_by_one, batched = Inventory(), Inventory()
+    for product in batch:
+        one_by_one.products.append(product)
+    batched.products.extend(batch)
+
+    assert batched.get_summary() == one_by_one.get_summary()
+    assert batched.get_category_breakdown() == one_by_one.get_category_breakdown()
+    assert batched.low_stock(10) == one_by_one.low_stock(10)
+    assert batched.next_expiry() == one_by_one.next_expiry()
+    assert batched.get(7) is batch[-1]
+
+
+def test_assignment_notifies_listeners_reading_the_field(
+    inventory_with_products: Inventory,
+) -> None:
+    """Listeners declaring `fields` hear only about assignments to those."""
+    seen = []
+
+    class QuantityListener:
+        fields = frozenset({"quantity"})
+
+        def add(self, product: Product) -> None:
+            seen.append(("add", product.product_id))
+
+        def discard(self, product: Product) -> None:
+            seen.append(("discard", product.product_id))
+
+        def clear(self) -> None:
+            seen.append("clear")
+
+    inv = inventory_with_products
+    inv.products.add_listener(QuantityListener())
+    seen.clear()
+
+    pen = inv.get(1)
+    pen.product_name = "Fountain Pen"
+    assert seen == []
+    pen.quantity = 3
+    assert seen == [("discard", 1), ("add", 1)]
+    assert inv.get_total_inventory() == pytest.approx(7715.0)
+
+
+def test_expired_food_stays_out_after_field_changes(
+    inventory_with_products: Inventory, make_food: Callable[..., FoodProduct]
+) -> None:
+    """Assigning to an expired product does not bring it back into valid totals."""
+    inv = inventory_with_products
+    inv.upsert(make_food(5, timedelta(days=-1), quantity=2, price=5000.0))
+    summary = inv.get_summary()
+    low = inv.low_stock(10)
+    breakdown = inv.get_category_breakdown()
+
+    stale = inv.get(5)
+    stale.quantity = 1
+    stale.price = 9000.0
+    stale.category = "dairy"
+
+    assert inv.get_summary() == summary
+    assert inv.low_stock(10) == low
+    assert inv.get_category_breakdown() == breakdown
+    assert [p.product_id for p in inv.get_expired_products()] == [5]
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from Week3.aggregates import analyze_products
+from Week3.core import Inventory
+from Week3.datagen import write_dataset
+from Week3.models import FoodProduct, Product
+
+# ----------------------------
+# Analytics Tests
+# ----------------------------
+
+
+def test_category_stats_and_ranking(make_product: Callable[..., Product]) -> None:
+    """Categories carry totals and price bounds, highest value first."""
+    products = [
+        make_product(1, category="Office", quantity=2, price=5.0),
+        make_product(2, category="office ", quantity=1, price=50.0),
+        make_product(3, category="Garden", quantity=10, price=20.0),
+        make_product(4, category=None, quantity=3, price=1.0),
+    ]
+    analytics = analyze_products(products)
+    assert list(analytics["categories"]) == ["garden", "office", ""]
+    assert analytics["categories"]["office"] == {
+        "count": 2,
+        "quantity": 3,
+        "value": 60.0,
+        "min_price": 5.0,
+        "max_price": 50.0,
+    }
+
+
+def test_top_products_are_bounded_and_stable(
+    make_product: Callable[..., Product],
+) -> None:
+    """Only top_n products are kept, with earlier products winning ties."""
+    products = [
+        make_product(i, category="Office", quantity=1, price=float(i % 4 + 1))
+        for i in range(1, 13)
+    ]
+    top = analyze_products(products, top_n=4)["top_products"]
+    assert [p.product_id for p in top] == [3, 7, 11, 2]
+    assert analyze_products(products, top_n=0)["top_products"] == []
+    with pytest.raises(ValueError):
+        analyze_products(products, top_n=-1)
+
+
+def test_expired_food_is_excluded(
+    make_product: Callable[..., Product], make_food: Callable[..., FoodProduct]
+) -> None:
+    """Expired food counts in neither the categories nor the top products."""
+    expired = make_food(9, timedelta(days=-1), quantity=100, price=100.0)
+    analytics = analyze_products(
+        [expired, make_product(1, category="Office", quantity=1, price=1.0)]
+    )
+    assert list(analytics["categories"]) == ["office"]
+    assert [p.product_id for p in analytics["top_products"]] == [1]
+
+
+def test_inventory_analytics_match_aggregates(tmp_path: Path) -> None:
+    """The one-pass analytics agree with the running aggregates."""
+    path = str(tmp_path / "products.csv")
+    write_dataset(path, 500, seed=3)
+    inventory = Inventory()
+    inventory.load_from_csv(path)
+    analytics = inventory.get_analytics(top_n=3)
+    breakdown = inventory.get_category_breakdown()
+    assert set(analytics["categories"]) == set(breakdown)
+    for name, stats in analytics["categories"].items():
+        assert stats["count"] == breakdown[name]["count"]
+        assert stats["value"] == pytest.approx(breakdown[name]["value"])
+    top = analytics["top_products"]
+    assert top[0].product_name == inventory.get_summary()["hs_name"]
+    assert inventory.get_analytics(products=inventory.iter_from_csv(path)) == (
+        inventory.get_analytics()
+    )
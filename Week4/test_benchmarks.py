@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from Week3.benchmarks import (
+    bench_suite,
+    find_limit_violations,
+    find_regressions,
+    load_baseline,
+    main,
+    save_baseline,
+)
+
+BENCHMARKS = {
+    "load_from_csv",
+    "load_from_csv_trusted",
+    "create_product_from_row",
+    "get_summary",
+    "get_total_inventory",
+    "generate_low_stock_report",
+}
+
+
+def test_bench_suite_reports_every_hot_path() -> None:
+    """Each benchmark reports positive throughput, latency or memory."""
+    results = bench_suite(200, min_time=0.001)
+    assert set(results) == BENCHMARKS
+    assert results["load_from_csv"]["rows_per_second"] > 0
+    assert results["load_from_csv"]["peak_mib"] > 0
+    assert results["load_from_csv"]["overhead"] > 0
+    assert results["load_from_csv_trusted"]["speedup"] > 0
+    assert results["get_summary"]["latency_us"] > 0
+    assert all(value > 0 for metrics in results.values() for value in metrics.values())
+
+
+def test_find_regressions_respects_direction_and_tolerance() -> None:
+    """Slower latency and lower throughput beyond the tolerance are reported."""
+    baseline = {"100": {"load": {"rows_per_second": 1000.0, "latency_us": 10.0}}}
+    within = {"100": {"load": {"rows_per_second": 900.0, "latency_us": 11.0}}}
+    assert find_regressions(within, baseline, tolerance=0.25) == []
+
+    worse = {"100": {"load": {"rows_per_second": 500.0, "latency_us": 20.0}}}
+    messages = find_regressions(worse, baseline, tolerance=0.25)
+    assert len(messages) == 2
+    assert messages[0].startswith("load[100] rows_per_second")
+
+    faster = {"100": {"load": {"rows_per_second": 5000.0, "latency_us": 1.0}}}
+    assert find_regressions(faster, baseline) == []
+    assert find_regressions({"999": worse["100"]}, baseline) == []
+
+
+def test_find_limit_violations_skips_small_sizes() -> None:
+    """Limits apply from LIMIT_MIN_ROWS rows, whatever the baseline."""
+    limits = {("load", "overhead"): 1.5}
+    over = {"load": {"overhead": 2.0}}
+    assert find_limit_violations({"100": over}, limits) == []
+    assert find_limit_violations({"10000": {"load": {"overhead": 1.2}}}, limits) == []
+    assert find_limit_violations({"10000": over}, limits) == [
+        "load[10000] overhead: 2.00 exceeds 1.50"
+    ]
+
+
+def test_find_limit_violations_treats_speedup_as_a_minimum() -> None:
+    """A trusted load no faster than the limit over the validated one fails."""
+    limits = {("trusted", "speedup"): 1.3}
+    assert find_limit_violations({"10000": {"trusted": {"speedup": 1.5}}}, limits) == []
+    assert find_limit_violations({"10000": {"trusted": {"speedup": 1.1}}}, limits) == [
+        "trusted[10000] speedup: 1.10 is below 1.30"
+    ]
+
+
+def test_baseline_round_trip_and_cli(tmp_path: Path, capsys) -> None:
+    """The CLI saves a baseline and fails against an impossibly fast one."""
+    path = str(tmp_path / "baseline.json")
+    assert main(["--suite", "--sizes", "100", "--save-baseline", path]) == 0
+    results = load_baseline(path)
+    assert set(results["100"]) == BENCHMARKS
+
+    results["100"]["load_from_csv"]["rows_per_second"] *= 1000
+    save_baseline(path, results)
+    assert main(["--suite", "--sizes", "100", "--baseline", path]) == 1
+    assert "REGRESSION load_from_csv[100] rows_per_second" in capsys.readouterr().out
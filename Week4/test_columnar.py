@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from Week3 import columnar
+from Week3.core import Inventory
+from Week3.models import FoodProduct, Product
+
+# ----------------------------
+# Fixtures
+# ----------------------------
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch) -> str:
+    """
+    Runs a test against both the NumPy and the pure `array` code paths.
+    """
+    if request.param == "array":
+        monkeypatch.setattr(columnar, "np", None)
+    elif columnar.np is None:
+        pytest.skip("numpy is not installed")
+    return request.param
+
+
+@pytest.fixture
+def expired_food() -> FoodProduct:
+    """Provides a FoodProduct that expired yesterday."""
+    return FoodProduct(
+        product_id=20,
+        product_name="Old Cheese",
+        quantity=100,
+        price=500.0,
+        mfg_date=datetime.now() - timedelta(days=10),
+        expiry_date=datetime.now() - timedelta(days=1),
+    )
+
+
+def _columnar_copy(inventory: Inventory) -> Inventory:
+    """Builds a columnar inventory holding the same products."""
+    inv = Inventory(columnar=True)
+    inv.products.extend(inventory.products)
+    return inv
+
+
+# ----------------------------
+# Aggregate Tests
+# ----------------------------
+
+
+def test_columnar_total_matches_list(backend, inventory_with_products) -> None:
+    """Columnar total value equals the list-based total."""
+    inv = _columnar_copy(inventory_with_products)
+    assert inv.get_total_inventory() == pytest.approx(
+        inventory_with_products.get_total_inventory()
+    )
+
+
+def test_columnar_summary_matches_list(
+    backend, inventory_with_products, expired_food
+) -> None:
+    """Columnar summary equals the list summary and skips expired food."""
+    inventory_with_products.products.append(expired_food)
+    inv = _columnar_copy(inventory_with_products)
+
+    summary = inv.get_summary()
+    expected = inventory_with_products.get_summary()
+
+    assert summary["total_products"] == expected["total_products"] == 4
+    assert summary["total_quantity"] == expected["total_quantity"]
+    assert summary["total_value"] == pytest.approx(expected["total_value"])
+    assert summary["hs_name"] == expected["hs_name"] == "Clean Code"
+    assert summary["hs_amt"] == pytest.approx(expected["hs_amt"])
+
+
+def test_columnar_summary_empty(backend, caplog: pytest.LogCaptureFixture) -> None:
+    """An empty columnar inventory returns the zero summary."""
+    inv = Inventory(columnar=True)
+    with caplog.at_level("WARNING"):
+        summary = inv.get_summary()
+    assert summary["total_products"] == 0
+    assert summary["hs_name"] == "N/A"
+    assert inv.get_total_inventory() == 0.0
+    assert "No valid (non-expired) products" in caplog.text
+
+
+def test_columnar_summary_only_expired(backend, expired_food) -> None:
+    """Only expired food means an empty summary, but it still counts in totals."""
+    inv = Inventory(columnar=True)
+    inv.products.append(expired_food)
+    assert inv.get_summary()["total_products"] == 0
+    assert inv.get_total_inventory() == pytest.approx(50_000.0)
+
+
+def test_columnar_totals_read_the_columns(inventory_with_products, monkeypatch) -> None:
+    """With columnar=True, totals and summaries come from the column store."""
+    inv = _columnar_copy(inventory_with_products)
+    monkeypatch.setattr(inv.columns, "total_value", lambda: 42.0)
+    monkeypatch.setattr(
+        inv.columns, "summarize", lambda now: (1, 2, 3.0, inv.products[0])
+    )
+    assert inv.get_total_inventory() == 42.0
+    summary = inv.get_summary()
+    assert (summary["total_products"], summary["total_value"]) == (1, 3.0)
+    assert summary["hs_name"] == "Pen"
+
+
+# ----------------------------
+# Synchronisation Tests
+# ----------------------------
+
+
+def test_columns_follow_list_mutations(inventory_with_products) -> None:
+    """Replacing, removing and clearing products keeps the columns in sync."""
+    inv = _columnar_copy(inventory_with_products)
+    assert len(inv.columns) == 4
+
+    inv.products[0] = Product(product_id=9, product_name="Bag", quantity=1, price=3.0)
+    removed = inv.products.pop(1)
+    del inv.products[-1:]
+    inv.products.remove(inv.products[0])
+
+    assert removed.product_name == "Milk"
+    assert list(inv.columns.product_ids) == [3]
+    assert inv.get_total_inventory() == pytest.approx(2000.0)
+
+    inv.products.clear()
+    assert len(inv.columns) == 0
+    assert inv.get_total_inventory() == 0.0
+
+
+def test_assigning_products_rebuilds_columns(sample_product, book_product) -> None:
+    """Assigning a new list to `products` re-populates the columns."""
+    inv = Inventory(columnar=True)
+    inv.products = [sample_product, book_product]
+    assert isinstance(inv.products, list)
+    assert sorted(inv.columns.product_ids) == [1, 4]
+    assert inv.get_total_inventory() == pytest.approx(5650.0)
+
+
+def test_columnar_category_codes(inventory_with_products) -> None:
+    """Categories are encoded case-insensitively with a shared table."""
+    inv = _columnar_copy(inventory_with_products)
+    inv.products.append(
+        Product(
+            product_id=8,
+            product_name="Ink",
+            category="Stationery",
+            quantity=1,
+            price=1.0,
+        )
+    )
+    codes = list(inv.columns.category_codes)
+    assert codes[0] == codes[-1]
+    assert inv.columns.categories[codes[1]] == "food"
+
+
+def test_columnar_load_from_csv(tmp_path) -> None:
+    """CSV loading fills the columns alongside the product models."""
+    file_path = tmp_path / "products.csv"
+    file_path.write_text(
+        "product_id,product_name,category,quantity,price\n"
+        "1,Pen,stationery,10,5.0\n"
+        "2,Pencil,stationery,bad,5.0\n"
+        "3,Marker,stationery,2,15.0\n"
+    )
+    inv = Inventory(columnar=True)
+    inv.load_from_csv(str(file_path))
+    assert [p.product_id for p in inv.products] == [1, 3]
+    assert list(inv.columns.quantities) == [10, 2]
+    assert inv.get_total_inventory() == pytest.approx(80.0)
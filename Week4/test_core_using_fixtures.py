@@ -356,8 +356,101 @@ def test_food_product_with_valid_dates_in_summary() -> None:
 def test_summary_max_raises_error(
     caplog: pytest.LogCaptureFixture, inventory_with_products: Inventory
 ) -> None:
-    """Test logging error if max() fails while calculating highest sale."""
-    with patch("builtins.max", side_effect=Exception("max failed")):
+    """Test logging error if the highest sale lookup fails."""
+    with patch(
+        "Week3.aggregates.InventoryAggregates.highest_sale",
+        side_effect=Exception("max failed"),
+    ):
         with caplog.at_level("ERROR"):
             inventory_with_products.get_summary()
     assert "Error calculating highest sale" in caplog.text
+
+
+# ----------------------------
+# Streaming Tests
+# ----------------------------
+
+
+def _write_stream_csv(tmp_path: Path) -> Path:
+    """Write a small mixed CSV (one invalid row) for streaming tests."""
+    file_path = tmp_path / "stream.csv"
+    future = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+    file_path.write_text(
+        "product_id,product_name,quantity,price,category,mfg_date,expiry_date\n"
+        "1,Pen,5,10.0,,,\n"
+        "2,Pencil,bad,5.0,,,\n"
+        "3,Milk,4,50.0,food,2024-01-01,2024-02-01\n"
+        f"4,Cheese,2,300.0,food,2024-01-01,{future}\n"
+        "5,Stapler,20,15.0,,,\n"
+    )
+    return file_path
+
+
+def test_iter_from_csv_is_lazy(tmp_path: Path) -> None:
+    """iter_from_csv yields products one by one without filling inventory."""
+    inv = Inventory()
+    stream = inv.iter_from_csv(str(_write_stream_csv(tmp_path)))
+    first = next(stream)
+    assert first.product_name == "Pen"
+    assert inv.products == []
+    assert [p.product_id for p in stream] == [3, 4, 5]
+
+
+def test_iter_from_csv_logs_skipped_rows(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Invalid rows are logged with their row number while streaming."""
+    inv = Inventory()
+    with caplog.at_level("WARNING"):
+        list(inv.iter_from_csv(str(_write_stream_csv(tmp_path))))
+    assert "Row 3 skipped due to invalid data." in caplog.text
+
+
+def test_iter_from_csv_missing_file(caplog: pytest.LogCaptureFixture) -> None:
+    """A missing file logs an error and yields nothing."""
+    inv = Inventory()
+    with caplog.at_level("ERROR"):
+        assert list(inv.iter_from_csv("missing.csv")) == []
+    assert "not found" in caplog.text
+
+
+def test_streaming_summary_matches_loaded_summary(tmp_path: Path) -> None:
+    """Summarizing a stream gives the same result as loading then summarizing."""
+    file_path = str(_write_stream_csv(tmp_path))
+    loaded = Inventory()
+    loaded.load_from_csv(file_path)
+
+    streaming = Inventory()
+    summary = streaming.get_summary(streaming.iter_from_csv(file_path))
+
+    assert summary == loaded.get_summary()
+    assert summary["total_products"] == 3
+    assert summary["hs_name"] == "Cheese"
+    assert streaming.products == []
+
+
+def test_streaming_summary_empty(caplog: pytest.LogCaptureFixture) -> None:
+    """An empty stream produces the zero summary and a warning."""
+    inv = Inventory()
+    with caplog.at_level("WARNING"):
+        summary = inv.get_summary(iter([]))
+    assert summary["total_products"] == 0
+    assert summary["hs_name"] == "N/A"
+    assert "No valid (non-expired) products" in caplog.text
+
+
+def test_streaming_low_stock_report(tmp_path: Path) -> None:
+    """The low stock report can be written straight from a CSV stream."""
+    inv = Inventory()
+    report = tmp_path / "report.txt"
+    inv.generate_low_stock_report(
+        threshold=10,
+        output_file=str(report),
+        products=inv.iter_from_csv(str(_write_stream_csv(tmp_path))),
+    )
+    content = report.read_text()
+    assert "Pen: 5" in content
+    assert "Cheese: 2" in content
+    assert "Milk" not in content
+    assert "Stapler" not in content
+    assert inv.products == []
@@ -0,0 +1,103 @@
+import csv
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from Week3.core import Inventory
+from Week3.datagen import generate_rows, parse_mix, write_dataset
+from Week3.formats import COLUMNS
+from Week3.models import FoodProduct
+
+# ----------------------------
+# Generator Tests
+# ----------------------------
+
+
+def test_same_seed_reproduces_rows() -> None:
+    """Rows depend only on the arguments, so fixtures need not be stored."""
+    assert list(generate_rows(50, seed=7)) == list(generate_rows(50, seed=7))
+    assert list(generate_rows(50, seed=7)) != list(generate_rows(50, seed=8))
+
+
+def test_category_mix_and_date_range() -> None:
+    """Only weighted categories appear, dated within the requested range."""
+    start, end = date(2022, 1, 1), date(2022, 12, 31)
+    rows = [
+        dict(zip(COLUMNS, row))
+        for row in generate_rows(
+            300, category_mix={"food": 1, "book": 1}, start=start, end=end
+        )
+    ]
+    assert {row["category"] for row in rows} == {"food", "book"}
+    for row in rows:
+        if row["category"] == "food":
+            made = date.fromisoformat(row["mfg_date"])
+            assert start <= made <= end
+            assert date.fromisoformat(row["expiry_date"]) > made
+        else:
+            assert 1950 <= int(row["publication_year"]) <= 2022
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"category_mix": {"toys": 1}}, {"invalid_rate": 2}, {"end": date(2000, 1, 1)}],
+    ids=["unknown-category", "rate", "dates"],
+)
+def test_generate_rows_rejects_bad_options(options: dict) -> None:
+    """Unknown categories, rates outside [0, 1] and reversed ranges fail."""
+    with pytest.raises(ValueError):
+        next(generate_rows(1, **options))
+
+
+def test_parse_mix() -> None:
+    """The "general" weight is for products without a category."""
+    assert parse_mix("food=3, general=1") == {"food": 3.0, "": 1.0}
+
+
+# ----------------------------
+# Loading Generated Data
+# ----------------------------
+
+
+@pytest.mark.parametrize("rate, rejected", [(0.0, 0), (1.0, 200)])
+def test_generated_csv_loads(tmp_path: Path, rate: float, rejected: int) -> None:
+    """Valid rows all load and invalid rows are all rejected."""
+    path = str(tmp_path / "products.csv")
+    write_dataset(path, 200, seed=1, invalid_rate=rate)
+    summary = Inventory().load_from_csv(path)
+    assert summary["rejected"] == rejected
+    assert summary["loaded"] == 200 - rejected
+
+
+def test_invalid_rate_controls_rejections(tmp_path: Path) -> None:
+    """Roughly the requested fraction of rows is rejected, in every way."""
+    path = str(tmp_path / "products.csv")
+    write_dataset(path, 2_000, seed=2, invalid_rate=0.1)
+    summary = Inventory().load_from_csv(path)
+    assert 120 < summary["rejected"] < 280
+    assert set(summary["by_type"]) == {"type", "validation"}
+    assert summary["by_field"]["price"] > 0
+
+
+def test_food_only_dataset(tmp_path: Path) -> None:
+    """A single-category mix builds only that product class."""
+    path = str(tmp_path / "food.csv")
+    write_dataset(path, 30, category_mix={"food": 1})
+    inventory = Inventory()
+    inventory.load_from_csv(path)
+    assert all(isinstance(p, FoodProduct) for p in inventory.products)
+
+
+def test_jsonl_matches_csv(tmp_path: Path) -> None:
+    """JSON Lines output holds the same rows under the CSV column names."""
+    csv_path, jsonl_path = str(tmp_path / "p.csv"), str(tmp_path / "p.jsonl")
+    write_dataset(csv_path, 25, seed=4)
+    write_dataset(jsonl_path, 25, seed=4)
+    with open(csv_path, newline="") as f:
+        csv_rows = list(csv.DictReader(f))
+    with open(jsonl_path) as f:
+        json_rows = [json.loads(line) for line in f]
+    assert list(json_rows[0]) == list(COLUMNS)
+    assert json_rows == csv_rows
@@ -0,0 +1,196 @@
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from Week3.core import Inventory
+from Week3.datagen import write_dataset
+from Week3.formats import ProductTable, iter_table_rows, scan_arrow
+from Week3.ingest import build_product
+from Week3.models import ElectronicProduct
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+needs_pyarrow = pytest.mark.skipif(pa is None, reason="needs pyarrow")
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+
+@pytest.fixture
+def loaded(tmp_path: Path) -> Inventory:
+    """An inventory of 60 synthetic products across every category."""
+    csv_file = str(tmp_path / "products.csv")
+    write_dataset(csv_file, 60)
+    inventory = Inventory()
+    inventory.load_from_csv(csv_file)
+    return inventory
+
+
+def _edge_case_table() -> "pa.Table":
+    """Rows breaking each model rule once, plus a valid row of each kind."""
+    day = datetime(2024, 1, 1)
+    rows = [
+        {"product_id": 1, "product_name": "Pen", "quantity": 1, "price": 1.0},
+        {"product_id": 0, "product_name": "Pen", "quantity": 1, "price": 1.0},
+        {"product_id": 2, "product_name": "Pe", "quantity": 1, "price": 1.0},
+        {"product_id": 3, "product_name": "P" * 51, "quantity": 1, "price": 1.0},
+        {"product_id": 4, "product_name": "Pen", "quantity": -1, "price": 1.0},
+        {"product_id": 5, "product_name": "Pen", "quantity": 1, "price": 0.0},
+        {"product_id": 6, "product_name": "Pen", "quantity": None, "price": 1.0},
+        {"product_id": 1, "product_name": "Duplicate", "quantity": 1, "price": 1.0},
+        {"product_id": 7, "product_name": "Milk", "quantity": 1, "price": 2.0}
+        | {"category": "Food", "mfg_date": day, "expiry_date": day + timedelta(1)},
+        {"product_id": 8, "product_name": "Milk", "quantity": 1, "price": 2.0}
+        | {"category": "food", "mfg_date": day, "expiry_date": day},
+        {"product_id": 9, "product_name": "Milk", "quantity": 1, "price": 2.0}
+        | {"category": "food", "expiry_date": day},
+        {"product_id": 10, "product_name": "Laptop", "quantity": 1, "price": 9.0}
+        | {"category": "electronic", "purchase_date": day, "warranty_period": 12},
+        {"product_id": 11, "product_name": "Laptop", "quantity": 1, "price": 9.0}
+        | {"category": "electronic", "purchase_date": day, "warranty_period": -1},
+        {"product_id": 12, "product_name": "Primer", "quantity": 1, "price": 3.0}
+        | {"category": "book", "author": "Jane Doe", "publication_year": 2001},
+        {"product_id": 13, "product_name": "Primer", "quantity": 1, "price": 3.0}
+        | {"category": "book", "author": "JD", "publication_year": 2001},
+        {"product_id": 14, "product_name": "Primer", "quantity": 1, "price": 3.0}
+        | {"category": "book", "author": "Jane Doe", "publication_year": 999},
+        {"product_id": 15, "product_name": "Widget", "quantity": 1, "price": 3.0}
+        | {"category": "unknown"},
+    ]
+    columns = dict.fromkeys(name for row in rows for name in row)
+    return pa.Table.from_pylist(
+        [{name: row.get(name) for name in columns} for row in rows]
+    )
+
+
+# ----------------------------
+# Round Trip Tests
+# ----------------------------
+
+
+@pytest.mark.parametrize(
+    "save, load",
+    [
+        ("save_jsonl", "load_from_jsonl"),
+        pytest.param("save_parquet", "load_from_parquet", marks=needs_pyarrow),
+        pytest.param("save_arrow", "load_from_arrow", marks=needs_pyarrow),
+    ],
+)
+def test_file_round_trip(
+    tmp_path: Path, loaded: Inventory, save: str, load: str
+) -> None:
+    """Saved products load back equal, in order, with the same summary."""
+    path = str(tmp_path / "products.out")
+    getattr(loaded, save)(path)
+    restored = Inventory()
+    summary = getattr(restored, load)(path)
+    assert summary["loaded"] == 60
+    assert restored.products == loaded.products
+    assert restored.get_summary() == loaded.get_summary()
+
+
+@needs_pyarrow
+def test_aware_datetimes_round_trip_as_utc(tmp_path: Path) -> None:
+    """Aware datetimes keep their instant through Parquet."""
+    inventory = Inventory()
+    inventory.upsert(
+        ElectronicProduct(
+            product_id=1,
+            product_name="Router",
+            quantity=2,
+            price=40.0,
+            purchase_date=datetime(2025, 3, 1, 9, tzinfo=timezone(timedelta(hours=5))),
+            warranty_period=6,
+        )
+    )
+    path = str(tmp_path / "aware.parquet")
+    inventory.save_parquet(path)
+    restored = Inventory()
+    restored.load_from_parquet(path)
+    assert restored.get(1).purchase_date == inventory.get(1).purchase_date
+
+
+def test_jsonl_rows_validate_like_csv(tmp_path: Path) -> None:
+    """String values, nulls and bad lines behave as their CSV form would."""
+    path = tmp_path / "products.jsonl"
+    lines = [
+        {"product_id": "1", "product_name": "Pen", "quantity": "3", "price": "1.5"},
+        {"product_id": 2, "product_name": "Pencil", "quantity": 4, "price": 0.5}
+        | {"category": None},
+        {"product_id": 3, "product_name": "Milk", "quantity": 1, "price": 2.0}
+        | {"category": "food", "mfg_date": "2024-01-01"},
+        {"product_id": 4, "product_name": "Eraser", "quantity": "abc", "price": 1},
+    ]
+    text = "\n".join(json.dumps(line) for line in lines)
+    path.write_text(f"{text}\n\nnot json\n[1, 2]\n")
+    reject_file = tmp_path / "rejects.csv"
+    inventory = Inventory()
+    summary = inventory.load_from_jsonl(str(path), reject_file=str(reject_file))
+    assert [p.product_id for p in inventory.products] == [1, 2]
+    assert inventory.get(2).category is None
+    assert summary["rejected"] == 4
+    assert summary["by_type"] == {"validation": 1, "type": 3}
+    assert reject_file.read_text().count("\n") == 5
+
+
+@needs_pyarrow
+def test_missing_files_are_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Missing files are logged and load nothing."""
+    inventory = Inventory()
+    with caplog.at_level("ERROR"):
+        inventory.load_from_jsonl("missing.jsonl")
+        inventory.load_from_parquet("missing.parquet")
+    assert "File 'missing.jsonl' not found." in caplog.text
+    assert "File 'missing.parquet' not found." in caplog.text
+
+
+# ----------------------------
+# Columnar Path Tests
+# ----------------------------
+
+
+@needs_pyarrow
+def test_columnar_validation_matches_models() -> None:
+    """The vectorized checks keep exactly the rows the models accept."""
+    table = _edge_case_table()
+    accepted, seen = [], set()
+    for _, row, _ in iter_table_rows(table):
+        try:
+            product = build_product(row)
+        except Exception:
+            continue
+        if product.product_id not in seen:
+            seen.add(product.product_id)
+            accepted.append(product.product_id)
+
+    columns = ProductTable(table)
+    assert columns.product_ids() == accepted == [1, 7, 10, 12, 15]
+    assert columns.rejected == table.num_rows - len(accepted)
+    assert [p.product_id for p in columns.to_products()] == accepted
+
+
+@needs_pyarrow
+def test_columnar_queries_match_inventory(tmp_path: Path, loaded: Inventory) -> None:
+    """Totals, summaries and low stock match the model-based results."""
+    path = str(tmp_path / "products.arrow")
+    loaded.save_arrow(path)
+    columns = scan_arrow(path)
+    assert len(columns) == 60
+    assert columns.total_value() == pytest.approx(loaded.get_total_inventory())
+    summary, expected = columns.summary(), loaded.get_summary()
+    assert summary.pop("total_value") == pytest.approx(expected.pop("total_value"))
+    assert summary == expected
+
+    thresholds = {"book": 30}
+    low = columns.low_stock(10, thresholds)
+    expected_low = loaded.low_stock(10, thresholds)
+    assert sorted(low.product_ids()) == sorted(p.product_id for p in expected_low)
+    assert low.column("quantity").to_pylist() == sorted(
+        p.quantity for p in expected_low
+    )
@@ -0,0 +1,262 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from Week3.core import Inventory
+from Week3.models import FoodProduct, Product
+
+# ----------------------------
+# Lookup Tests
+# ----------------------------
+
+
+def test_get_and_contains(inventory_with_products: Inventory) -> None:
+    """Products can be found by id without scanning the list."""
+    inv = inventory_with_products
+    assert inv.get(3).product_name == "Phone"
+    assert inv.contains(4)
+    assert inv.get(99) is None
+    assert not inv.contains(99)
+
+
+def test_upsert_inserts_then_replaces_in_place(
+    inventory_with_products: Inventory, make_product: Callable[..., Product]
+) -> None:
+    """upsert appends new ids and replaces existing ones at the same position."""
+    inv = inventory_with_products
+    assert inv.upsert(make_product(5, product_name="Stapler")) is None
+    assert inv.products[-1].product_id == 5
+
+    replacement = make_product(2, product_name="Oat Milk", quantity=9)
+    previous = inv.upsert(replacement)
+
+    assert previous.product_name == "Milk"
+    assert inv.products[1] is replacement
+    assert inv.get(2) is replacement
+    assert len(inv.products) == 5
+
+
+def test_remove(
+    inventory_with_products: Inventory, make_product: Callable[..., Product]
+) -> None:
+    """remove drops the product from both the list and the index."""
+    inv = inventory_with_products
+    removed = inv.remove(2)
+    assert removed.product_name == "Milk"
+    assert [p.product_id for p in inv.products] == [1, 3, 4]
+    assert not inv.contains(2)
+    assert inv.remove(2) is None
+
+    inv.upsert(make_product(3, product_name="Tablet"))
+    assert inv.products[1].product_name == "Tablet"
+
+
+def test_index_follows_direct_list_mutation(
+    sample_product: Product, make_product: Callable[..., Product]
+) -> None:
+    """Appending, assigning and clearing `products` keeps the index current."""
+    inv = Inventory()
+    inv.products.append(sample_product)
+    assert inv.get(1) is sample_product
+
+    inv.products = [make_product(7), make_product(8)]
+    assert not inv.contains(1)
+    assert inv.contains(8)
+
+    inv.products.clear()
+    assert inv.get(7) is None
+
+
+def test_index_promotes_shadowed_duplicate(
+    make_product: Callable[..., Product],
+) -> None:
+    """A directly appended duplicate id becomes visible once the first is gone."""
+    inv = Inventory()
+    first = make_product(1, product_name="First")
+    second = make_product(1, product_name="Second")
+    inv.products.extend([first, second])
+    assert inv.get(1) is first
+
+    inv.products.remove(first)
+    assert inv.get(1) is second
+    inv.products.pop()
+    assert not inv.contains(1)
+
+
+def test_position_survives_structural_changes(
+    make_product: Callable[..., Product],
+) -> None:
+    """Positions used by upsert are rebuilt after inserts and deletes."""
+    inv = Inventory()
+    inv.products.extend(make_product(i) for i in range(1, 6))
+    inv.products.insert(0, make_product(10))
+    del inv.products[3]
+
+    replacement = make_product(5, product_name="Last")
+    inv.upsert(replacement)
+    assert inv.products[-1] is replacement
+    assert [p.product_id for p in inv.products] == [10, 1, 2, 4, 5]
+
+
+@pytest.mark.parametrize(
+    "reorder",
+    [
+        lambda products: products.sort(key=lambda p: -p.product_id),
+        lambda products: products.reverse(),
+        lambda products: products.__setitem__(slice(0, 2), products[1::-1]),
+    ],
+    ids=["sort", "reverse", "slice"],
+)
+def test_position_survives_reordering(
+    reorder: Callable[[list], None], make_product: Callable[..., Product]
+) -> None:
+    """Reordering the list in place does not misplace later upserts."""
+    inv = Inventory()
+    inv.products.extend(make_product(i) for i in range(1, 5))
+    reorder(inv.products)
+    before = [p.product_id for p in inv.products]
+
+    replacement = make_product(1, product_name="Replaced")
+    inv.upsert(replacement)
+    assert [p.product_id for p in inv.products] == before
+    assert inv.products[before.index(1)] is replacement
+    assert inv.get(2).product_name == "Item 2"
+
+
+# ----------------------------
+# Duplicate Detection Tests
+# ----------------------------
+
+DUPLICATE_CSV = (
+    "product_id,product_name,category,quantity,price\n"
+    "1,Pen,stationery,10,5.0\n"
+    "2,Pencil,stationery,4,1.0\n"
+    "1,Pen Again,stationery,3,5.0\n"
+    "3,Marker,stationery,2,15.0\n"
+)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_skips_duplicate_ids(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture, workers: int
+) -> None:
+    """Duplicate ids in a file are logged with their row and skipped."""
+    file_path = tmp_path / "products.csv"
+    file_path.write_text(DUPLICATE_CSV)
+    inv = Inventory()
+    with caplog.at_level("WARNING"):
+        inv.load_from_csv(str(file_path), workers=workers)
+
+    assert [p.product_id for p in inv.products] == [1, 2, 3]
+    assert inv.get(1).product_name == "Pen"
+    assert "Duplicate product_id 1 in row 4" in caplog.text
+    assert "Row 4 skipped due to invalid data." in caplog.text
+
+
+def test_load_skips_ids_already_in_inventory(
+    tmp_path: Path, make_product: Callable[..., Product]
+) -> None:
+    """Loading a second file does not duplicate ids that are already loaded."""
+    file_path = tmp_path / "products.csv"
+    file_path.write_text(DUPLICATE_CSV)
+    inv = Inventory()
+    inv.upsert(make_product(2, product_name="Existing"))
+    inv.load_from_csv(str(file_path))
+    assert [p.product_id for p in inv.products] == [2, 1, 3]
+    assert inv.get(2).product_name == "Existing"
+
+
+# ----------------------------
+# Low Stock Index Tests
+# ----------------------------
+
+
+def test_low_stock_orders_by_quantity(inventory_with_products: Inventory) -> None:
+    """low_stock returns products under the threshold, lowest quantity first."""
+    inv = inventory_with_products
+    assert [p.product_name for p in inv.low_stock(6)] == ["Phone", "Milk"]
+    assert inv.low_stock(0) == []
+
+
+def test_low_stock_per_category_thresholds(
+    inventory_with_products: Inventory,
+) -> None:
+    """Category thresholds override the default one, case-insensitively."""
+    inv = inventory_with_products
+    names = [p.product_name for p in inv.low_stock(3, {"Book": 8, "food": 1})]
+    assert names == ["Phone", "Clean Code"]
+
+
+def test_low_stock_follows_changes(
+    inventory_with_products: Inventory, make_product: Callable[..., Product]
+) -> None:
+    """The index tracks upserts, removals and quantity assignments."""
+    inv = inventory_with_products
+    inv.upsert(make_product(5, product_name="Stapler", quantity=0))
+    inv.remove(3)
+    inv.get(1).quantity = 4
+    assert [p.product_name for p in inv.low_stock(6)] == ["Stapler", "Pen", "Milk"]
+
+
+# ----------------------------
+# Expiry Index Tests
+# ----------------------------
+
+
+def test_sweep_moves_food_to_expired_partition(
+    inventory_with_products: Inventory, make_food: Callable[..., FoodProduct]
+) -> None:
+    """A sweep expires only items whose time has passed, once each."""
+    inv = inventory_with_products
+    soon = make_food(5, timedelta(days=1))
+    inv.upsert(soon)
+    assert inv.next_expiry() == soon.expiry_date
+
+    later = datetime.now() + timedelta(days=2)
+    assert inv.sweep_expired(later) == [soon]
+    assert inv.sweep_expired(later) == []
+    assert [p.product_id for p in inv.get_expired_products()] == [5]
+    assert inv.next_expiry() == inv.get(2).expiry_date
+
+    summary = inv.get_summary()
+    assert summary["total_products"] == 4
+    assert soon not in inv.low_stock(10)
+
+
+def test_changed_expiry_is_rescheduled(inventory_with_products: Inventory) -> None:
+    """Moving an expired item's expiry date back into the future revives it."""
+    inv = inventory_with_products
+    milk = inv.get(2)
+    milk.expiry_date = datetime.now() - timedelta(days=1)
+    assert inv.get_expired_products() == [milk]
+    assert milk not in inv.low_stock(10)
+
+    milk.expiry_date = datetime.now() + timedelta(days=3)
+    assert inv.get_expired_products() == []
+    assert milk in inv.low_stock(10)
+    assert inv.get_summary()["total_products"] == 4
+
+
+def test_small_batches_keep_large_indexes_ordered(
+    make_product: Callable[..., Product], make_food: Callable[..., FoodProduct]
+) -> None:
+    """Batches far smaller than the indexes are merged in order item by item."""
+    inv = Inventory()
+    inv.products.extend(
+        make_food(i, timedelta(days=i), quantity=2 * i) for i in range(1, 201)
+    )
+    inv.products.extend(
+        [
+            make_food(201, timedelta(hours=1), quantity=50),
+            make_food(202, timedelta(days=500), quantity=50),
+        ]
+    )
+    inv.products.extend([make_product(203, category="food", quantity=3)])
+
+    low = [p.product_id for p in inv.low_stock(5)]
+    assert low == [1, 203, 2]
+    assert inv.next_expiry() == inv.get(201).expiry_date
+    later = datetime.now() + timedelta(days=1, hours=1)
+    assert [p.product_id for p in inv.sweep_expired(later)] == [201, 1]
@@ -0,0 +1,187 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from Week3.core import Inventory
+from Week3.errors import DEFAULT_MAX_LOGGED, IngestErrorCollector, classify_error
+from Week3.ingest import build_product
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+
+def _write_bad_quantities(tmp_path: Path) -> Path:
+    """Writes 15 rows, all rejected for a quantity that is not a number."""
+    file_path = tmp_path / "bad.csv"
+    file_path.write_text(
+        "product_id,product_name,quantity,price\n"
+        + "".join(f"{i},Item {i},lots,1.0\n" for i in range(1, 16))
+    )
+    return file_path
+
+
+def _write_dirty_csv(tmp_path: Path) -> Path:
+    """
+    Writes 20 rows: every 4th has a bad quantity, every 5th a negative price,
+    and the last repeats product_id 1.
+    """
+    lines = ["product_id,product_name,category,quantity,price\n"]
+    for i in range(1, 20):
+        quantity = "lots" if i % 4 == 0 else str(i)
+        price = "-2.0" if i % 5 == 0 else "3.5"
+        lines.append(f"{i},Item {i},stationery,{quantity},{price}\n")
+    lines.append("1,Copy,stationery,1,1.0\n")
+    file_path = tmp_path / "dirty.csv"
+    file_path.write_text("".join(lines))
+    return file_path
+
+
+# ----------------------------
+# Classification Tests
+# ----------------------------
+
+
+def test_classify_error_names_fields() -> None:
+    """Missing and invalid fields are named; conversion errors name none."""
+    with pytest.raises(KeyError) as missing:
+        build_product({"product_id": "1"})
+    assert classify_error(missing.value) == ("missing_field", ("product_name",))
+
+    with pytest.raises(Exception) as invalid:
+        build_product(
+            {"product_id": "1", "product_name": "Ab", "quantity": "1", "price": "0"}
+        )
+    assert classify_error(invalid.value) == ("validation", ("product_name", "price"))
+
+    assert classify_error(ValueError("bad int")) == ("type", ())
+    assert classify_error(RuntimeError("boom")) == ("unexpected", ())
+
+
+# ----------------------------
+# Load Summary Tests
+# ----------------------------
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_load_returns_error_summary(tmp_path: Path, workers: int) -> None:
+    """The summary counts rows by outcome, error type and field."""
+    summary = Inventory().load_from_csv(
+        str(_write_dirty_csv(tmp_path)), workers=workers
+    )
+    assert summary == {
+        "loaded": 12,
+        "rejected": 8,
+        "by_type": {"type": 4, "validation": 3, "duplicate": 1},
+        "by_field": {"price": 3, "product_id": 1},
+        "reject_file": None,
+    }
+
+
+def test_default_logs_a_bounded_sample(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """By default only the first errors of each type are logged, then a summary."""
+    file_path = _write_bad_quantities(tmp_path)
+    with caplog.at_level("WARNING"):
+        summary = Inventory().load_from_csv(str(file_path))
+
+    assert summary["rejected"] == 15
+    skipped = [m for m in caplog.messages if m.endswith("skipped due to invalid data.")]
+    assert skipped == [
+        f"Row {i} skipped due to invalid data."
+        for i in range(2, 2 + DEFAULT_MAX_LOGGED)
+    ]
+    assert (
+        f"{15 - DEFAULT_MAX_LOGGED} more 'type' row errors were not logged (15 in total)."
+        in caplog.messages
+    )
+
+
+def test_every_skipped_row_is_logged_on_request(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """With max_logged=None, each rejected row gets its "Row N skipped" line."""
+    file_path = _write_bad_quantities(tmp_path)
+    with caplog.at_level("WARNING"):
+        summary = Inventory().load_from_csv(str(file_path), max_logged=None)
+
+    assert summary["rejected"] == 15
+    skipped = [m for m in caplog.messages if m.endswith("skipped due to invalid data.")]
+    assert skipped == [f"Row {i} skipped due to invalid data." for i in range(2, 17)]
+    assert not any("were not logged" in m for m in caplog.messages)
+
+
+def test_errors_are_logged_up_to_the_limit(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Only the first errors of each type are logged, then one summary line."""
+    with caplog.at_level("WARNING"):
+        Inventory().load_from_csv(str(_write_dirty_csv(tmp_path)), max_logged=2)
+
+    type_errors = [m for m in caplog.messages if m.startswith("Type error")]
+    assert len(type_errors) == 2
+    assert "Row 5 skipped due to invalid data." in caplog.messages
+    assert "Row 13 skipped due to invalid data." not in caplog.messages
+    assert "2 more 'type' row errors were not logged (4 in total)." in caplog.messages
+    assert "1 more 'validation' row errors were not logged (3 in total)." in (
+        caplog.messages
+    )
+    assert not any("'duplicate'" in m for m in caplog.messages)
+
+
+# ----------------------------
+# Reject File Tests
+# ----------------------------
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_reject_file_receives_every_bad_row(tmp_path: Path, trusted: bool) -> None:
+    """Rejected rows keep their values and gain row number and error columns."""
+    reject_file = tmp_path / "rejects.csv"
+    Inventory().load_from_csv(
+        str(_write_dirty_csv(tmp_path)),
+        trusted=trusted,
+        reject_file=str(reject_file),
+        max_logged=0,
+    )
+    with open(reject_file, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    rejected = {row["row_number"]: row for row in rows}
+    assert rejected["5"]["quantity"] == "lots"
+    assert rejected["5"]["error_type"] == "type"
+    assert rejected["21"]["error_type"] == "duplicate"
+    assert rejected["21"]["product_name"] == "Copy"
+    if not trusted:
+        assert rejected["6"]["error_fields"] == "price"
+        assert len(rows) == 8
+
+
+def test_parallel_reject_file_matches_sequential(tmp_path: Path) -> None:
+    """Parallel loading writes the same reject file, in file order."""
+    csv_file = str(_write_dirty_csv(tmp_path))
+    sequential, parallel = tmp_path / "seq.csv", tmp_path / "par.csv"
+    Inventory().load_from_csv(csv_file, reject_file=str(sequential))
+    Inventory().load_from_csv(csv_file, workers=3, reject_file=str(parallel))
+    assert parallel.read_text() == sequential.read_text()
+
+
+def test_clean_load_writes_no_reject_file(tmp_path: Path) -> None:
+    """The reject file is only created once a row is rejected."""
+    file_path = tmp_path / "clean.csv"
+    file_path.write_text("product_id,product_name,quantity,price\n1,Pen,2,1.0\n")
+    reject_file = tmp_path / "rejects.csv"
+    summary = Inventory().load_from_csv(str(file_path), reject_file=str(reject_file))
+    assert summary["loaded"] == 1
+    assert summary["rejected"] == 0
+    assert not reject_file.exists()
+
+
+def test_collector_counts_without_loading() -> None:
+    """The collector can be used on its own and summarizes what it saw."""
+    with IngestErrorCollector(max_logged=0) as errors:
+        errors.set_fieldnames(["product_id", "quantity"])
+        errors.reject(2, ["1", "x"], ValueError("bad int"))
+    assert errors.summary()["by_type"] == {"type": 1}
@@ -0,0 +1,102 @@
+import csv
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from Week3.core import Inventory
+from Week3.datagen import generate_rows, write_dataset
+from Week3.formats import COLUMNS
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+
+def _shard(path: Path, rows: List[List[str]]) -> str:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def shards(tmp_path: Path) -> List[str]:
+    """Two warehouses stocking products 1-30 and 21-50, plus one bad row."""
+    east = list(generate_rows(30, seed=1))
+    west = list(generate_rows(30, seed=2, first_id=21))
+    west[0][list(COLUMNS).index("price")] = "free"
+    return [_shard(tmp_path / "east.csv", east), _shard(tmp_path / "west.csv", west)]
+
+
+# ----------------------------
+# Merge Tests
+# ----------------------------
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_error_policy_keeps_first_and_reports(
+    tmp_path: Path, shards: List[str], workers: int
+) -> None:
+    """Later duplicates are rejected into one report naming their file."""
+    reject_file = tmp_path / "rejects.csv"
+    inventory = Inventory()
+    summary = inventory.load_many(shards, workers=workers, reject_file=str(reject_file))
+    assert summary["loaded"] == 50
+    assert summary["by_type"] == {"type": 1, "duplicate": 9}
+    assert summary["by_file"] == {shards[1]: 10}
+    assert summary["merged"] == 0
+    assert [p.product_id for p in inventory.products] == list(range(1, 51))
+
+    with open(reject_file, newline="") as f:
+        rejects = list(csv.DictReader(f))
+    assert {row["source_file"] for row in rejects} == {shards[1]}
+    assert [row["row_number"] for row in rejects][:2] == ["2", "3"]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_last_policy_takes_later_rows(shards: List[str], workers: int) -> None:
+    """Products in both shards come from the later one."""
+    inventory = Inventory()
+    summary = inventory.load_many(shards, workers=workers, on_duplicate="last")
+    west = Inventory()
+    west.load_from_csv(shards[1])
+    assert summary["merged"] == 9
+    assert inventory.get(22) == west.get(22)
+    assert inventory.get(21).product_name.endswith(" 21")
+    assert len(inventory.products) == 50
+
+
+def test_sum_policy_adds_quantities(shards: List[str]) -> None:
+    """Quantities add up; the other fields come from the first row."""
+    east, west = Inventory(), Inventory()
+    east.load_from_csv(shards[0])
+    west.load_from_csv(shards[1])
+    inventory = Inventory(compact=True)
+    inventory.load_many(shards, on_duplicate="sum")
+    total = east.get(25).quantity + west.get(25).quantity
+    assert inventory.get(25).quantity == total
+    assert inventory.get(25).price == east.get(25).price
+    assert inventory.get_total_inventory() == pytest.approx(
+        sum(p.get_total_value() for p in inventory.products)
+    )
+
+
+def test_parallel_merge_matches_sequential(tmp_path: Path) -> None:
+    """The process pool gives the same inventory and counts."""
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / f"shard{i}.csv")
+        write_dataset(path, 400, seed=i, first_id=i * 300 + 1, invalid_rate=0.05)
+        paths.append(path)
+    sequential, parallel = Inventory(), Inventory()
+    expected = sequential.load_many(paths, on_duplicate="sum")
+    assert parallel.load_many(paths, workers=4, on_duplicate="sum") == expected
+    assert parallel.products == sequential.products
+
+
+def test_load_many_rejects_unknown_policy(shards: List[str]) -> None:
+    """Only the documented duplicate policies are accepted."""
+    with pytest.raises(ValueError):
+        Inventory().load_many(shards, on_duplicate="first")
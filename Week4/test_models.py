@@ -10,7 +10,9 @@ from Week3.models import (
     ElectronicProduct,
     FoodProduct,
     Product,
+    parse_datetime,
 )
+from Week3.records import to_record
 
 # =========================================================
 # Product Tests
@@ -184,6 +186,25 @@ def test_electronic_product_zero_warranty() -> None:
     assert product.get_warranty_end_date() == date
 
 
+def test_warranty_end_follows_changes() -> None:
+    """The stored warranty end is refreshed when its inputs change."""
+    product = ElectronicProduct(
+        product_id=5,
+        product_name="Laptop",
+        quantity=1,
+        price=800,
+        purchase_date="2024-01-31",
+        warranty_period=1,
+    )
+    assert product.get_warranty_end_date() == datetime(2024, 2, 29)
+    product.warranty_period = 13
+    assert product.get_warranty_end_date() == datetime(2025, 2, 28)
+    product.purchase_date = datetime(2020, 6, 1)
+    assert product.get_warranty_end_date() == datetime(2021, 7, 1)
+    assert product.model_copy().get_warranty_end_date() == datetime(2021, 7, 1)
+    assert to_record(product).get_warranty_end_date() == datetime(2021, 7, 1)
+
+
 # =========================================================
 # BookProduct Tests
 # =========================================================
@@ -234,6 +255,32 @@ def test_book_product_future_year() -> None:
 # =========================================================
 
 
+def test_date_strings_share_a_parse_cache() -> None:
+    """Repeated date text is parsed once and still validated like datetime."""
+    parse_datetime.cache_clear()
+    for product_id in (1, 2):
+        food = FoodProduct(
+            product_id=product_id,
+            product_name="Milk",
+            quantity=1,
+            price=2.0,
+            mfg_date="2024-03-01",
+            expiry_date="2024-03-01T12:30:00",
+        )
+    assert food.expiry_date == datetime(2024, 3, 1, 12, 30)
+    assert food.get_expiry_timestamp() == food.expiry_date.timestamp()
+    assert parse_datetime.cache_info().hits == 2
+    with pytest.raises(ValidationError, match="mfg_date"):
+        FoodProduct(
+            product_id=3,
+            product_name="Milk",
+            quantity=1,
+            price=2.0,
+            mfg_date="yesterday",
+            expiry_date="2024-03-01",
+        )
+
+
 def test_unregistered_product_category_returns_none() -> None:
     """Unknown product category should return None in PRODUCT_CLASS_MAP."""
     assert PRODUCT_CLASS_MAP.get("furniture") is None
@@ -0,0 +1,164 @@
+from pathlib import Path
+
+import pytest
+
+from Week3.core import Inventory
+from Week3.ingest import csv_byte_ranges, parse_csv_chunk
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+HEADER = (
+    "product_id,product_name,quantity,price,category,"
+    "mfg_date,expiry_date,purchase_date,warranty_period,author,publication_year\n"
+)
+
+
+def _write_large_csv(tmp_path: Path, rows: int = 300) -> Path:
+    """
+    Writes a mixed-category CSV where every 7th row has a bad quantity
+    and every 11th row has a negative price.
+    """
+    lines = [HEADER]
+    for i in range(1, rows + 1):
+        quantity = "bad" if i % 7 == 0 else str(i % 25)
+        price = "-1.0" if i % 11 == 0 else f"{i}.5"
+        kind = i % 4
+        if kind == 0:
+            lines.append(
+                f"{i},Food {i},{quantity},{price},food,2024-01-01,2030-01-01,,,,\n"
+            )
+        elif kind == 1:
+            lines.append(
+                f"{i},Device {i},{quantity},{price},electronic,,,2024-01-01,12,,\n"
+            )
+        elif kind == 2:
+            lines.append(f"{i},Book {i},{quantity},{price},book,,,,,Jane Doe,2001\n")
+        else:
+            lines.append(f"{i},Item {i},{quantity},{price},,,,,,,\n")
+    file_path = tmp_path / "large.csv"
+    file_path.write_text("".join(lines))
+    return file_path
+
+
+def _log_lines(caplog: pytest.LogCaptureFixture) -> list:
+    return [(r.levelname, r.getMessage()) for r in caplog.records]
+
+
+# ----------------------------
+# Chunking Tests
+# ----------------------------
+
+
+def test_byte_ranges_cover_data_on_line_boundaries(tmp_path: Path) -> None:
+    """Ranges are contiguous, start after the header and begin on new lines."""
+    file_path = _write_large_csv(tmp_path)
+    data = file_path.read_bytes()
+    fieldnames, ranges = csv_byte_ranges(str(file_path), 8)
+
+    assert fieldnames[0] == "product_id"
+    assert len(ranges) > 1
+    assert ranges[0][0] == len(HEADER)
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[start - 1] == ord("\n")
+
+
+def test_byte_ranges_header_only(tmp_path: Path) -> None:
+    """A file with only a header has no data ranges."""
+    file_path = tmp_path / "empty.csv"
+    file_path.write_text(HEADER)
+    fieldnames, ranges = csv_byte_ranges(str(file_path), 4)
+    assert fieldnames[0] == "product_id"
+    assert ranges == []
+
+
+def test_parse_csv_chunk_returns_errors_with_offsets(tmp_path: Path) -> None:
+    """A chunk reports valid products and the offsets of invalid rows."""
+    file_path = _write_large_csv(tmp_path, rows=14)
+    fieldnames, ranges = csv_byte_ranges(str(file_path), 1)
+    products, errors, rows = parse_csv_chunk(str(file_path), fieldnames, *ranges[0])
+
+    assert rows == 14
+    assert [offset for offset, _, _ in errors] == [6, 10, 13]
+    assert errors[0][1]["product_id"] == "7"
+    assert isinstance(errors[0][2], ValueError)
+    assert len(products) == 11
+
+
+# ----------------------------
+# Parallel Load Tests
+# ----------------------------
+
+
+def test_parallel_load_matches_sequential(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Parallel loading keeps file order and logs identical row numbers."""
+    file_path = str(_write_large_csv(tmp_path))
+
+    with caplog.at_level("WARNING"):
+        sequential = Inventory()
+        sequential.load_from_csv(file_path)
+    sequential_logs = _log_lines(caplog)
+    caplog.clear()
+
+    with caplog.at_level("WARNING"):
+        parallel = Inventory()
+        parallel.load_from_csv(file_path, workers=4)
+
+    assert [p.model_dump() for p in parallel.products] == [
+        p.model_dump() for p in sequential.products
+    ]
+    assert [type(p) for p in parallel.products] == [
+        type(p) for p in sequential.products
+    ]
+    assert _log_lines(caplog) == sequential_logs
+    assert ("WARNING", "Row 8 skipped due to invalid data.") in sequential_logs
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_parallel_load_quoted_line_breaks(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture, trusted: bool
+) -> None:
+    """Chunks cut inside quoted line breaks fall back to sequential reading."""
+    file_path = tmp_path / "multiline.csv"
+    file_path.write_text(
+        "product_id,product_name,category,quantity,price\n"
+        + "".join(f'{i},"Item\n\n\n{i}",office,{i % 9},2.5\n' for i in range(1, 201))
+    )
+    sequential = Inventory()
+    sequential.load_from_csv(str(file_path), trusted=trusted)
+
+    with caplog.at_level("WARNING"):
+        parallel = Inventory()
+        parallel.load_from_csv(str(file_path), workers=4, trusted=trusted)
+
+    assert "reading it sequentially" in caplog.text
+    assert len(sequential.products) == 200
+    assert sequential.get(7).product_name == "Item\n\n\n7"
+    assert [p.model_dump() for p in parallel.products] == [
+        p.model_dump() for p in sequential.products
+    ]
+
+
+def test_parallel_load_missing_file(caplog: pytest.LogCaptureFixture) -> None:
+    """A missing file is reported the same way as the sequential load."""
+    inv = Inventory()
+    with caplog.at_level("ERROR"):
+        inv.load_from_csv("missing.csv", workers=2)
+    assert "CSV file 'missing.csv' not found." in caplog.text
+    assert inv.products == []
+
+
+def test_parallel_load_small_file(tmp_path: Path) -> None:
+    """More workers than rows still loads every row once."""
+    file_path = tmp_path / "small.csv"
+    file_path.write_text(
+        "product_id,product_name,category,quantity,price\n1,Pen,stationery,10,5.0\n"
+    )
+    inv = Inventory()
+    inv.load_from_csv(str(file_path), workers=8)
+    assert [p.product_id for p in inv.products] == [1]
@@ -0,0 +1,113 @@
+import itertools
+
+import pytest
+
+from Week3.core import Inventory
+from Week3.datagen import write_dataset
+from Week3.models import Product
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """A 400-row generated catalogue with repeated prices."""
+    path = tmp_path_factory.mktemp("query") / "products.csv"
+    write_dataset(str(path), 400, seed=11)
+    return str(path)
+
+
+def _inventories(dataset: str):
+    scanned, indexed = Inventory(), Inventory(indexed=True)
+    scanned.load_from_csv(dataset)
+    indexed.load_from_csv(dataset)
+    # Shared prices exercise the product_id tie-break
+    for inventory in (scanned, indexed):
+        for product in inventory.products[:40]:
+            product.price = 10.0
+    return scanned, indexed
+
+
+def _ids(products) -> list:
+    return [p.product_id for p in products]
+
+
+# ----------------------------
+# Query Tests
+# ----------------------------
+
+
+def test_indexed_queries_match_scans(dataset: str) -> None:
+    """The price index gives the same pages as scanning, for every plan."""
+    scanned, indexed = _inventories(dataset)
+    filters = [
+        {},
+        {"category": "FOOD"},
+        {"category": ""},
+        {"category": "toys"},
+        {"price_between": (5.0, 500.0)},
+        {"price_between": (None, 10.0), "category": "book"},
+        {"price_between": (900.0, None), "qty_lt": 50},
+        {"qty_lt": 20},
+    ]
+    orders = ["product_id", "-price", "price", "quantity", "-product_name", None]
+    pages = [{}, {"limit": 7}, {"limit": 5, "offset": 12}, {"offset": 390}]
+    for where, order_by, page in itertools.product(filters, orders, pages):
+        expected = scanned.query(**where, order_by=order_by, **page)
+        actual = indexed.query(**where, order_by=order_by, **page)
+        assert _ids(actual) == _ids(expected), (where, order_by, page)
+
+
+def test_query_results_are_filtered_and_sorted(dataset: str) -> None:
+    """Results satisfy every filter and follow the requested order."""
+    inventory = Inventory(indexed=True)
+    inventory.load_from_csv(dataset)
+    results = inventory.query(
+        category="electronic", price_between=(100, 1500), order_by="-price"
+    )
+    assert results
+    assert all(p.category == "electronic" for p in results)
+    assert all(100 <= p.price <= 1500 for p in results)
+    prices = [p.price for p in results]
+    assert prices == sorted(prices, reverse=True)
+
+    everything = inventory.query()
+    assert _ids(everything) == sorted(p.product_id for p in inventory.products)
+    assert _ids(inventory.query(limit=3, offset=2)) == _ids(everything[2:5])
+
+
+def test_index_follows_changes() -> None:
+    """Updates, removals and in-place edits are reflected in queries."""
+    inventory = Inventory(indexed=True)
+    for i, price in enumerate([5.0, 15.0, 25.0], start=1):
+        inventory.upsert(
+            Product(product_id=i, product_name=f"Item {i}", quantity=1, price=price)
+        )
+    inventory.get(1).price = 30.0
+    inventory.remove(2)
+    inventory.upsert(Product(product_id=3, product_name="New", quantity=1, price=1.0))
+    assert _ids(inventory.query(order_by="price")) == [3, 1]
+    assert _ids(inventory.query(price_between=(20.0, None))) == [1]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"order_by": "colour"}, {"limit": -1}, {"offset": -2}],
+    ids=["order", "limit", "offset"],
+)
+def test_query_rejects_bad_arguments(options: dict) -> None:
+    """Unknown order fields and negative paging raise ValueError."""
+    with pytest.raises(ValueError):
+        Inventory().query(**options)
+
+
+def test_query_without_index_scans() -> None:
+    """Inventories built without the index still answer every query."""
+    inventory = Inventory()
+    inventory.upsert(Product(product_id=2, product_name="Pen", quantity=1, price=2))
+    inventory.upsert(Product(product_id=1, product_name="Cap", quantity=9, price=3))
+    assert _ids(inventory.query(order_by="-price")) == [1, 2]
+    assert _ids(inventory.query(qty_lt=5)) == [2]
+    assert _ids(inventory.query(order_by=None)) == [2, 1]
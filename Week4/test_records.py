@@ -0,0 +1,100 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from Week3.benchmarks import bytes_per_product
+from Week3.core import Inventory
+from Week3.datagen import write_dataset
+from Week3.models import ElectronicProduct, FoodProduct, Product
+from Week3.records import ProductRecord, to_record
+
+# ----------------------------
+# Record Tests
+# ----------------------------
+
+
+def test_record_behaves_like_model(
+    food_product: FoodProduct, electronic_product: ElectronicProduct
+) -> None:
+    """Records keep field access, isinstance checks, methods and equality."""
+    record = to_record(food_product)
+    assert isinstance(record, ProductRecord)
+    assert isinstance(record, FoodProduct)
+    assert isinstance(record, Product)
+    assert record.product_name == "Milk"
+    assert record.get_total_value() == food_product.get_total_value()
+    assert record.model_dump() == food_product.model_dump()
+    assert record == food_product
+    assert food_product == record
+
+    gadget = to_record(electronic_product)
+    assert gadget.get_warranty_end_date() == electronic_product.get_warranty_end_date()
+    assert pickle.loads(pickle.dumps(gadget)) == gadget
+
+
+def test_record_is_read_only(sample_product: Product) -> None:
+    """Assigning a record attribute raises instead of silently diverging."""
+    record = to_record(sample_product)
+    with pytest.raises(AttributeError, match="read-only"):
+        record.quantity = 3
+
+
+def test_record_converts_to_model(book_product: Product) -> None:
+    """to_model restores an equal model with the same fields set."""
+    record = to_record(book_product)
+    for model in (record.to_model(), record.to_model(validate=True)):
+        assert type(model) is type(book_product)
+        assert model == book_product
+    assert record.to_model().model_fields_set == book_product.model_fields_set
+
+
+# ----------------------------
+# Compact Inventory Tests
+# ----------------------------
+
+
+def test_compact_inventory_loads_records(tmp_path: Path) -> None:
+    """Compact loading gives the same results as loading models."""
+    csv_file = str(tmp_path / "products.csv")
+    write_dataset(csv_file, 80)
+    full = Inventory()
+    full.load_from_csv(csv_file)
+    compact = Inventory(compact=True)
+    compact.load_from_csv(csv_file)
+
+    assert all(isinstance(p, ProductRecord) for p in compact.products)
+    assert compact.products == full.products
+    assert compact.get_summary() == full.get_summary()
+    assert compact.low_stock(5) == full.low_stock(5)
+
+    snapshot = str(tmp_path / "products.snap")
+    compact.save_snapshot(snapshot)
+    restored = Inventory(compact=True)
+    assert restored.load_snapshot(snapshot)
+    assert all(isinstance(p, ProductRecord) for p in restored.products)
+    assert restored.products == full.products
+
+
+def test_materialize_replaces_record(tmp_path: Path) -> None:
+    """materialize swaps in a model whose changes are tracked."""
+    csv_file = str(tmp_path / "products.csv")
+    write_dataset(csv_file, 8)
+    inv = Inventory(compact=True)
+    inv.load_from_csv(csv_file)
+    before = inv.get_total_inventory()
+
+    model = inv.materialize(3)
+    assert not isinstance(model, ProductRecord)
+    assert inv.products[2] is model
+    assert inv.materialize(3) is model
+    assert inv.materialize(99) is None
+
+    model.quantity += 10
+    assert inv.get_total_inventory() == pytest.approx(before + 10 * model.price)
+
+
+def test_bytes_per_product() -> None:
+    """Records take well under half the memory of a Pydantic model."""
+    sizes = bytes_per_product(2_000)
+    assert 0 < sizes["record"] < sizes["model"] / 2
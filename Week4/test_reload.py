@@ -0,0 +1,177 @@
+import csv
+import os
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from Week3.core import Inventory
+from Week3.datagen import generate_rows
+from Week3.formats import COLUMNS
+from Week3.reload import CsvReloader
+from Week3.wal import WriteAheadLog
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+QUANTITY = list(COLUMNS).index("quantity")
+PRICE = list(COLUMNS).index("price")
+
+
+def _write(path: Path, rows: List[List[str]]) -> None:
+    """Replaces the file atomically, as a feed exporter should."""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+    os.replace(tmp, path)
+
+
+@pytest.fixture
+def feed(tmp_path: Path) -> Path:
+    path = tmp_path / "products.csv"
+    _write(path, list(generate_rows(50, seed=5)))
+    return path
+
+
+def _loaded(feed: Path) -> Inventory:
+    inventory = Inventory()
+    inventory.load_from_csv(str(feed))
+    return inventory
+
+
+# ----------------------------
+# Reload Tests
+# ----------------------------
+
+
+def test_reload_applies_only_the_delta(feed: Path) -> None:
+    """Inserts, updates and deletes match a full load of the new file."""
+    inventory = _loaded(feed)
+    reloader = CsvReloader(inventory, str(feed))
+    reloader.prime()
+    untouched = inventory.get(2)
+
+    rows = list(generate_rows(50, seed=5))
+    rows[0][QUANTITY] = "999"  # update product 1
+    del rows[10:15]  # delete products 11 to 15
+    rows += list(generate_rows(3, seed=6, first_id=100))  # insert 100 to 102
+    _write(feed, rows)
+
+    counts = reloader.check()
+    assert counts == {
+        "inserted": 3,
+        "updated": 1,
+        "deleted": 5,
+        "unchanged": 44,
+        "rejected": 0,
+    }
+    assert inventory.get(1).quantity == 999
+    assert inventory.get(2) is untouched
+    assert sorted(p.product_id for p in inventory.products) == sorted(
+        p.product_id for p in _loaded(feed).products
+    )
+    summary, expected = inventory.get_summary(), _loaded(feed).get_summary()
+    assert summary.pop("total_value") == pytest.approx(expected.pop("total_value"))
+    assert summary == expected
+    assert reloader.check() is None
+
+
+def test_invalid_rows_keep_the_current_product(feed: Path) -> None:
+    """A row that stops validating neither updates nor deletes its product."""
+    inventory = _loaded(feed)
+    reloader = CsvReloader(inventory, str(feed))
+    reloader.prime()
+    before = inventory.get(3)
+
+    rows = list(generate_rows(50, seed=5))
+    rows[2][PRICE] = "-1"
+    rows.append(list(rows[0]))  # duplicate product_id 1
+    _write(feed, rows)
+    counts = reloader.reload()
+    assert counts["rejected"] == 2
+    assert counts["updated"] == counts["deleted"] == 0
+    assert inventory.get(3) is before
+
+    rows[2][PRICE] = "7.50"
+    _write(feed, rows)
+    reloader.reload()
+    assert inventory.get(3).price == 7.5
+
+
+def test_reloads_are_logged_after_earlier_changes(feed: Path, tmp_path: Path) -> None:
+    """Replaying the log on restart keeps the CSV edits made after API changes."""
+    inventory = _loaded(feed)
+    wal_path = str(tmp_path / "products.wal")
+    with WriteAheadLog(wal_path, fsync=False) as wal:
+        reloader = CsvReloader(inventory, str(feed), wal=wal)
+        reloader.prime()
+        changed = [
+            p.model_copy(update={"quantity": 7})
+            for p in (inventory.get(1), inventory.get(11))
+        ]
+        wal.log_put(changed)
+        for product in changed:
+            inventory.upsert(product)
+
+        rows = list(generate_rows(50, seed=5))
+        rows[0][QUANTITY] = "999"
+        del rows[10]
+        _write(feed, rows)
+        reloader.reload()
+
+    restarted = _loaded(feed)
+    with WriteAheadLog(wal_path, fsync=False) as wal:
+        wal.replay(restarted)
+    assert restarted.get(1).quantity == 999
+    assert restarted.get(11) is None
+    assert len(restarted.products) == 49
+
+
+def test_unprimed_reload_loads_everything(feed: Path) -> None:
+    """Without prime, the first reload inserts every row."""
+    inventory = Inventory(compact=True)
+    counts = CsvReloader(inventory, str(feed)).reload()
+    assert counts["inserted"] == 50
+    assert inventory.products == _loaded(feed).products
+
+
+def test_missing_file_changes_nothing(feed: Path) -> None:
+    """A file that disappears is logged and the inventory is kept."""
+    inventory = _loaded(feed)
+    reloader = CsvReloader(inventory, str(feed))
+    reloader.prime()
+    feed.unlink()
+    assert reloader.check() is None
+    assert len(inventory.products) == 50
+
+
+def test_background_watcher_picks_up_changes(feed: Path) -> None:
+    """The watcher thread applies a change within a few intervals."""
+    inventory = _loaded(feed)
+    reloader = CsvReloader(inventory, str(feed))
+    reloader.prime()
+    reloader.start(interval=0.01)
+    try:
+        _write(feed, list(generate_rows(40, seed=5)))
+        deadline = time.monotonic() + 5
+        while len(inventory.products) != 40 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        reloader.stop()
+    assert len(inventory.products) == 40
+
+
+def test_remove_many_keeps_order_and_indexes(feed: Path) -> None:
+    """Bulk removal keeps the order of the rest and updates the indexes."""
+    inventory = _loaded(feed)
+    removed = inventory.remove_many([4, 2, 4, 999])
+    assert [p.product_id for p in removed] == [4, 2]
+    remaining = [p.product_id for p in inventory.products]
+    assert remaining == [i for i in range(1, 51) if i not in (2, 4)]
+    assert inventory.get(2) is None
+    assert inventory.products.position(inventory.get(5)) == 2
+    assert inventory.get_summary()["total_products"] <= 48
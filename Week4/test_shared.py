@@ -0,0 +1,164 @@
+import multiprocessing
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Iterator
+
+import pytest
+
+from Week3.core import Inventory
+from Week3.models import FoodProduct, Product
+from Week3.shared import SharedColumns
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+
+@pytest.fixture
+def segment(make_product: Callable[..., Product]) -> Iterator[SharedColumns]:
+    """A segment holding products 1-10, unlinked after the test."""
+    columns = SharedColumns.create(
+        [make_product(i) for i in range(1, 11)], name=f"inv-{uuid.uuid4().hex[:12]}"
+    )
+    yield columns
+    columns.close()
+    columns.unlink()
+
+
+def _worker(name: str, first: int, make_product: Callable[..., Product]) -> None:
+    """Writes from another process, as a second server worker would."""
+    columns = SharedColumns.attach(name)
+    for round_ in range(200):
+        columns.put(make_product(3, quantity=round_, price=round_ + 1))
+        columns.put(make_product(first, quantity=round_))
+    columns.remove(4)
+    columns.close()
+
+
+def _fork() -> multiprocessing.context.BaseContext:
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs fork")
+    return multiprocessing.get_context("fork")
+
+
+# ----------------------------
+# Read and Write Tests
+# ----------------------------
+
+
+def test_reads_and_writes(
+    segment: SharedColumns, make_product: Callable[..., Product]
+) -> None:
+    """Puts, removes and totals work on the shared columns."""
+    assert len(segment) == 10
+    assert segment.get(3) == (5, 2.0)
+    segment.put(make_product(3, quantity=7))
+    segment.put(make_product(42, quantity=1, price=10.0))
+    segment.remove(5)
+    segment.remove(99)
+    assert 5 not in segment and 42 in segment
+    assert segment.get(3) == (7, 2.0)
+    assert segment.total_value() == pytest.approx(100 + 2 * 2 - 10 + 10)
+    assert segment.version == 5
+
+
+def test_summary_skips_expired_food(
+    segment: SharedColumns, make_food: Callable[..., FoodProduct]
+) -> None:
+    """Expired food is left out of summarize, like ColumnStore.summarize."""
+    segment.put(make_food(50, timedelta(days=-1), quantity=3, price=1.0))
+    assert segment.summarize(datetime.now()) == (10, 50, 100.0)
+    assert segment.total_value() == pytest.approx(103.0)
+
+
+def test_removed_rows_are_reclaimed(make_product: Callable[..., Product]) -> None:
+    """Churn past the capacity reuses the rows of removed products."""
+    columns = SharedColumns.create(capacity=20, name=f"inv-{uuid.uuid4().hex[:12]}")
+    try:
+        for round_ in range(10):
+            for product_id in range(100, 115):
+                columns.put(make_product(product_id, quantity=round_))
+            for product_id in range(100, 114):
+                columns.remove(product_id)
+        assert len(columns) == 1
+        assert columns.get(114) == (9, 2.0)
+        for product_id in range(1, 20):
+            columns.put(make_product(product_id))
+        with pytest.raises(ValueError):
+            columns.put(make_product(500))
+    finally:
+        columns.close()
+        columns.unlink()
+
+
+# ----------------------------
+# Cross-Process Tests
+# ----------------------------
+
+
+def test_writes_from_other_processes(
+    segment: SharedColumns, make_product: Callable[..., Product]
+) -> None:
+    """Writers in other processes take turns and readers never see a mix."""
+    context = _fork()
+    segment.put(make_product(3, quantity=0, price=1.0))
+    workers = [
+        context.Process(target=_worker, args=(segment.name, first, make_product))
+        for first in (20, 21)
+    ]
+    for worker in workers:
+        worker.start()
+    while any(worker.is_alive() for worker in workers):
+        quantity, price = segment.get(3)
+        assert price == quantity + 1
+    for worker in workers:
+        worker.join(30)
+        assert worker.exitcode == 0
+
+    attached = SharedColumns.attach(segment.name)
+    try:
+        assert attached.get(3) == (199, 200.0)
+        assert attached.get(20) == attached.get(21) == (199, 2.0)
+        assert 4 not in attached
+        assert len(attached) == 11
+    finally:
+        attached.close()
+
+
+def test_open_attaches_to_an_existing_segment(
+    segment: SharedColumns, make_product: Callable[..., Product]
+) -> None:
+    """The second opener attaches instead of creating a new segment."""
+    other = SharedColumns.open(segment.name, [make_product(99)])
+    try:
+        assert 99 not in other and len(other) == 10
+    finally:
+        other.close()
+
+
+def test_inventory_publishes_changes(
+    segment: SharedColumns, make_product: Callable[..., Product]
+) -> None:
+    """As a listener, the segment follows the inventory's changes."""
+    inventory = Inventory()
+    inventory.products.listeners.append(segment)
+    inventory.upsert(make_product(1, quantity=30))
+    inventory.upsert(make_product(2))
+    inventory.remove(2)
+    inventory.get(1).price = 4.0
+    assert segment.get(1) == (30, 4.0)
+    assert 2 not in segment
+
+
+def test_clearing_an_inventory_leaves_the_segment(
+    segment: SharedColumns, make_product: Callable[..., Product]
+) -> None:
+    """A worker reloading its own list does not wipe the other workers' data."""
+    inventory = Inventory()
+    inventory.products.listeners.append(segment)
+    inventory.products = [make_product(1, quantity=3)]
+    assert len(segment) == 10
+    assert segment.get(1) == (3, 2.0)
+
+    segment.reset()
+    assert len(segment) == 0 and segment.get(1) is None
@@ -0,0 +1,166 @@
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from Week3.core import Inventory
+from Week3.datagen import write_dataset
+from Week3.models import ElectronicProduct, FoodProduct, Product
+from Week3.snapshot import HEADER, read_snapshot, write_snapshot
+
+# ----------------------------
+# Round Trip Tests
+# ----------------------------
+
+
+def test_snapshot_round_trip(
+    tmp_path: Path, inventory_with_products: Inventory
+) -> None:
+    """Products come back with the same classes, values, order and fields set."""
+    inv = inventory_with_products
+    inv.upsert(Product(product_id=5, product_name="Ünïcode ✓", quantity=1, price=1.5))
+    inv.upsert(
+        FoodProduct(
+            product_id=6,
+            product_name="Cheese",
+            quantity=3,
+            price=9.0,
+            mfg_date=datetime(2025, 1, 1),
+            expiry_date=datetime(2030, 1, 1, 12, 30, 0, 250),
+        )
+    )
+    inv.upsert(
+        ElectronicProduct(
+            product_id=7,
+            product_name="Router",
+            quantity=2,
+            price=40.0,
+            purchase_date=datetime(2025, 3, 1, 9, tzinfo=timezone(timedelta(hours=5))),
+            warranty_period=6,
+        )
+    )
+    path = str(tmp_path / "products.snap")
+    inv.save_snapshot(path)
+
+    restored = Inventory()
+    assert restored.load_snapshot(path)
+    assert [type(p) for p in restored.products] == [type(p) for p in inv.products]
+    for loaded, original in zip(restored.products, inv.products):
+        assert loaded == original
+        assert list(loaded.__dict__) == list(original.__dict__)
+        assert loaded.model_fields_set == original.model_fields_set
+    assert restored.get(6).expiry_date.microsecond == 250
+    assert restored.get(7).purchase_date.utcoffset() == timedelta(hours=5)
+    assert restored.get(5).category is None
+    assert restored.get_summary() == inv.get_summary()
+
+
+def test_empty_snapshot(tmp_path: Path) -> None:
+    """An empty inventory round-trips to an empty list."""
+    path = str(tmp_path / "empty.snap")
+    write_snapshot(path, [])
+    assert read_snapshot(path) == []
+
+
+# ----------------------------
+# CSV Cache Tests
+# ----------------------------
+
+
+def test_load_with_snapshot_reuses_fresh_snapshot(tmp_path: Path, mocker) -> None:
+    """The CSV is parsed once; later loads come from the snapshot."""
+    csv_file = str(tmp_path / "products.csv")
+    write_dataset(csv_file, 40)
+
+    first = Inventory()
+    first.load_with_snapshot(csv_file)
+    assert os.path.exists(f"{csv_file}.snap")
+
+    spy = mocker.spy(Inventory, "load_from_csv")
+    second = Inventory()
+    second.load_with_snapshot(csv_file)
+    spy.assert_not_called()
+    assert second.products == first.products
+
+
+def test_load_with_snapshot_refreshes_when_csv_changes(tmp_path: Path) -> None:
+    """A snapshot written from an older CSV is replaced."""
+    csv_file = str(tmp_path / "products.csv")
+    snapshot = str(tmp_path / "cache.snap")
+    write_dataset(csv_file, 10)
+    Inventory().load_with_snapshot(csv_file, snapshot)
+
+    write_dataset(csv_file, 12)
+    stat = os.stat(csv_file)
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    inv = Inventory()
+    inv.load_with_snapshot(csv_file, snapshot)
+    assert len(inv.products) == 12
+    assert len(read_snapshot(snapshot)) == 12
+
+
+# ----------------------------
+# Error Handling Tests
+# ----------------------------
+
+
+def test_load_snapshot_missing_file(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """A missing snapshot is logged and reported as not loaded."""
+    with caplog.at_level("ERROR"):
+        assert not Inventory().load_snapshot(str(tmp_path / "missing.snap"))
+    assert "not found" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"not a snapshot at all, just some bytes padding the header",
+        HEADER.pack(b"INVSNAP\x00", 99, 0, 0, 0, 0),
+        HEADER.pack(b"INVSNAP\x00", 1, 1, 5, 0, 0) + struct.pack("<H", 40),
+    ],
+    ids=["magic", "version", "truncated"],
+)
+def test_load_snapshot_rejects_bad_files(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture, content: bytes
+) -> None:
+    """Foreign, newer-version and truncated files are rejected, not loaded."""
+    path = tmp_path / "bad.snap"
+    path.write_bytes(content)
+    inv = Inventory()
+    with caplog.at_level("ERROR"):
+        assert not inv.load_snapshot(str(path))
+    assert "Error reading snapshot" in caplog.text
+    assert inv.products == []
+
+
+def test_load_snapshot_skips_duplicate_ids(
+    tmp_path: Path,
+    inventory_with_products: Inventory,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Ids already loaded or repeated in the snapshot keep their first product."""
+    path = str(tmp_path / "products.snap")
+    pen = inventory_with_products.get(1)
+    write_snapshot(path, [pen, pen.model_copy(update={"quantity": 99})])
+
+    inv = Inventory()
+    with caplog.at_level("ERROR"):
+        assert inv.load_snapshot(path)
+        assert inv.load_snapshot(path)
+    assert [p.quantity for p in inv.products] == [pen.quantity]
+    assert caplog.text.count("Duplicate product_id 1") == 3
+
+
+def test_load_with_snapshot_falls_back_to_csv(tmp_path: Path) -> None:
+    """A corrupt snapshot is ignored and rewritten from the CSV."""
+    csv_file = str(tmp_path / "products.csv")
+    write_dataset(csv_file, 5)
+    Path(f"{csv_file}.snap").write_bytes(b"garbage")
+    inv = Inventory()
+    inv.load_with_snapshot(csv_file)
+    assert len(inv.products) == 5
+    assert len(read_snapshot(f"{csv_file}.snap")) == 5
@@ -0,0 +1,212 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List
+
+import pytest
+
+from Week3 import core
+from Week3.core import Inventory
+from Week3.datagen import write_dataset
+from Week3.locks import RWLock
+from Week3.models import Product
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+
+def _run(threads: List[Callable[[], None]]) -> List[BaseException]:
+    """Runs the callables on threads and returns what they raised."""
+    failures: List[BaseException] = []
+
+    def guarded(target: Callable[[], None]) -> None:
+        try:
+            target()
+        except BaseException as e:
+            failures.append(e)
+
+    workers = [threading.Thread(target=guarded, args=(t,)) for t in threads]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+    return failures
+
+
+# ----------------------------
+# Lock Tests
+# ----------------------------
+
+
+def test_lock_is_reentrant_and_refuses_upgrades() -> None:
+    """Nested reads and writes work; writing from a read raises."""
+    lock = RWLock()
+    with lock.writing():
+        with lock.writing(), lock.reading():
+            assert not lock.read_only()
+    with lock.reading(), lock.reading():
+        assert lock.read_only()
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+    with lock.writing():
+        pass
+
+
+def test_waiting_writer_goes_before_new_readers() -> None:
+    """A new reader waits behind a writer that is waiting."""
+    lock, order = RWLock(), []
+    lock.acquire_read()
+    writer = threading.Thread(
+        target=lambda: (lock.acquire_write(), order.append("w"), lock.release_write())
+    )
+    writer.start()
+    while not lock._waiting_writers:
+        time.sleep(0.001)
+    reader = threading.Thread(
+        target=lambda: (lock.acquire_read(), order.append("r"), lock.release_read())
+    )
+    reader.start()
+    time.sleep(0.05)
+    assert order == []
+    lock.release_read()
+    writer.join(5)
+    reader.join(5)
+    assert order == ["w", "r"]
+
+
+# ----------------------------
+# Stress Test
+# ----------------------------
+
+
+def test_concurrent_readers_and_writers(make_product: Callable[..., Product]) -> None:
+    """Readers always see consistent totals while writers change products."""
+
+    def product(product_id: int, quantity: int = 5) -> Product:
+        return make_product(
+            product_id,
+            category=("office", "garden", "toys")[product_id % 3],
+            quantity=quantity,
+            price=1.0 + product_id % 7,
+        )
+
+    inventory = Inventory(indexed=True)
+    for product_id in range(1, 301):
+        inventory.upsert(product(product_id))
+    stop = threading.Event()
+
+    def writer(first: int) -> Callable[[], None]:
+        def run() -> None:
+            for round_ in range(200):
+                product_id = first + round_ % 50
+                inventory.upsert(product(product_id, quantity=round_ % 20))
+                if round_ % 3 == 0:
+                    inventory.remove(product_id + 1)
+                    inventory.upsert(product(product_id + 1))
+
+        return run
+
+    def reader() -> None:
+        while not stop.is_set():
+            with inventory.lock.reading():
+                products = inventory.copy_products()
+                total = sum(p.get_total_value() for p in products)
+                assert inventory.get_total_inventory() == pytest.approx(total)
+                assert inventory.get_summary()["total_products"] == len(products)
+            assert len(inventory.query(category="toys", limit=10)) == 10
+            inventory.low_stock(5)
+            inventory.get_analytics(top_n=3)
+
+    readers = [reader] * 8
+    writers = [writer(first) for first in (1, 101, 201)]
+
+    def run_writers() -> None:
+        try:
+            assert not _run(writers)
+        finally:
+            stop.set()
+
+    assert _run([*readers, run_writers]) == []
+    assert len(inventory.products) == 300
+    assert inventory.get(50).quantity == 199 % 20
+
+
+def test_columnar_total_during_appends(make_product: Callable[..., Product]) -> None:
+    """Summing the columns never overlaps an append that grows them."""
+    pytest.importorskip("numpy")
+    inventory = Inventory(columnar=True)
+    stop = threading.Event()
+
+    def writer() -> None:
+        try:
+            for product_id in range(1, 3001):
+                inventory.upsert(make_product(product_id, quantity=1, price=1.0))
+        finally:
+            stop.set()
+
+    def reader() -> None:
+        while not stop.is_set():
+            assert 0 <= inventory.get_total_inventory() <= 3000
+
+    assert _run([reader, reader, writer]) == []
+    assert inventory.get_total_inventory() == pytest.approx(3000.0)
+
+
+# ----------------------------
+# Lock Scope Tests
+# ----------------------------
+
+
+def test_loads_release_the_lock_between_batches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Readers get in between the batches of a file load."""
+    monkeypatch.setattr(core, "LOAD_BATCH_SIZE", 10)
+    file_path = str(tmp_path / "products.csv")
+    write_dataset(file_path, 50)
+    inventory, seen = Inventory(), []
+    iter_csv_rows = inventory._iter_csv_rows
+
+    def read_midway(*args):
+        for idx, product in iter_csv_rows(*args):
+            if product.product_id == 26:
+                reader = threading.Thread(
+                    target=lambda: seen.append(len(inventory.copy_products()))
+                )
+                reader.start()
+                reader.join(5)
+            yield idx, product
+
+    monkeypatch.setattr(inventory, "_iter_csv_rows", read_midway)
+    inventory.load_from_csv(file_path)
+    assert seen == [20]
+    assert len(inventory.products) == 50
+
+
+def test_next_expiry_only_reads(inventory_with_products: Inventory) -> None:
+    """next_expiry works under a read lock, even with stale heap entries."""
+    inventory = inventory_with_products
+    inventory.remove(2)
+    with inventory.lock.reading():
+        assert inventory.next_expiry() is None
+    assert inventory.next_expiry() is None
+
+
+def test_streams_are_read_without_the_lock(
+    inventory_with_products: Inventory, make_product: Callable[..., Product]
+) -> None:
+    """Summarizing an external stream leaves the inventory free to change."""
+    inventory = inventory_with_products
+
+    def stream() -> Iterator[Product]:
+        for product_id in (5, 6):
+            product = make_product(product_id)
+            # Raises if the stream's consumer held the read lock
+            inventory.upsert(product)
+            yield product
+
+    assert inventory.get_summary(products=stream())["total_products"] == 2
+    top = inventory.get_analytics(products=stream())["top_products"]
+    assert [p.product_id for p in top] == [5, 6]
+    assert len(inventory.products) == 6
@@ -0,0 +1,133 @@
+from pathlib import Path
+
+import pytest
+
+from Week3.benchmarks import bench_trusted_load
+from Week3.core import Inventory
+from Week3.datagen import write_dataset
+from Week3.ingest import TrustedBuilder, trusted_builder
+from Week3.models import BookProduct, ElectronicProduct, FoodProduct, Product
+
+# ----------------------------
+# Trusted Load Tests
+# ----------------------------
+
+
+def test_trusted_load_matches_validated(tmp_path: Path) -> None:
+    """Trusted loading builds the same classes, values and field order."""
+    file_path = str(tmp_path / "products.csv")
+    write_dataset(file_path, 200)
+
+    validated = Inventory()
+    validated.load_from_csv(file_path)
+    trusted = Inventory()
+    trusted.load_from_csv(file_path, trusted=True)
+
+    assert [type(p) for p in trusted.products] == [type(p) for p in validated.products]
+    assert {type(p) for p in trusted.products} == {
+        Product,
+        FoodProduct,
+        ElectronicProduct,
+        BookProduct,
+    }
+    for fast, slow in zip(trusted.products, validated.products):
+        assert list(fast.model_dump().items()) == list(slow.model_dump().items())
+        assert fast.model_fields_set == slow.model_fields_set
+        assert fast == slow
+
+
+def test_trusted_load_skips_model_validation(tmp_path: Path) -> None:
+    """Rows are not re-validated, so check_expiry_after_mfg does not run."""
+    file_path = tmp_path / "products.csv"
+    file_path.write_text(
+        "product_id,product_name,category,quantity,price,mfg_date,expiry_date\n"
+        "15,Invalid Date Food,food,5,20.0,2024-08-01,2024-07-01\n"
+    )
+    inv = Inventory()
+    inv.load_from_csv(str(file_path), trusted=True)
+    assert len(inv.products) == 1
+    assert isinstance(inv.products[0], FoodProduct)
+    assert inv.products[0].category == "food"
+
+
+def test_trusted_load_reports_unparsable_rows(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Values that cannot be converted are still logged and skipped."""
+    file_path = tmp_path / "products.csv"
+    file_path.write_text(
+        "product_id,product_name,quantity,price,category\n"
+        "1,Pen,5,10.0,\n"
+        "\n"
+        "3,Eraser,abc,3.5,\n"
+        "4,Old Milk,1,2.0,food\n"
+    )
+    inv = Inventory()
+    with caplog.at_level("WARNING"):
+        inv.load_from_csv(str(file_path), trusted=True)
+    assert [p.product_id for p in inv.products] == [1]
+    assert "Type error in row" in caplog.text
+    assert "Missing required field 'mfg_date'" in caplog.text
+    assert "Row 3 skipped due to invalid data." in caplog.text
+    assert "Row 4 skipped due to invalid data." in caplog.text
+
+
+def test_trusted_parallel_load(tmp_path: Path) -> None:
+    """Trusted mode also works with the process-pool loader."""
+    file_path = str(tmp_path / "products.csv")
+    write_dataset(file_path, 120)
+    inv = Inventory()
+    inv.load_from_csv(file_path, workers=3, trusted=True)
+    assert [p.product_id for p in inv.products] == list(range(1, 121))
+
+
+# ----------------------------
+# Builder Tests
+# ----------------------------
+
+
+def test_create_product_from_row_trusted(book_product: BookProduct) -> None:
+    """Dict rows, e.g. from JSON, can be built through the trusted path."""
+    inv = Inventory()
+    row = {
+        "product_id": 4,
+        "product_name": "Clean Code",
+        "category": "book",
+        "quantity": 7,
+        "price": 800.0,
+        "author": "Robert Martin",
+        "publication_year": "2020",
+        "unused": "ignored",
+    }
+    product = inv.create_product_from_row(row, trusted=True)
+    assert product == book_product.model_copy(update={"category": "book"})
+
+
+def test_trusted_builder_is_cached_per_layout() -> None:
+    """Builders are compiled once per class and row layout."""
+    columns = ["product_id", "product_name", "quantity", "price"]
+    assert trusted_builder(Product) is trusted_builder(Product)
+    assert trusted_builder(Product, columns) is trusted_builder(Product, columns)
+    assert trusted_builder(Product) is not trusted_builder(Product, columns)
+
+
+def test_trusted_builder_defaults_for_missing_columns() -> None:
+    """Optional fields absent from the header take their model defaults."""
+    builder = TrustedBuilder(
+        FoodProduct,
+        ["product_id", "product_name", "quantity", "price", "mfg_date", "expiry_date"],
+    )
+    product = builder(["1", "Milk", "2", "3.5", "2024-01-01", "2024-02-01"])
+    assert product.category == "food"
+    assert product.get_total_value() == 7.0
+    assert product.model_fields_set >= {"category", "mfg_date", "expiry_date"}
+
+
+def test_bench_trusted_load_reports_timings() -> None:
+    """The benchmark returns timings for both paths and their ratio."""
+    results = bench_trusted_load(rows=50)
+    assert results["validated"] > 0
+    assert results["trusted"] > 0
+    assert results["speedup"] == pytest.approx(
+        results["validated"] / results["trusted"]
+    )
@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from Week3 import wal as wal_module
+from Week3.core import Inventory
+from Week3.models import Product
+from Week3.wal import WriteAheadLog
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+
+def _replayed(path: Path, base: List[Product] = ()) -> Inventory:
+    inventory = Inventory()
+    for product in base:
+        inventory.upsert(product)
+    with WriteAheadLog(str(path)) as log:
+        log.replay(inventory)
+    return inventory
+
+
+@pytest.fixture
+def log_path(tmp_path: Path) -> Path:
+    return tmp_path / "products.wal"
+
+
+# ----------------------------
+# Replay Tests
+# ----------------------------
+
+
+def test_replay_applies_puts_and_deletes(
+    log_path: Path, make_product: Callable[..., Product]
+) -> None:
+    """The last record per product wins when the log is reopened."""
+    with WriteAheadLog(str(log_path)) as log:
+        log.sync(log.log_put([make_product(1), make_product(2), make_product(3)]))
+        log.log_put([make_product(2, quantity=9)])
+        log.sync(log.log_delete([3, 4]))
+
+    inventory = _replayed(log_path, base=[make_product(4), make_product(5)])
+    assert [p.product_id for p in inventory.products] == [5, 1, 2]
+    assert inventory.get(2).quantity == 9
+
+
+def test_torn_last_record_is_dropped(
+    log_path: Path, make_product: Callable[..., Product]
+) -> None:
+    """A partial last line is cut off; later appends stay readable."""
+    with WriteAheadLog(str(log_path)) as log:
+        log.sync(log.log_put([make_product(1), make_product(2)]))
+    data = log_path.read_bytes()
+    log_path.write_bytes(data[:-10])
+
+    with WriteAheadLog(str(log_path)) as log:
+        assert len(log) == 1
+        log.sync(log.log_put([make_product(3)]))
+    inventory = _replayed(log_path)
+    assert [p.product_id for p in inventory.products] == [1, 3]
+
+
+def test_unterminated_last_record_is_kept(
+    log_path: Path, make_product: Callable[..., Product]
+) -> None:
+    """A complete record missing its line break is kept and terminated."""
+    with WriteAheadLog(str(log_path)) as log:
+        log.sync(log.log_put([make_product(1)]))
+    log_path.write_bytes(log_path.read_bytes().rstrip(b"\n"))
+
+    with WriteAheadLog(str(log_path)) as log:
+        log.sync(log.log_put([make_product(2)]))
+    assert [p.product_id for p in _replayed(log_path).products] == [1, 2]
+
+
+# ----------------------------
+# Compaction Tests
+# ----------------------------
+
+
+def test_compaction_keeps_one_record_per_product(
+    log_path: Path, make_product: Callable[..., Product]
+) -> None:
+    """Compacting shrinks the log to its net effect."""
+    with WriteAheadLog(str(log_path), compact_every=50) as log:
+        for round_ in range(30):
+            products = [make_product(i, quantity=round_) for i in (1, 2)]
+            log.sync(log.log_put(products))
+        assert len(log_path.read_text().splitlines()) < 50
+        log.sync(log.log_delete([2]))
+        log.compact()
+        assert len(log_path.read_text().splitlines()) == 2
+
+    inventory = _replayed(log_path, base=[make_product(2)])
+    assert [p.product_id for p in inventory.products] == [1]
+    assert inventory.get(1).quantity == 29
+
+
+# ----------------------------
+# Group Commit Tests
+# ----------------------------
+
+
+def test_concurrent_syncs_share_fsyncs(
+    log_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    make_product: Callable[..., Product],
+) -> None:
+    """Writers waiting on one fsync are covered by it."""
+    calls = []
+
+    def slow_fsync(fd: int) -> None:
+        calls.append(fd)
+        time.sleep(0.02)
+
+    monkeypatch.setattr(wal_module.os, "fsync", slow_fsync)
+    log = WriteAheadLog(str(log_path))
+
+    def write(product_id: int) -> None:
+        log.sync(log.log_put([make_product(product_id)]))
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(1, 21)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    log.close()
+    assert 1 <= len(calls) < 20
+    assert len(_replayed(log_path).products) == 20
+    assert not os.path.exists(f"{log_path}.tmp")
@@ -1,6 +1,8 @@
+import os
+
 from flask import Flask
 
-from .routes.inventory import inventory_bp
+from .routes.inventory import init_inventory, inventory_bp, use_shared_memory
 
 
 def create_app():
@@ -10,6 +12,16 @@ def create_app():
     This function initializes a Flask app and registers the API blueprint
     to it. The logger is also set up to log errors to a file.
 
+    The inventory is loaded here, from the files named by INVENTORY_CSV,
+    INVENTORY_SNAPSHOT and INVENTORY_WAL; see `init_inventory`. It then
+    follows changes to its CSV file: a background thread checks it every
+    INVENTORY_RELOAD_INTERVAL seconds (default 5; 0 disables it) and
+    applies only the rows that changed.
+
+    Setting INVENTORY_SHARED_MEMORY to a segment name makes the workers of
+    a pre-forked server, such as gunicorn, share stock and prices through
+    that shared-memory segment; see `use_shared_memory`.
+
     Returns:
         app: The Flask application instance.
     """
@@ -19,6 +31,15 @@ def create_app():
 
     app = Flask(__name__)
     app.register_blueprint(inventory_bp, url_prefix="/api")
+    reloader = init_inventory()
+
+    shared_name = os.environ.get("INVENTORY_SHARED_MEMORY")
+    if shared_name:
+        use_shared_memory(shared_name)
+
+    interval = float(os.environ.get("INVENTORY_RELOAD_INTERVAL", 5))
+    if interval > 0:
+        reloader.start(interval)
     return app
 
 
@@ -0,0 +1,142 @@
+import secrets
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import current_app
+
+from Week3.models import Product
+from Week3.shared import SharedColumns
+
+# Encoded GET /products pages kept per inventory version
+MAX_CACHED_PAGES = 256
+
+# (JSON body, Link header or None) of one encoded page
+CachedPage = Tuple[bytes, Optional[str]]
+
+
+class ResponseCache:
+    """
+    Encoded JSON for the inventory API, kept until the products change.
+
+    Registered as a listener of the inventory's product list, it bumps a
+    version counter on every product added, removed or changed, whether
+    through the API, the CSV reloader or anything else. Each product's
+    JSON bytes are kept until that product changes, so a list response
+    joins cached bytes instead of calling `model_dump` and encoding every
+    product again. Whole pages are kept per query string for the current
+    version only, up to `max_pages` of them.
+
+    `etag` names the current version, so a client polling with
+    If-None-Match can be answered with 304 until something changes. It
+    includes a token drawn at startup, so tags from an earlier process
+    never match.
+
+    With `shared` set, quantity and price are taken from the workers'
+    shared columns, and a write there by any worker counts as a change.
+    """
+
+    def __init__(self, max_pages: int = MAX_CACHED_PAGES):
+        """
+        Args:
+        - max_pages (int): Encoded pages kept for the current version.
+        """
+        self.max_pages = max_pages
+        self.version = 0
+        self._token = secrets.token_hex(4)
+        self._products: Dict[int, Tuple[Product, bytes]] = {}
+        self._pages: Dict[bytes, CachedPage] = {}
+        self.shared: Optional[SharedColumns] = None
+        self._shared_version = -1
+
+    @property
+    def etag(self) -> str:
+        """
+        The entity tag, unquoted, of responses built from the current
+        version, after `refresh`.
+        """
+        self.refresh()
+        return f"{self._token}-{self.version}"
+
+    def refresh(self) -> None:
+        """
+        Drops the cached bytes if another worker wrote to the shared columns
+        since the last call.
+        """
+        shared = self.shared
+        if shared is not None and shared.version != self._shared_version:
+            self._shared_version = shared.version
+            self._products.clear()
+            self._bump()
+
+    def add(self, product: Product) -> None:
+        self._bump()
+
+    def add_many(self, products: Iterable[Product]) -> None:
+        self._bump()
+
+    def discard(self, product: Product) -> None:
+        self._products.pop(product.product_id, None)
+        self._bump()
+
+    def clear(self) -> None:
+        self._products.clear()
+        self._bump()
+
+    def product_json(self, product: Product) -> bytes:
+        """
+        Returns the product encoded as a JSON object, from the cache when
+        this product was encoded before and has not changed since.
+        """
+        entry = self._products.get(product.product_id)
+        if entry is not None and entry[0] is product:
+            return entry[1]
+        body = encode_json(self.overlay(product.product_id, product.model_dump()))
+        self._products[product.product_id] = (product, body)
+        return body
+
+    def overlay(self, product_id: int, values: dict) -> dict:
+        """
+        Replaces the quantity and price in a product's values with the
+        shared ones, when shared columns are used and hold the product.
+        """
+        if self.shared is None:
+            return values
+        stock = self.shared.get(product_id)
+        if stock is not None:
+            for name, value in zip(("quantity", "price"), stock):
+                if name in values:
+                    values[name] = value
+        return values
+
+    def list_json(self, products: Iterable[Product]) -> bytes:
+        """
+        Returns the products encoded as a JSON array.
+        """
+        return b"[" + b",".join(map(self.product_json, products)) + b"]"
+
+    def page(self, key: bytes) -> Optional[CachedPage]:
+        """
+        Returns the page stored under `key` for the current version, if any.
+        """
+        return self._pages.get(key)
+
+    def store_page(self, key: bytes, page: CachedPage) -> None:
+        """
+        Stores an encoded page for the current version, dropping the oldest
+        page when `max_pages` are already stored.
+        """
+        if key not in self._pages and len(self._pages) >= self.max_pages:
+            self._pages.pop(next(iter(self._pages)), None)
+        self._pages[key] = page
+
+    def _bump(self) -> None:
+        self.version += 1
+        self._pages.clear()
+
+
+def encode_json(value: object) -> bytes:
+    """
+    Encodes a value compactly, the way `flask.jsonify` does outside debug
+    mode, without the trailing newline, so cached bytes can be joined into
+    larger documents.
+    """
+    return current_app.json.dumps(value, separators=(",", ":")).encode()
@@ -1,24 +1,157 @@
+import json
 import logging
 import os
-from typing import Any, Tuple
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlencode
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from pydantic import ValidationError
 from werkzeug.exceptions import BadRequest
 
 from Week3.core import Inventory
+from Week3.errors import DUPLICATE, classify_error
+from Week3.ingest import build_product
+from Week3.models import PRODUCT_CLASS_MAP, Product
+from Week3.reload import CsvReloader
+from Week3.shared import SharedColumns
+from Week3.wal import WriteAheadLog
+
+from ..cache import ResponseCache, encode_json
 
 inventory_bp = Blueprint("inventory", __name__)
 
-# CSV file path relative to this file
+# Default CSV file path, relative to this file
 base_dir = os.path.dirname(os.path.abspath(__file__))
 csv_path = os.path.abspath(
     os.path.join(base_dir, "..", "..", "..", "Week3", "data", "products.csv")
 )
 
-# Initialize inventory and load products from CSV
-inventory = Inventory()
-inventory.load_from_csv(csv_path)
+# Page size of GET /products given an offset but no limit, and the largest
+# allowed
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Items of a bulk request validated and applied per write lock
+BULK_BATCH_SIZE = 1000
+# Content types read as one JSON document per line by the bulk endpoints
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl")
+
+# Fields a `fields=` projection may name, across every product type
+PRODUCT_FIELDS: FrozenSet[str] = frozenset(Product.model_fields).union(
+    *(cls.model_fields for cls in PRODUCT_CLASS_MAP.values())
+)
+
+# Filled by `init_inventory`; the price index serves the category and price
+# filters of GET /products
+inventory = Inventory(indexed=True)
+
+# Encoded responses, invalidated whenever a product changes
+responses = ResponseCache()
+inventory.products.add_listener(responses)
+
+# Log of the changes made through the API and the follower of CSV edits,
+# set up by `init_inventory`
+wal: Optional[WriteAheadLog] = None
+reloader: Optional[CsvReloader] = None
+
+# Stock and prices shared with the other server workers, see
+# `use_shared_memory`
+shared: Optional[SharedColumns] = None
+
+
+def init_inventory(
+    csv_file: Optional[str] = None,
+    snapshot_file: Optional[str] = None,
+    wal_file: Optional[str] = None,
+) -> CsvReloader:
+    """
+    Loads the inventory from the CSV file, via its binary snapshot when that
+    is up to date, and replays the changes logged since over it. Importing
+    this module loads nothing; `create_app` calls this once, and later
+    calls return the same reloader without loading again.
+
+    The reloader logs the CSV edits it applies, so the log replays them in
+    order with the API changes. Edits made to the CSV while the server is
+    down are not logged, and logged changes to the same products replace
+    them.
+
+    Args:
+        csv_file (str, optional): Source CSV; defaults to INVENTORY_CSV or
+            Week3/data/products.csv.
+        snapshot_file (str, optional): Snapshot cache of the CSV; defaults
+            to INVENTORY_SNAPSHOT or the CSV path with a ".snap" suffix.
+        wal_file (str, optional): Write-ahead log of API changes and CSV
+            reloads; defaults to INVENTORY_WAL or products.wal next to the
+            CSV. An empty string disables it.
+
+    Returns:
+        CsvReloader: Applies later edits of the CSV as row deltas; not
+        started yet.
+    """
+    global wal, reloader
+    if reloader is not None:
+        return reloader
+    csv_file = csv_file or os.environ.get("INVENTORY_CSV") or csv_path
+    snapshot_file = snapshot_file or os.environ.get("INVENTORY_SNAPSHOT")
+    if wal_file is None:
+        wal_file = os.environ.get(
+            "INVENTORY_WAL", os.path.join(os.path.dirname(csv_file), "products.wal")
+        )
+
+    inventory.load_with_snapshot(csv_file, snapshot_file)
+    wal = WriteAheadLog(wal_file) if wal_file else None
+    if wal is not None:
+        wal.replay(inventory)
+    reloader = CsvReloader(inventory, csv_file, wal=wal)
+    reloader.prime()
+    return reloader
+
+
+def use_shared_memory(name: str) -> SharedColumns:
+    """
+    Shares stock and prices with the other workers of a pre-forked server
+    through the named shared-memory segment, creating it from this
+    inventory if no worker has yet.
+
+    Only quantity and price are shared: every change this worker makes is
+    published to the segment, and the quantity and price in responses and
+    in merged updates are read from it. Everything else stays per worker:
+    - Each worker still loads and holds its own full Inventory, so memory
+      still grows with the number of workers.
+    - Products created or deleted through another worker are not seen
+      here until a restart replays the write-ahead log.
+    - Filters, ordering and low-stock selection use this worker's own
+      quantities and prices, which another worker's changes do not update.
+    - Clearing this worker's product list leaves the segment alone.
+
+    Serving those from shared memory too would mean keeping names,
+    categories, dates and the filter indexes there, and decoding a product
+    on every read.
+
+    Args:
+        name (str): Name of the shared-memory segment.
+
+    Returns:
+        SharedColumns: The attached segment.
+    """
+    global shared
+    if shared is None:
+        shared = SharedColumns.open(name, inventory.copy_products())
+        # Not replayed like `add_listener` would: the segment already holds
+        # these products, possibly with newer values from another worker
+        inventory.products.listeners.append(shared)
+        responses.shared = shared
+    return shared
 
 
 @inventory_bp.route("/hello", methods=["GET"])
@@ -33,19 +166,123 @@ def hello() -> Tuple[Any, int]:
 
 
 @inventory_bp.route("/products", methods=["GET"])
-def get_products() -> Tuple[Any, int]:
+def get_products() -> Union[Response, Tuple[Any, int]]:
+    """
+    Returns the products in the inventory, or one page of them when `limit`
+    or `offset` is given.
+
+    Only the requested page is read and serialized, so the cost of a paged
+    request follows its page size rather than the size of the inventory.
+    When more products match, a `Link` header with rel="next" gives the
+    next page.
+    Encoded pages are cached until a product changes; the response's ETag
+    names that state, and a matching If-None-Match gets 304 with no body.
+
+    Query parameters:
+        category (str): Only products of this category, case-insensitively.
+        min_price, max_price (float): Inclusive price bounds.
+        qty_lt (int): Only products with a smaller quantity.
+        order_by (str): "product_id", "product_name", "price" or
+            "quantity", prefixed with "-" for descending order. Defaults
+            to "product_id" for pages, so they stay stable; otherwise
+            products are returned in insertion order.
+        limit (int): Page size, 1 to MAX_PAGE_SIZE (default DEFAULT_PAGE_SIZE
+            when only an offset is given, else every matching product).
+        offset (int): Number of matching products skipped (default 0).
+        fields (str): Comma-separated fields to return, e.g.
+            "product_id,price"; fields a product type lacks are left out.
+
+    Returns:
+        JSON response with a list of products and status 200, status 304
+        if unchanged, or error message with status 400 for malformed
+        parameters.
     """
-    Returns all products in the inventory.
+    args = request.args
+    paged = "limit" in args or "offset" in args
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE)) if paged else None
+        offset = int(args.get("offset", 0))
+        qty_lt = _optional(args.get("qty_lt"), int)
+        low = _optional(args.get("min_price"), float)
+        high = _optional(args.get("max_price"), float)
+    except ValueError:
+        return jsonify({"error": "Paging and filter values must be numbers"}), 400
+    if paged and not 0 < limit <= MAX_PAGE_SIZE:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+    fields = None
+    if "fields" in args:
+        fields = [name.strip() for name in args["fields"].split(",") if name.strip()]
+        unknown = sorted(set(fields) - PRODUCT_FIELDS)
+        if unknown or not fields:
+            return jsonify({"error": f"Unknown fields: {unknown}"}), 400
+
+    with inventory.lock.reading():
+        etag = responses.etag
+        if request.if_none_match.contains_weak(etag):
+            return _not_modified(etag)
+        cached = responses.page(request.query_string)
+        if cached is None:
+            try:
+                # One extra product tells whether there is a next page
+                page = inventory.query(
+                    category=args.get("category"),
+                    price_between=(
+                        (low, high) if low is not None or high is not None else None
+                    ),
+                    qty_lt=qty_lt,
+                    order_by=args.get("order_by", "product_id" if paged else None),
+                    limit=limit + 1 if paged else None,
+                    offset=offset,
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            link = None
+            if paged and len(page) > limit:
+                page.pop()
+                query = urlencode({**args.to_dict(), "offset": offset + limit})
+                link = f'<{request.path}?{query}>; rel="next"'
+            if fields is None:
+                body = responses.list_json(page)
+            else:
+                body = encode_json([_project(product, fields) for product in page])
+            cached = (body, link)
+            responses.store_page(request.query_string, cached)
+
+    body, link = cached
+    return _json_response(body, etag, {"Link": link} if link else None)
+
+
+@inventory_bp.route("/products/low-stock", methods=["GET"])
+def get_low_stock_products() -> Tuple[Any, int]:
+    """
+    Returns products below a stock threshold, lowest quantity first.
+
+    Query parameters:
+        threshold (int): Quantity below which products are low stock (default 10).
+        category_threshold (str, repeatable): Per-category override written
+            as "<category>:<threshold>", e.g. "food:20".
 
     Returns:
-        JSON response with a list of products and status 200.
+        JSON response with a list of products and status 200,
+        or error message with status 400 for malformed thresholds.
     """
-    products_list = [product.model_dump() for product in inventory.products if product]
-    return jsonify(products_list), 200
+    try:
+        threshold = int(request.args.get("threshold", 10))
+        category_thresholds = {}
+        for item in request.args.getlist("category_threshold"):
+            category, _, value = item.rpartition(":")
+            category_thresholds[category] = int(value)
+    except ValueError:
+        return jsonify({"error": "Thresholds must be integers"}), 400
+
+    products = inventory.low_stock(threshold, category_thresholds)
+    responses.refresh()
+    return _json_response(responses.list_json(products))
 
 
 @inventory_bp.route("/products/<int:product_id>", methods=["GET"])
-def get_product(product_id: int) -> Tuple[Any, int]:
+def get_product(product_id: int) -> Union[Response, Tuple[Any, int]]:
     """
     Get a specific product by product_id.
 
@@ -53,13 +290,17 @@ def get_product(product_id: int) -> Tuple[Any, int]:
         product_id (int): ID of the product to retrieve.
 
     Returns:
-        JSON response with product details and status 200 if found,
-        else error message and status 404.
+        JSON response with product details and status 200 if found, status
+        304 if unchanged since the If-None-Match ETag, else error message
+        and status 404.
     """
-    product = next((p for p in inventory.products if p.product_id == product_id), None)
+    product = inventory.get(product_id)
     if not product:
         return jsonify({"error": "Product not found"}), 404
-    return jsonify(product.model_dump()), 200
+    etag = responses.etag
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+    return _json_response(responses.product_json(product), etag)
 
 
 @inventory_bp.route("/products", methods=["POST"])
@@ -81,13 +322,17 @@ def create_product() -> Tuple[Any, int]:
         if product is None:
             return jsonify({"error": "Invalid product data"}), 400
 
-        if any(p.product_id == product.product_id for p in inventory.products):
-            return (
-                jsonify({"error": "Product with this product_id already exists"}),
-                409,
-            )
-
-        inventory.products.append(product)
+        # Checked and added under one write lock, so concurrent creates of
+        # the same product_id cannot both succeed
+        with inventory.lock.writing():
+            if inventory.contains(product.product_id):
+                return (
+                    jsonify({"error": "Product with this product_id already exists"}),
+                    409,
+                )
+            ticket = _log_put([product])
+            inventory.upsert(product)
+        _sync(ticket)
         return jsonify(product.model_dump()), 201
 
     except ValidationError as e:
@@ -111,33 +356,44 @@ def update_product(product_id: int) -> Tuple[Any, int]:
 
     Returns:
         JSON response with updated product and status 200 if successful,
-        else error message with 400/404/500.
+        else error message with 400/404/409/500.
     """
     try:
         update_data = request.get_json(silent=True)
         if not update_data:
             return jsonify({"error": "Invalid or missing JSON body"}), 400
 
-        # Find index of existing product
-        idx = next(
-            (i for i, p in enumerate(inventory.products) if p.product_id == product_id),
-            None,
-        )
-        if idx is None:
-            return jsonify({"error": "Product not found"}), 404
-
-        # Merge existing product data with updates
-        existing_product = inventory.products[idx]
-        updated_dict = existing_product.model_dump()
-        updated_dict.update(update_data)
-
-        # Validate updated product
-        updated_product = inventory.create_product_from_row(updated_dict)
-        if updated_product is None:
-            return jsonify({"error": "Invalid updated data"}), 400
-
-        # Replace old product
-        inventory.products[idx] = updated_product
+        # Read, merged and replaced under one write lock, so concurrent
+        # updates of the same product do not overwrite each other
+        with inventory.lock.writing():
+            existing_product = inventory.get(product_id)
+            if existing_product is None:
+                return jsonify({"error": "Product not found"}), 404
+
+            # Merge existing product data with updates, taking stock and
+            # price as other workers may have left them
+            updated_dict = responses.overlay(product_id, existing_product.model_dump())
+            updated_dict.update(update_data)
+
+            # Validate updated product
+            updated_product = inventory.create_product_from_row(updated_dict)
+            if updated_product is None:
+                return jsonify({"error": "Invalid updated data"}), 400
+
+            # Replace old product, moving it if the update changed its id
+            if updated_product.product_id != product_id:
+                if inventory.contains(updated_product.product_id):
+                    return (
+                        jsonify(
+                            {"error": "Product with this product_id already exists"}
+                        ),
+                        409,
+                    )
+                _log_delete([product_id])
+                inventory.remove(product_id)
+            ticket = _log_put([updated_product])
+            inventory.upsert(updated_product)
+        _sync(ticket)
         return jsonify(updated_product.model_dump()), 200
 
     except ValidationError as e:
@@ -145,3 +401,278 @@ def update_product(product_id: int) -> Tuple[Any, int]:
     except Exception as e:
         logging.error(f"Unexpected error in update_product: {e}")
         return jsonify({"error": "Internal server error"}), 500
+
+
+@inventory_bp.route("/products/bulk", methods=["POST"])
+def create_products_bulk() -> Tuple[Any, int]:
+    """
+    Create many products in one request.
+
+    The body is a JSON array of products or, with an NDJSON content type,
+    one product per line, read as a stream. Items are validated in batches
+    of BULK_BATCH_SIZE outside the lock; each batch is then added under one
+    write lock, with duplicate product_ids found through the inventory's id
+    index. Invalid or duplicate items are reported and skipped; the rest
+    are created.
+
+    Returns:
+        JSON response with counts and one result per item, in request
+        order, and status 200, or error message with status 400 for a
+        body that is neither. Item results carry status 201 (created),
+        400 (invalid, with error type and fields) or 409 (duplicate).
+    """
+    items = _bulk_items()
+    if items is None:
+        return jsonify({"error": "Expected a JSON array or NDJSON body"}), 400
+
+    results: List[dict] = []
+    for batch in _batches(items):
+        outcomes: List[Optional[dict]] = [None] * len(batch)
+        valid = []
+        for position, (index, item) in enumerate(batch):
+            try:
+                valid.append((position, index, _build_item(item)))
+            except Exception as e:
+                outcomes[position] = _item_error(index, e)
+        with inventory.lock.writing():
+            added: Dict[int, Product] = {}
+            for position, index, product in valid:
+                product_id = product.product_id
+                if product_id in added or inventory.contains(product_id):
+                    outcomes[position] = _item_result(
+                        index, 409, product_id, error=DUPLICATE
+                    )
+                    continue
+                added[product_id] = product
+                outcomes[position] = _item_result(index, 201, product_id)
+            ticket = _log_put(added.values())
+            for product in added.values():
+                inventory.upsert(product)
+        _sync(ticket)
+        results.extend(outcomes)
+    return jsonify(_bulk_summary(results, "create")), 200
+
+
+@inventory_bp.route("/products/bulk", methods=["PATCH"])
+def update_products_bulk() -> Tuple[Any, int]:
+    """
+    Update many existing products in one request.
+
+    The body is read like `create_products_bulk`'s. Each item names the
+    product to update by product_id and gives the fields to change; they
+    are merged into the current product, with the shared stock and price
+    when workers share them, and validated as in `update_product`. Items
+    are merged and validated in batches of BULK_BATCH_SIZE outside the
+    lock; each batch is then applied under one write lock, merging again
+    any product that another request replaced or removed in between.
+    product_id itself cannot be changed in bulk.
+
+    Returns:
+        JSON response with counts and one result per item, in request
+        order, and status 200, or error message with status 400 for a
+        body that is neither. Item results carry status 200 (updated),
+        400 (invalid, with error type and fields) or 404 (no such product).
+    """
+    items = _bulk_items()
+    if items is None:
+        return jsonify({"error": "Expected a JSON array or NDJSON body"}), 400
+
+    results: List[dict] = []
+    for batch in _batches(items):
+        outcomes: List[Optional[dict]] = [None] * len(batch)
+        # (position, index, item) per product, in request order
+        merges: Dict[int, List[Tuple[int, int, Any]]] = {}
+        for position, (index, item) in enumerate(batch):
+            try:
+                product_id = int(_as_object(item)["product_id"])
+            except Exception as e:
+                outcomes[position] = _item_error(index, e)
+                continue
+            merges.setdefault(product_id, []).append((position, index, item))
+        merged = {}
+        for product_id, entries in merges.items():
+            base = inventory.get(product_id)
+            merged[product_id] = (base, _merge_items(base, entries, outcomes))
+
+        with inventory.lock.writing():
+            updated: Dict[int, Product] = {}
+            for product_id, (base, product) in merged.items():
+                current = inventory.get(product_id)
+                if current is not base:
+                    product = _merge_items(current, merges[product_id], outcomes)
+                if product is not None:
+                    updated[product_id] = product
+            ticket = _log_put(updated.values())
+            for product in updated.values():
+                inventory.upsert(product)
+        _sync(ticket)
+        results.extend(outcomes)
+    return jsonify(_bulk_summary(results, "update")), 200
+
+
+def _merge_items(
+    existing: Optional[Product],
+    entries: List[Tuple[int, int, Any]],
+    outcomes: List[Optional[dict]],
+) -> Optional[Product]:
+    """
+    Merges a product's bulk update items into it in request order, each
+    valid item into the result of the previous ones, and records each
+    item's result at its position in `outcomes`.
+
+    Returns:
+        Product or None: The merged product, or None if no item applied.
+    """
+    if existing is None:
+        for position, index, item in entries:
+            outcomes[position] = _item_result(index, 404, int(item["product_id"]))
+        return None
+    product = None
+    current = responses.overlay(existing.product_id, existing.model_dump())
+    for position, index, item in entries:
+        try:
+            product = _build_item({**current, **item})
+        except Exception as e:
+            outcomes[position] = _item_error(index, e)
+            continue
+        current = product.model_dump()
+        outcomes[position] = _item_result(index, 200, product.product_id)
+    return product
+
+
+def _log_put(products: Iterable[Product]) -> int:
+    """
+    Logs products about to be added or replaced; returns the sync ticket.
+    """
+    return wal.log_put(products) if wal is not None else 0
+
+
+def _log_delete(product_ids: Iterable[int]) -> int:
+    """
+    Logs product_ids about to be removed; returns the sync ticket.
+    """
+    return wal.log_delete(product_ids) if wal is not None else 0
+
+
+def _sync(ticket: int) -> None:
+    """
+    Waits until the logged changes up to `ticket` are on disk. Called after
+    the write lock is released, so concurrent requests share an fsync.
+    """
+    if wal is not None:
+        wal.sync(ticket)
+
+
+def _optional(value: Optional[str], convert: Any) -> Any:
+    """
+    Converts a query parameter that may be missing, keeping None.
+    """
+    return None if value is None else convert(value)
+
+
+def _project(product: Product, fields: Optional[list]) -> dict:
+    """
+    Returns the product as a dict, limited to `fields` when given.
+    Only the named attributes are read, instead of dumping every field.
+    """
+    if fields is None:
+        return responses.overlay(product.product_id, product.model_dump())
+    model_fields = product.__class__.model_fields
+    values = {name: getattr(product, name) for name in fields if name in model_fields}
+    return responses.overlay(product.product_id, values)
+
+
+def _json_response(
+    body: bytes, etag: Optional[str] = None, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Returns an encoded JSON body as a 200 response, tagged with `etag`.
+    """
+    response = Response(body + b"\n", mimetype="application/json", headers=headers)
+    if etag is not None:
+        response.set_etag(etag)
+    return response
+
+
+def _not_modified(etag: str) -> Response:
+    """
+    Returns an empty 304 response for a client that already has `etag`.
+    """
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def _bulk_items() -> Optional[Iterator[Tuple[int, Any]]]:
+    """
+    Returns the (index, item) pairs of a bulk request body, or None if the
+    body is not a JSON array. NDJSON bodies are read line by line; a line
+    that is not valid JSON becomes its item's error.
+    """
+    if request.mimetype in NDJSON_TYPES:
+        return _ndjson_items()
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        return None
+    return enumerate(items)
+
+
+def _ndjson_items() -> Iterator[Tuple[int, Any]]:
+    lines = (line for line in request.stream if line.strip())
+    for index, line in enumerate(lines):
+        try:
+            yield index, json.loads(line)
+        except ValueError as e:
+            yield index, e
+
+
+def _batches(items: Iterator[Tuple[int, Any]]) -> Iterator[List[Tuple[int, Any]]]:
+    batch: List[Tuple[int, Any]] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == BULK_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _as_object(item: Any) -> dict:
+    """
+    Returns a bulk item as a dict, raising the error it stands for instead.
+    """
+    if isinstance(item, Exception):
+        raise item
+    if not isinstance(item, dict):
+        raise TypeError("Each item must be a JSON object")
+    return item
+
+
+def _build_item(item: Any) -> Product:
+    return build_product(_as_object(item))
+
+
+def _item_result(
+    index: int, status: int, product_id: Optional[int], **extra: Any
+) -> dict:
+    return {"index": index, "status": status, "product_id": product_id, **extra}
+
+
+def _item_error(index: int, error: Exception) -> dict:
+    """
+    Returns the 400 result of an item that could not be built, naming the
+    error type and fields as the CSV loaders' reject reports do.
+    """
+    kind, fields = classify_error(error)
+    return _item_result(index, 400, None, error=kind, fields=list(fields))
+
+
+def _bulk_summary(results: List[dict], action: str) -> dict:
+    failed = sum(1 for result in results if result["status"] >= 400)
+    if failed:
+        logging.warning(f"Bulk {action} rejected {failed} of {len(results)} items.")
+    return {
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
@@ -1,5 +1,7 @@
+from pathlib import Path
 from typing import Dict, Generator
 
+import api.routes.inventory as inventory_module
 import pytest
 from api.routes.inventory import inventory, inventory_bp
 from flask import Flask
@@ -31,6 +33,30 @@ def client() -> Generator:
         yield client
 
 
+@pytest.fixture
+def loaded_inventory(tmp_path: Path, monkeypatch) -> Generator[Path, None, None]:
+    """
+    Run `init_inventory` on a one-product CSV in a temporary directory, with
+    the snapshot and the write-ahead log next to it.
+
+    Yields:
+        Path: The temporary directory.
+    """
+    csv_file = tmp_path / "products.csv"
+    csv_file.write_text(
+        "product_id,product_name,category,quantity,price\n9,Stapler,office,4,3.5\n"
+    )
+    monkeypatch.setattr(inventory_module, "reloader", None)
+    monkeypatch.setattr(inventory_module, "wal", None)
+    inventory_module.init_inventory(
+        str(csv_file),
+        snapshot_file=str(tmp_path / "products.csv.snap"),
+        wal_file=str(tmp_path / "products.wal"),
+    )
+    yield tmp_path
+    inventory_module.wal.close()
+
+
 # ---------- Sample product data ----------
 @pytest.fixture
 def base_product() -> Dict:
@@ -1,6 +1,15 @@
+import json
+import uuid
+from pathlib import Path
 from typing import Dict
 from unittest.mock import patch
 
+import api.routes.inventory as inventory_module
+
+from Week3.core import Inventory
+from Week3.shared import SharedColumns
+from Week3.wal import WriteAheadLog
+
 
 # ---------- Basic API Endpoint Tests ----------
 def test_hello_endpoint(client) -> None:
@@ -187,6 +196,61 @@ def test_update_invalid_product_data(client, base_product: Dict) -> None:
     assert "error" in resp.get_json()
 
 
+def test_update_product_id_to_existing_id(
+    client, base_product: Dict, second_product: Dict
+) -> None:
+    """
+    Test that changing a product's id to one that is already taken is
+    rejected with a 409 status code and leaves both products unchanged.
+    """
+    client.post("/api/products", json=base_product)
+    client.post("/api/products", json=second_product)
+    resp = client.put(
+        f"/api/products/{base_product['product_id']}",
+        json={"product_id": second_product["product_id"]},
+    )
+    assert resp.status_code == 409
+    assert client.get("/api/products/1").get_json()["product_name"] == "Test Product"
+    assert client.get("/api/products/2").get_json()["product_name"] == "Second Product"
+
+
+def test_update_product_id_to_new_id(client, base_product: Dict) -> None:
+    """
+    Test that changing a product's id moves it to the new id.
+    """
+    client.post("/api/products", json=base_product)
+    resp = client.put(
+        f"/api/products/{base_product['product_id']}", json={"product_id": 42}
+    )
+    assert resp.status_code == 200
+    assert client.get("/api/products/42").status_code == 200
+    assert client.get(f"/api/products/{base_product['product_id']}").status_code == 404
+    assert len(client.get("/api/products").get_json()) == 1
+
+
+# ---------- GET /products/low-stock Tests ----------
+def test_low_stock_products(client, base_product: Dict, second_product: Dict) -> None:
+    """
+    Test that low-stock products are listed lowest quantity first and that
+    per-category thresholds override the default one.
+    """
+    client.post("/api/products", json=base_product)
+    client.post("/api/products", json=second_product)
+
+    resp = client.get("/api/products/low-stock?threshold=6")
+    assert resp.status_code == 200
+    assert [p["product_id"] for p in resp.get_json()] == [2, 1]
+
+    resp = client.get("/api/products/low-stock?threshold=6&category_threshold=test:4")
+    assert [p["product_id"] for p in resp.get_json()] == [2]
+
+
+def test_low_stock_invalid_threshold(client) -> None:
+    """Test that a non-integer threshold returns 400."""
+    resp = client.get("/api/products/low-stock?threshold=abc")
+    assert resp.status_code == 400
+
+
 # ---------- Edge Case Tests ----------
 def test_negative_quantity_price(client, base_product: Dict) -> None:
     """
@@ -285,3 +349,310 @@ def test_create_product_badrequest_exception(client):
     assert data is not None
     assert "error" in data
     assert data["error"] == "Invalid or missing JSON body"
+
+
+# ---------- GET /products Paging Tests ----------
+def _create_products(client, base_product: Dict, count: int) -> None:
+    """Create products 1..count with varying category, price and quantity."""
+    for product_id in range(1, count + 1):
+        client.post(
+            "/api/products",
+            json={
+                **base_product,
+                "product_id": product_id,
+                "category": "Test" if product_id % 2 else "Other",
+                "price": float(product_id),
+                "quantity": product_id % 4,
+            },
+        )
+
+
+def test_get_products_pages_with_next_link(client, base_product: Dict) -> None:
+    """Test that pages follow each other through the Link header."""
+    _create_products(client, base_product, 5)
+
+    resp = client.get("/api/products?limit=2")
+    assert [p["product_id"] for p in resp.get_json()] == [1, 2]
+    assert 'rel="next"' in resp.headers["Link"]
+    assert "offset=2" in resp.headers["Link"]
+
+    resp = client.get("/api/products?limit=2&offset=4")
+    assert [p["product_id"] for p in resp.get_json()] == [5]
+    assert "Link" not in resp.headers
+
+
+def test_get_products_unpaged_returns_everything(
+    client, base_product: Dict, monkeypatch
+) -> None:
+    """Test that only limit or offset turns on paging."""
+    monkeypatch.setattr(inventory_module, "DEFAULT_PAGE_SIZE", 2)
+    _create_products(client, base_product, 5)
+
+    resp = client.get("/api/products")
+    assert [p["product_id"] for p in resp.get_json()] == [1, 2, 3, 4, 5]
+    assert "Link" not in resp.headers
+
+    resp = client.get("/api/products?offset=1")
+    assert [p["product_id"] for p in resp.get_json()] == [2, 3]
+    assert "offset=3" in resp.headers["Link"]
+
+
+def test_get_products_keeps_insertion_order(client, base_product: Dict) -> None:
+    """Test that only order_by or paging sorts the products."""
+    for product_id in (3, 1, 2):
+        client.post("/api/products", json={**base_product, "product_id": product_id})
+
+    resp = client.get("/api/products")
+    assert [p["product_id"] for p in resp.get_json()] == [3, 1, 2]
+    resp = client.get("/api/products?category=test")
+    assert [p["product_id"] for p in resp.get_json()] == [3, 1, 2]
+    resp = client.get("/api/products?limit=10")
+    assert [p["product_id"] for p in resp.get_json()] == [1, 2, 3]
+    resp = client.get("/api/products?order_by=-product_id")
+    assert [p["product_id"] for p in resp.get_json()] == [3, 2, 1]
+
+
+def test_get_products_filters_and_orders(client, base_product: Dict) -> None:
+    """Test category, price and quantity filters with descending order."""
+    _create_products(client, base_product, 9)
+
+    resp = client.get(
+        "/api/products?category=test&min_price=2&max_price=9&qty_lt=2&order_by=-price"
+    )
+    assert resp.status_code == 200
+    assert [p["product_id"] for p in resp.get_json()] == [9, 5]
+
+
+def test_get_products_projects_fields(client, base_product: Dict) -> None:
+    """Test that fields= returns only the named fields."""
+    _create_products(client, base_product, 2)
+
+    resp = client.get("/api/products?fields=product_id,price")
+    assert resp.get_json() == [
+        {"product_id": 1, "price": 1.0},
+        {"product_id": 2, "price": 2.0},
+    ]
+
+
+def test_get_products_invalid_parameters(client) -> None:
+    """Test that malformed paging, filter and projection values return 400."""
+    for query in (
+        "limit=0",
+        "limit=abc",
+        "offset=-1",
+        "min_price=cheap",
+        "order_by=colour",
+        "fields=colour",
+    ):
+        resp = client.get(f"/api/products?{query}")
+        assert resp.status_code == 400, query
+
+
+# ---------- Response Cache Tests ----------
+def test_get_products_not_modified_until_update(client, base_product: Dict) -> None:
+    """Test that a poll with the ETag gets 304 until a product changes."""
+    client.post("/api/products", json=base_product)
+
+    resp = client.get("/api/products")
+    etag = resp.headers["ETag"]
+    assert resp.get_json()[0]["quantity"] == 5
+
+    resp = client.get("/api/products", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.data == b""
+
+    client.put("/api/products/1", json={"quantity": 7})
+    resp = client.get("/api/products", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert resp.get_json()[0]["quantity"] == 7
+
+
+def test_get_product_not_modified(client, base_product: Dict) -> None:
+    """Test ETag handling of GET /products/<id> and its cached body."""
+    client.post("/api/products", json=base_product)
+    resp = client.get("/api/products/1")
+    assert resp.get_json()["product_name"] == "Test Product"
+
+    again = client.get(
+        "/api/products/1", headers={"If-None-Match": resp.headers["ETag"]}
+    )
+    assert again.status_code == 304
+
+    client.post("/api/products", json={**base_product, "product_id": 2})
+    again = client.get(
+        "/api/products/1", headers={"If-None-Match": resp.headers["ETag"]}
+    )
+    assert again.status_code == 200
+    assert again.data == resp.data
+
+    missing = client.get(
+        "/api/products/99", headers={"If-None-Match": again.headers["ETag"]}
+    )
+    assert missing.status_code == 404
+
+
+# ---------- Bulk Endpoint Tests ----------
+def test_bulk_create_reports_each_item(client, base_product: Dict) -> None:
+    """Test that valid items are created and the rest reported in order."""
+    client.post("/api/products", json=base_product)
+    items = [
+        {**base_product, "product_id": 2},
+        {**base_product, "product_id": 3, "price": -1},
+        base_product,
+        {**base_product, "product_id": 2},
+        "not a product",
+    ]
+    resp = client.post("/api/products/bulk", json=items)
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert (data["succeeded"], data["failed"]) == (1, 4)
+    assert [r["status"] for r in data["results"]] == [201, 400, 409, 409, 400]
+    assert data["results"][1]["fields"] == ["price"]
+    assert [p["product_id"] for p in client.get("/api/products").get_json()] == [1, 2]
+
+
+def test_bulk_create_reads_ndjson(client, base_product: Dict) -> None:
+    """Test NDJSON bodies, including a line that is not JSON."""
+    lines = [json.dumps({**base_product, "product_id": i}) for i in range(1, 4)]
+    lines.insert(1, "{oops")
+    resp = client.post(
+        "/api/products/bulk",
+        data="\n".join(lines) + "\n\n",
+        content_type="application/x-ndjson",
+    )
+    results = resp.get_json()["results"]
+    assert [(r["index"], r["status"]) for r in results] == [
+        (0, 201),
+        (1, 400),
+        (2, 201),
+        (3, 201),
+    ]
+    assert client.get("/api/products/3").status_code == 200
+
+
+def test_bulk_update_merges_fields(
+    client, base_product: Dict, second_product: Dict
+) -> None:
+    """Test that bulk updates merge fields and report unknown products."""
+    client.post("/api/products/bulk", json=[base_product, second_product])
+    resp = client.patch(
+        "/api/products/bulk",
+        json=[
+            {"product_id": 2, "quantity": 40},
+            {"product_id": 9, "quantity": 1},
+            {"product_id": 1, "price": "free"},
+            {"quantity": 1},
+        ],
+    )
+    data = resp.get_json()
+    assert [r["status"] for r in data["results"]] == [200, 404, 400, 400]
+    assert data["results"][3]["fields"] == ["product_id"]
+    assert client.get("/api/products/2").get_json()["quantity"] == 40
+    assert client.get("/api/products/1").get_json()["price"] == 10.0
+
+
+def test_bulk_update_remerges_replaced_products(
+    client, base_product: Dict, monkeypatch
+) -> None:
+    """Test that a product replaced while a batch is merged is merged again."""
+    client.post("/api/products", json=base_product)
+    merge_items = inventory_module._merge_items
+
+    def replace_then_merge(existing, entries, outcomes):
+        merged = merge_items(existing, entries, outcomes)
+        if existing.product_name != "Renamed":
+            # Another request replaces the product before the batch applies
+            renamed = Inventory().create_product_from_row(
+                {**base_product, "product_name": "Renamed", "quantity": 50}
+            )
+            inventory_module.inventory.upsert(renamed)
+        return merged
+
+    monkeypatch.setattr(inventory_module, "_merge_items", replace_then_merge)
+    resp = client.patch(
+        "/api/products/bulk",
+        json=[{"product_id": 1, "price": 3.0}, {"product_id": 1, "quantity": 8}],
+    )
+    assert [r["status"] for r in resp.get_json()["results"]] == [200, 200]
+    product = client.get("/api/products/1").get_json()
+    assert product["product_name"] == "Renamed"
+    assert (product["price"], product["quantity"]) == (3.0, 8)
+
+
+def test_bulk_invalid_body(client) -> None:
+    """Test that a body that is not an array returns 400."""
+    resp = client.post("/api/products/bulk", json={"product_id": 1})
+    assert resp.status_code == 400
+    resp = client.patch("/api/products/bulk", data="oops")
+    assert resp.status_code == 400
+
+
+# ---------- Startup Tests ----------
+def test_init_inventory_uses_configured_paths(client, loaded_inventory: Path) -> None:
+    """Test that startup loads the CSV and writes files only where configured."""
+    assert client.get("/api/products/9").get_json()["product_name"] == "Stapler"
+    assert sorted(path.name for path in loaded_inventory.iterdir()) == [
+        "products.csv",
+        "products.csv.snap",
+        "products.wal",
+    ]
+    assert inventory_module.init_inventory() is inventory_module.reloader
+    assert len(inventory_module.inventory.products) == 1
+
+
+# ---------- Write-Ahead Log Tests ----------
+def test_changes_are_logged_for_replay(
+    client, base_product: Dict, second_product: Dict, loaded_inventory: Path
+) -> None:
+    """Test that API changes replay onto a fresh inventory after a restart."""
+    client.post("/api/products", json=base_product)
+    client.put("/api/products/1", json={"product_id": 7, "quantity": 8})
+    client.post("/api/products/bulk", json=[second_product])
+    client.patch("/api/products/bulk", json=[{"product_id": 2, "quantity": 30}])
+
+    # As after a restart: the CSV's products, then the logged changes
+    restarted = Inventory()
+    restarted.upsert(restarted.create_product_from_row(base_product))
+    with WriteAheadLog(str(loaded_inventory / "products.wal")) as log:
+        log.replay(restarted)
+    assert restarted.get(1) is None
+    assert restarted.get(7).quantity == 8
+    assert restarted.get(2).quantity == 30
+
+
+# ---------- Shared Memory Tests ----------
+def test_shared_stock_from_other_workers(client, base_product: Dict) -> None:
+    """Test that stock written by another worker shows up in responses."""
+    client.post("/api/products", json=base_product)
+    name = f"inv-test-{uuid.uuid4().hex[:12]}"
+    columns = inventory_module.use_shared_memory(name)
+    try:
+        resp = client.get("/api/products/1")
+        etag = resp.headers["ETag"]
+        assert resp.get_json()["quantity"] == 5
+
+        # Another worker changes the stock through the same segment
+        other = SharedColumns.attach(name)
+        other.put(Inventory().create_product_from_row({**base_product, "quantity": 42}))
+        other.close()
+
+        resp = client.get("/api/products/1", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.get_json()["quantity"] == 42
+        resp = client.get("/api/products?fields=product_id,quantity")
+        assert resp.get_json() == [{"product_id": 1, "quantity": 42}]
+
+        client.put("/api/products/1", json={"price": 12.5})
+        assert columns.get(1) == (42, 12.5)
+
+        other = SharedColumns.attach(name)
+        other.put(Inventory().create_product_from_row({**base_product, "quantity": 7}))
+        other.close()
+        client.patch("/api/products/bulk", json=[{"product_id": 1, "price": 3.0}])
+        assert columns.get(1) == (7, 3.0)
+    finally:
+        inventory_module.inventory.products.listeners.remove(columns)
+        inventory_module.responses.shared = inventory_module.shared = None
+        columns.close()
+        columns.unlink()
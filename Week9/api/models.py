@@ -26,7 +26,8 @@ class Product(db.Model):
     id = Column(Integer, primary_key=True)
     product_name = Column(String(50), nullable=False)
     category = Column(String(20), nullable=False)
-    quantity = Column(Integer, nullable=False)
+    # Indexed so low-stock queries range-scan instead of reading every row
+    quantity = Column(Integer, nullable=False, index=True)
     price = Column(Float, nullable=False)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
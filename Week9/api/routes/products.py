@@ -1,7 +1,9 @@
+from datetime import date
 from typing import Any, Dict, Type
 
 from flask import Blueprint, jsonify, request
 from pydantic import ValidationError
+from sqlalchemy import and_, or_
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from api.schemas.request import (
@@ -59,6 +61,61 @@ def get_products() -> tuple[Any, int]:
         )
 
 
+@bp.route("/low-stock", methods=["GET"])
+@roles_required("staff", "manager", "admin")
+def get_low_stock_products() -> tuple[Any, int]:
+    """
+    Fetch products below a stock threshold, lowest quantity first.
+
+    Query parameters:
+        threshold (int): Quantity below which products are low stock (default 10).
+        category_threshold (str, repeatable): Per-category override written
+            as "<category>:<threshold>", e.g. "food:20".
+
+    Expired food products are excluded. The query range-scans the
+    products.quantity index instead of loading every product.
+
+    Returns:
+        JSON response containing the matching products with HTTP status 200,
+        400 for malformed thresholds, or 500 if a database error occurs.
+    """
+    try:
+        threshold = int(request.args.get("threshold", 10))
+        overrides: Dict[str, int] = {}
+        for item in request.args.getlist("category_threshold"):
+            category, _, value = item.rpartition(":")
+            overrides[category.lower().strip()] = int(value)
+    except ValueError:
+        return (
+            jsonify(ErrorResponse(error="Thresholds must be integers").model_dump()),
+            400,
+        )
+
+    try:
+        conditions = [
+            and_(Product.category == category, Product.quantity < limit)
+            for category, limit in overrides.items()
+        ]
+        conditions.append(
+            and_(Product.category.notin_(overrides), Product.quantity < threshold)
+        )
+        expired = db.session.query(FoodProduct.id).filter(
+            FoodProduct.expiry_date < date.today()
+        )
+        products = (
+            Product.query.filter(or_(*conditions), Product.id.notin_(expired))
+            .order_by(Product.quantity, Product.id)
+            .all()
+        )
+        response = [ProductResponse.model_validate(p).model_dump() for p in products]
+        return jsonify({"products": response}), 200
+    except SQLAlchemyError as e:
+        return (
+            jsonify(ErrorResponse(error="Database error", details=str(e)).model_dump()),
+            500,
+        )
+
+
 @bp.route("/<int:product_id>", methods=["GET"])
 @roles_required("staff", "manager", "admin")
 def get_product(product_id: int) -> tuple[Any, int]:
@@ -83,18 +83,24 @@ def create_product_from_row(
 
 # ---------- Seed Database ----------
 @click.command("seed-db")
+@click.option(
+    "--csv-file",
+    default=CSV_FILE,
+    show_default=True,
+    help="CSV to load, e.g. one written by `python -m Week3.datagen`.",
+)
 @with_appcontext
-def seed_db() -> None:
+def seed_db(csv_file: str) -> None:
     """
     Read CSV and insert products into PostgreSQL database.
     """
-    if not os.path.exists(CSV_FILE):
-        print(f"CSV file not found: {CSV_FILE}")
+    if not os.path.exists(csv_file):
+        print(f"CSV file not found: {csv_file}")
         return
 
     db.create_all()  # Ensure tables exist
 
-    with open(CSV_FILE, newline="") as csvfile:
+    with open(csv_file, newline="") as csvfile:
         reader = csv.DictReader(csvfile)
         for i, row in enumerate(reader, start=1):
             product = create_product_from_row(row)
@@ -0,0 +1,27 @@
+"""add quantity index to products
+
+Revision ID: 5b8e1c0d7a42
+Revises: ebc0176adc40
+Create Date: 2026-10-18 10:12:41.203518
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b8e1c0d7a42"
+down_revision = "ebc0176adc40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("products", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_products_quantity"), ["quantity"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("products", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_products_quantity"))
@@ -0,0 +1,89 @@
+import random
+import string
+import uuid
+from typing import Dict
+
+import pytest
+from api.app import create_app
+from api.config import TestingConfig
+from api.db import db
+from api.jwt_service import JWTService
+from api.models import User
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    Create and configure a new app instance for testing.
+    Uses the TestingConfig (PostgreSQL test database).
+    """
+    app = create_app(TestingConfig)
+    app.config["JWT_SECRET_KEY"] = "test-secret"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Flask test client for making requests to the app."""
+    return app.test_client()
+
+
+@pytest.fixture(scope="function")
+def db_session(app):
+    """
+    Provide a clean database session for each test function.
+    Rolls back any changes after the test finishes.
+    """
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    options = dict(bind=connection)
+    db.session.configure(**options)
+
+    yield db.session
+
+    transaction.rollback()
+    connection.close()
+    db.session.remove()
+
+
+# ----------------------
+# User Fixtures
+# ----------------------
+
+
+@pytest.fixture
+def staff_user(db_session) -> User:
+    """
+    Create a staff role user.
+    """
+    random_suffix = "".join(random.choices(string.ascii_lowercase, k=6))
+    user = User(
+        id=uuid.uuid4(),
+        username=f"staffuser_{random_suffix}",
+        password_hash="$2b$12$ABCDEFGHIJKLMNOPQRSTUV",  # dummy hash
+        role="staff",
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+# ----------------------
+# Auth Header Fixtures
+# ----------------------
+
+
+@pytest.fixture
+def staff_auth_header(staff_user, app) -> Dict[str, str]:
+    """Authorization header for staff user."""
+    with app.app_context():
+        token = JWTService.generate_access_token(
+            user_id=str(staff_user.id),
+            username=staff_user.username,
+            role=staff_user.role,
+        )
+    return {"Authorization": f"Bearer {token}"}
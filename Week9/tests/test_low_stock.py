@@ -0,0 +1,95 @@
+import uuid
+from datetime import date, timedelta
+from typing import Dict, List
+
+from api.models import BookProduct, ElectronicProduct, FoodProduct, Product
+from sqlalchemy.orm import Session
+
+
+# ----------------------
+# Helper functions
+# ----------------------
+def create_products(db_session: Session, owner_id: str) -> Dict[str, Product]:
+    """
+    Create one product per low-stock case, keyed by role. Names carry a
+    random suffix so rows already in the test database are told apart.
+    """
+    suffix = uuid.uuid4().hex[:8]
+    today = date.today()
+    products = {
+        "cable": ElectronicProduct(
+            f"Cable {suffix}", "electronic", 1, 5.0, today, 12, owner_id
+        ),
+        "milk": FoodProduct(
+            f"Milk {suffix}",
+            "food",
+            2,
+            1.5,
+            today - timedelta(days=2),
+            today + timedelta(days=5),
+            owner_id,
+        ),
+        "novel": BookProduct(f"Novel {suffix}", "book", 3, 12.0, "A", 2020, owner_id),
+        "atlas": BookProduct(f"Atlas {suffix}", "book", 8, 40.0, "B", 2021, owner_id),
+        "yogurt": FoodProduct(
+            f"Yogurt {suffix}",
+            "food",
+            0,
+            0.9,
+            today - timedelta(days=30),
+            today - timedelta(days=1),
+            owner_id,
+        ),
+    }
+    db_session.add_all(products.values())
+    db_session.commit()
+    return products
+
+
+def low_stock_names(
+    client, headers: Dict[str, str], products: Dict[str, Product], query: str
+) -> List[str]:
+    """
+    Return the roles of the created products in a low-stock response, in
+    response order, after checking the whole response is quantity-ordered.
+    """
+    resp = client.get(f"/api/products/low-stock?{query}", headers=headers)
+    assert resp.status_code == 200
+    data = resp.get_json()["products"]
+    quantities = [p["quantity"] for p in data]
+    assert quantities == sorted(quantities)
+    roles = {product.product_name: role for role, product in products.items()}
+    return [roles[p["product_name"]] for p in data if p["product_name"] in roles]
+
+
+# ----------------------
+# GET /api/products/low-stock
+# ----------------------
+def test_low_stock_filters_by_threshold_and_orders_by_quantity(
+    client, db_session: Session, staff_auth_header: Dict[str, str], staff_user
+) -> None:
+    """
+    Products under the threshold come lowest quantity first; expired food is
+    left out.
+    """
+    products = create_products(db_session, str(staff_user.id))
+    names = low_stock_names(client, staff_auth_header, products, "threshold=5")
+    assert names == ["cable", "milk", "novel"]
+
+
+def test_low_stock_category_thresholds(
+    client, db_session: Session, staff_auth_header: Dict[str, str], staff_user
+) -> None:
+    """A category threshold replaces the default one for that category only."""
+    products = create_products(db_session, str(staff_user.id))
+    query = "threshold=5&category_threshold=book:10&category_threshold=Electronic:1"
+    names = low_stock_names(client, staff_auth_header, products, query)
+    assert names == ["milk", "novel", "atlas"]
+
+
+def test_low_stock_invalid_threshold(client, staff_auth_header: Dict[str, str]) -> None:
+    """Non-integer thresholds are rejected with 400."""
+    for query in ("threshold=few", "category_threshold=book:many"):
+        resp = client.get(f"/api/products/low-stock?{query}", headers=staff_auth_header)
+        assert resp.status_code == 400, query
+        assert resp.get_json()["error"] == "Thresholds must be integers"